@@ -9,6 +9,8 @@ import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from app.data_integration.datasets import dataset_memory_report
+
 # ========================================
 # SESSION STATE INITIALIZATION
 # ========================================
@@ -385,6 +387,21 @@ def render_usage_analytics():
     
     st.line_chart(activity_data.set_index('date'))
 
+    st.markdown("#### Cached Datasets")
+
+    report = dataset_memory_report()
+    if not report:
+        st.info("No datasets are cached yet")
+        return
+
+    st.dataframe(pd.DataFrame([{
+        'Dataset': entry['dataset'],
+        'Params': ', '.join(f"{k}={v}" for k, v in entry['params'].items()) or '-',
+        'Rows': entry['rows'],
+        'Memory (MB)': round(entry['total_bytes'] / 1024 ** 2, 2),
+        'Dtypes': ', '.join(sorted({c['dtype'] for c in entry['columns'].values()})),
+    } for entry in report]), use_container_width=True, hide_index=True)
+
 # ========================================
 # MAIN ADMIN PAGE
 # ========================================
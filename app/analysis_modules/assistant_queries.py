@@ -0,0 +1,134 @@
+# app/analysis_modules/assistant_queries.py
+# Predefined, safe queries behind the Data Assistant page
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from database.connection import get_connection
+from database.rollups import aggregate
+
+# Query types answered by execute_data_query
+QUERY_TYPES = [
+    'campaign_performance', 'platform_comparison', 'daily_trend',
+    'top_campaigns', 'campaign_details', 'summary_stats',
+]
+
+
+def _pct(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """Percentage rounded to 2dp; None where the denominator is 0 (matches NULLIF)."""
+    return (numerator * 100.0 / denominator.where(denominator != 0)).round(2)
+
+
+def get_data_summary(conn=None):
+    """Get summary of available data for context."""
+    own_conn = conn is None
+    conn = conn or get_connection()
+
+    summary = {}
+
+    # Get campaigns
+    campaigns_df = pd.read_sql_query("""
+        SELECT campaign_name, platform, objective, funnel_stage
+        FROM campaigns
+    """, conn)
+    summary['campaigns'] = campaigns_df.to_dict('records')
+    summary['campaign_count'] = len(campaigns_df)
+    summary['platforms'] = campaigns_df['platform'].unique().tolist()
+
+    # Get date range
+    dates_df = pd.read_sql_query("""
+        SELECT MIN(report_date) as min_date, MAX(report_date) as max_date
+        FROM daily_performance
+    """, conn)
+    summary['date_range'] = {
+        'start': dates_df['min_date'].iloc[0],
+        'end': dates_df['max_date'].iloc[0]
+    }
+
+    # Get totals
+    totals_df = pd.read_sql_query("""
+        SELECT
+            SUM(impressions) as total_impressions,
+            SUM(clicks) as total_clicks,
+            SUM(conversions) as total_conversions
+        FROM daily_performance
+    """, conn)
+    summary['totals'] = totals_df.to_dict('records')[0]
+
+    if own_conn:
+        conn.close()
+    return summary
+
+
+def execute_data_query(query_type: str, params: dict = None, conn=None):
+    """Execute predefined safe queries based on user intent."""
+    own_conn = conn is None
+    conn = conn or get_connection()
+    params = params or {}
+
+    try:
+        if query_type == "campaign_performance":
+            df = aggregate(conn, ['impressions', 'clicks', 'conversions'],
+                           group_by=['campaign_name', 'platform'], order_by='impressions')
+            df['ctr'] = _pct(df['clicks'], df['impressions'])
+            return df
+
+        elif query_type == "platform_comparison":
+            df = aggregate(conn, ['impressions', 'clicks', 'conversions'],
+                           group_by=['platform'], order_by='impressions')
+            df['ctr'] = _pct(df['clicks'], df['impressions'])
+            df['conversion_rate'] = _pct(df['conversions'], df['clicks'])
+            return df
+
+        elif query_type == "daily_trend":
+            days = params.get('days', 30)
+            start_date = (datetime.now() - timedelta(days=int(days))).strftime('%Y-%m-%d')
+            df = aggregate(conn, ['impressions', 'clicks', 'conversions'],
+                           group_by=['report_date'], start_date=start_date,
+                           order_by='report_date', descending=False)
+            return df
+
+        elif query_type == "top_campaigns":
+            limit = params.get('limit', 5)
+            metric = params.get('metric', 'conversions')
+            df = aggregate(conn, [metric], group_by=['campaign_name', 'platform'],
+                           order_by=metric, limit=limit)
+            return df
+
+        elif query_type == "campaign_details":
+            campaign_name = params.get('campaign_name', '')
+            df = pd.read_sql_query("""
+                SELECT
+                    dp.report_date,
+                    c.campaign_name,
+                    dp.impressions,
+                    dp.clicks,
+                    dp.conversions
+                FROM daily_performance dp
+                JOIN campaigns c ON dp.campaign_id = c.campaign_id
+                WHERE c.campaign_name LIKE ?
+                ORDER BY dp.report_date DESC
+                LIMIT 30
+            """, conn, params=(f'%{campaign_name}%',))
+            return df
+
+        elif query_type == "summary_stats":
+            df = pd.read_sql_query("""
+                SELECT
+                    COUNT(DISTINCT c.campaign_id) as total_campaigns,
+                    COUNT(DISTINCT c.platform) as platforms,
+                    SUM(dp.impressions) as total_impressions,
+                    SUM(dp.clicks) as total_clicks,
+                    SUM(dp.conversions) as total_conversions,
+                    ROUND(SUM(dp.clicks) * 100.0 / NULLIF(SUM(dp.impressions), 0), 2) as avg_ctr
+                FROM daily_performance dp
+                JOIN campaigns c ON dp.campaign_id = c.campaign_id
+            """, conn)
+            return df
+
+    except Exception as e:
+        return pd.DataFrame({'error': [str(e)]})
+    finally:
+        if own_conn:
+            conn.close()
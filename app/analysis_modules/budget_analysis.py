@@ -1,12 +1,17 @@
-import pandas as pd, sqlite3
+import pandas as pd
 from config import DB_PATH
+from database.connection import get_connection
 from datetime import datetime
 
+# Params: campaign_id. Stays on SQLite: one campaign's spend is an indexed range
+# sum there, while the Parquet mirror would have to scan every month
+SPEND_QUERY = "SELECT SUM(spend) as total_spend FROM daily_performance WHERE campaign_id = ?"
+
 def get_budget_pacing(campaign_id: str):
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection(DB_PATH)
     budget_df = pd.read_sql_query("SELECT start_date, end_date, total_budget FROM campaign_budgets WHERE campaign_id = ?", conn, params=[campaign_id])
-    if budget_df.empty: return None
-    spend_df = pd.read_sql_query("SELECT SUM(spend) as total_spend FROM daily_performance WHERE campaign_id = ?", conn, params=[campaign_id])
+    if budget_df.empty: conn.close(); return None
+    spend_df = pd.read_sql_query(SPEND_QUERY, conn, params=[campaign_id])
     conn.close()
     budget_info, total_spend = budget_df.iloc[0], spend_df['total_spend'].iloc[0] or 0
     start_date, end_date, today = datetime.strptime(budget_info['start_date'], '%Y-%m-%d').date(), datetime.strptime(budget_info['end_date'], '%Y-%m-%d').date(), datetime.now().date()
@@ -1,18 +1,40 @@
-import sqlite3, pandas as pd
+import pandas as pd
 from config import DB_PATH
+from database import columnar_store
+from database.connection import get_connection
 
-def get_db_connection(): return sqlite3.connect(DB_PATH)
+def get_db_connection(): return get_connection(DB_PATH)
 
-def fetch_performance_data(start_date: str, end_date: str, platforms: list, campaigns: list) -> pd.DataFrame:
-    conn = get_db_connection()
+def performance_query(start_date: str, end_date: str, platforms: list, campaigns: list) -> tuple:
+    """SQL and params of fetch_performance_data (also checked by database.indexes.verify_query_plans)."""
     query = "SELECT dp.report_date, c.platform, c.campaign_name, dp.impressions, dp.clicks, dp.spend, dp.conversions, dp.revenue FROM daily_performance dp JOIN campaigns c ON dp.campaign_id = c.campaign_id WHERE dp.report_date BETWEEN ? AND ?"
     params = [start_date, end_date]
     if platforms: query += f" AND c.platform IN ({','.join(['?']*len(platforms))})"; params.extend(platforms)
     if campaigns: query += f" AND c.campaign_name IN ({','.join(['?']*len(campaigns))})"; params.extend(campaigns)
+    return query, params
+
+def fetch_performance_data(start_date: str, end_date: str, platforms: list, campaigns: list) -> pd.DataFrame:
+    if columnar_store.is_enabled():
+        df = _fetch_performance_columnar(start_date, end_date, platforms, campaigns)
+        if df is not None: return df
+    conn = get_db_connection()
+    query, params = performance_query(start_date, end_date, platforms, campaigns)
     df = pd.read_sql_query(query, conn, params=params)
     conn.close()
     return df
 
+def _fetch_performance_columnar(start_date: str, end_date: str, platforms: list, campaigns: list):
+    """Same result as the SQLite path, read from the Parquet mirror (None if it has not been built)."""
+    store = columnar_store.ColumnarStore()
+    if not store.has_table('daily_performance'): return None
+    perf = store.read('daily_performance', start_date, end_date, platforms, columns=['report_date', 'platform', 'campaign_id', 'impressions', 'clicks', 'spend', 'conversions', 'revenue'])
+    conn = get_db_connection()
+    names = pd.read_sql_query("SELECT campaign_id, campaign_name FROM campaigns", conn)
+    conn.close()
+    df = perf.merge(names, on='campaign_id', how='inner')
+    if campaigns: df = df[df['campaign_name'].isin(campaigns)]
+    return df[['report_date', 'platform', 'campaign_name', 'impressions', 'clicks', 'spend', 'conversions', 'revenue']].reset_index(drop=True)
+
 def get_campaign_list() -> list:
     conn = get_db_connection()
     df = pd.read_sql_query("SELECT DISTINCT campaign_name FROM campaigns ORDER BY campaign_name", conn)
@@ -1,19 +1,36 @@
-import pandas as pd, sqlite3
+import pandas as pd
 from config import DB_PATH
+from database import columnar_store
+from database.connection import get_connection
+from app.analysis_modules.metrics import add_ratio_metrics
 from datetime import date
 
+# Params: start_date, end_date
+CREATIVE_QUERY = "SELECT a.ad_id, a.ad_name, c.platform, a.creative_type, a.headline_text, SUM(dp.spend) as total_spend, SUM(dp.revenue) as total_revenue, SUM(dp.impressions) as total_impressions, SUM(dp.clicks) as total_clicks, SUM(dp.conversions) as total_conversions, AVG(dp.frequency) as avg_frequency FROM daily_performance dp JOIN ads a ON dp.ad_id = a.ad_id JOIN campaigns c ON dp.campaign_id = c.campaign_id WHERE dp.report_date BETWEEN ? AND ? GROUP BY a.ad_id, a.ad_name, c.platform, a.creative_type, a.headline_text"
+
 def fetch_creative_performance(start_date: str, end_date: str):
-    conn = sqlite3.connect(DB_PATH)
-    query = "SELECT a.ad_id, a.ad_name, c.platform, a.creative_type, a.headline_text, SUM(dp.spend) as total_spend, SUM(dp.revenue) as total_revenue, SUM(dp.impressions) as total_impressions, SUM(dp.clicks) as total_clicks, SUM(dp.conversions) as total_conversions, AVG(dp.frequency) as avg_frequency FROM daily_performance dp JOIN ads a ON dp.ad_id = a.ad_id JOIN campaigns c ON dp.campaign_id = c.campaign_id WHERE dp.report_date BETWEEN ? AND ? GROUP BY a.ad_id, a.ad_name, c.platform, a.creative_type, a.headline_text"
-    df = pd.read_sql_query(query, conn, params=[start_date, end_date])
-    conn.close()
+    df = _fetch_creative_columnar(start_date, end_date) if columnar_store.is_enabled() else None
+    if df is None:
+        conn = get_connection(DB_PATH)
+        df = pd.read_sql_query(CREATIVE_QUERY, conn, params=[start_date, end_date])
+        conn.close()
     if df.empty: return pd.DataFrame()
-    df['roas'] = (df['total_revenue'] / df['total_spend']).where(df['total_spend'] > 0, 0)
-    df['cpa'] = (df['total_spend'] / df['total_conversions']).where(df['total_conversions'] > 0, 0)
-    df['ctr'] = (df['total_clicks'] / df['total_impressions']).where(df['total_impressions'] > 0, 0)
+    add_ratio_metrics(df, ['roas', 'cpa', 'ctr'], prefix='total_', percent=False)
     df['fatigue_warning'] = (df['avg_frequency'] > 3) & (df['ctr'] < df['ctr'].quantile(0.4))
     return df
 
+def _fetch_creative_columnar(start_date: str, end_date: str):
+    """CREATIVE_QUERY's result aggregated from the Parquet mirror (None if it has not been built)."""
+    store = columnar_store.ColumnarStore()
+    if not store.has_table('daily_performance'): return None
+    perf = store.read('daily_performance', start_date, end_date, columns=['ad_id', 'platform', 'spend', 'revenue', 'impressions', 'clicks', 'conversions', 'frequency'])
+    totals = perf.groupby(['ad_id', 'platform']).agg(total_spend=('spend', 'sum'), total_revenue=('revenue', 'sum'), total_impressions=('impressions', 'sum'), total_clicks=('clicks', 'sum'), total_conversions=('conversions', 'sum'), avg_frequency=('frequency', 'mean')).reset_index()
+    conn = get_connection(DB_PATH)
+    ads = pd.read_sql_query("SELECT ad_id, ad_name, creative_type, headline_text FROM ads", conn)
+    conn.close()
+    df = ads.merge(totals, on='ad_id', how='inner')
+    return df[['ad_id', 'ad_name', 'platform', 'creative_type', 'headline_text', 'total_spend', 'total_revenue', 'total_impressions', 'total_clicks', 'total_conversions', 'avg_frequency']]
+
 def generate_recommendations(df: pd.DataFrame, cpa_target: float):
     recs, today = [], date.today().strftime('%Y-%m-%d')
     for _, row in df[df['cpa'] > (cpa_target * 1.5)].iterrows():
@@ -24,6 +41,6 @@ def generate_recommendations(df: pd.DataFrame, cpa_target: float):
 
 def save_recommendations(recs: list):
     if not recs: return
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection(DB_PATH)
     pd.DataFrame(recs).to_sql('recommendations', conn, if_exists='append', index=False)
     conn.close()
\ No newline at end of file
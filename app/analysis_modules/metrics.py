@@ -0,0 +1,146 @@
+# metrics.py
+# Ratio KPIs (ROAS, CPA, CTR, CPC, CPM, CVR) computed in one place, always as
+# sum(numerator) / sum(denominator) at whatever level the frame is at.
+
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# name -> (numerator, denominator, scale applied when percent=True)
+RATIO_METRICS = {
+    'roas': ('revenue', 'spend', 1.0),
+    'cpa': ('spend', 'conversions', 1.0),
+    'ctr': ('clicks', 'impressions', 100.0),
+    'cpc': ('spend', 'clicks', 1.0),
+    'cpm': ('spend', 'impressions', 1000.0),
+    'cvr': ('conversions', 'clicks', 100.0),
+}
+DEFAULT_METRICS = ('roas', 'cpa', 'ctr', 'cpc', 'cpm')
+
+# Additive columns the ratios are built from
+BASE_COLUMNS = ['spend', 'revenue', 'impressions', 'clicks', 'conversions']
+
+
+def safe_divide(numerator, denominator, scale: float = 1.0, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Element-wise numerator / denominator * scale, 0 where the denominator is not positive.
+
+    Divides only where the denominator is > 0, straight into `out`
+    (allocated once if not given), so no inf/NaN temporaries are created.
+    """
+    num = np.asarray(numerator, dtype=np.float64)
+    den = np.asarray(denominator, dtype=np.float64)
+    if out is None:
+        out = np.zeros(np.broadcast(num, den).shape, dtype=np.float64)
+    else:
+        out.fill(0.0)
+    np.divide(num, den, out=out, where=den > 0)
+    if scale != 1.0:
+        out *= scale
+    # A missing numerator counts as 0, like the old fillna(0)
+    np.nan_to_num(out, copy=False, nan=0.0)
+    return out
+
+
+def add_ratio_metrics(
+    df: pd.DataFrame,
+    metrics: Iterable[str] = DEFAULT_METRICS,
+    prefix: str = '',
+    percent: bool = True,
+    names: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Add ratio KPI columns to df in place.
+
+    Metrics whose input columns are missing are skipped.
+
+    Args:
+        df: Frame holding the additive columns (rows or pre-aggregated groups)
+        metrics: Keys of RATIO_METRICS to add
+        prefix: Prefix of the input columns (e.g. 'total_' for total_spend)
+        percent: Scale CTR to percent and CPM per mille; False gives plain fractions
+        names: Output column name per metric (defaults to the metric key)
+
+    Returns:
+        The same DataFrame
+    """
+    names = names or {}
+    arrays = {}
+    for metric in metrics:
+        num, den, scale = RATIO_METRICS[metric]
+        num, den = prefix + num, prefix + den
+        if num not in df.columns or den not in df.columns:
+            continue
+        if num not in arrays:
+            arrays[num] = df[num].to_numpy(dtype=np.float64)
+        if den not in arrays:
+            arrays[den] = df[den].to_numpy(dtype=np.float64)
+        df[names.get(metric, metric)] = safe_divide(arrays[num], arrays[den], scale if percent else 1.0)
+    return df
+
+
+def _bincount_sums(df: pd.DataFrame, key: str, columns: Sequence[str]) -> pd.DataFrame:
+    """Per-group sums for one key: factorize once, then one np.bincount per column."""
+    codes, uniques = pd.factorize(df[key], sort=True)
+    # Rows with a missing key (code -1) are dropped, as groupby does
+    valid = codes >= 0
+    has_missing = not valid.all()
+    if has_missing:
+        codes = codes[valid]
+    sums = {key: uniques}
+    for column in columns:
+        values = df[column].to_numpy()
+        if has_missing:
+            values = values[valid]
+        total = np.bincount(codes, weights=values, minlength=len(uniques))
+        # Integer counters come back as int64 whatever their stored width, like groupby().sum()
+        sums[column] = total.astype(np.int64) if np.issubdtype(values.dtype, np.integer) else total
+    return pd.DataFrame(sums)
+
+
+def aggregate_metrics(
+    df: pd.DataFrame,
+    by: Union[str, Sequence[str]],
+    metrics: Iterable[str] = DEFAULT_METRICS,
+    percent: bool = True,
+    columns: Sequence[str] = (),
+) -> pd.DataFrame:
+    """
+    Sum the base columns per group, then derive the ratios from those sums.
+
+    A single key is summed with np.bincount over factorized codes; several
+    keys go through one groupby().sum(). Either way no Python code runs
+    per group, unlike groupby().apply(lambda ...).
+
+    Args:
+        df: Row-level frame
+        by: Group key column(s)
+        metrics: Keys of RATIO_METRICS to add
+        percent: See add_ratio_metrics
+        columns: Extra columns to sum besides the metrics' inputs
+
+    Returns:
+        One row per group (sorted by key) with the group keys, the summed
+        inputs and extra columns, and the ratios
+    """
+    metrics = list(metrics)
+    needed = {c for m in metrics for c in RATIO_METRICS[m][:2]} | set(columns)
+    base = [c for c in BASE_COLUMNS if c in needed and c in df.columns]
+    base += [c for c in columns if c not in BASE_COLUMNS]
+    if isinstance(by, str) or len(by) == 1:
+        grouped = _bincount_sums(df, by if isinstance(by, str) else by[0], base)
+    else:
+        grouped = df.groupby(list(by), sort=True, observed=True)[base].sum().reset_index()
+    return add_ratio_metrics(grouped, metrics, percent=percent)
+
+
+def kpi_totals(df: pd.DataFrame, metrics: Iterable[str] = DEFAULT_METRICS, percent: bool = True) -> Dict[str, float]:
+    """Whole-frame totals of the base columns plus the ratios computed from them."""
+    totals = {c: df[c].sum() for c in BASE_COLUMNS if c in df.columns}
+    for metric in metrics:
+        num, den, scale = RATIO_METRICS[metric]
+        if num in totals and den in totals:
+            totals[metric] = float(safe_divide(totals[num], totals[den], scale if percent else 1.0))
+    return totals
+
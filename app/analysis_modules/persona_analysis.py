@@ -1,9 +1,10 @@
-import pandas as pd, sqlite3
+import pandas as pd
 from config import DB_PATH
+from database.connection import get_connection
 from datetime import datetime
 
 def calculate_rfm():
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection(DB_PATH)
     sales_df = pd.read_sql_query("SELECT customer_id, sale_date, sale_amount FROM sales", conn)
     conn.close()
     if sales_df.empty: return pd.DataFrame()
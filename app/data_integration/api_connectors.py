@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 from faker import Faker
-from typing import Optional
+from typing import Iterator, Optional
 
 fake = Faker()
 
@@ -15,24 +15,32 @@ from app.data_integration.meta_api import (
 from config import USE_LIVE_META_DATA
 
 
-def fetch_meta_data(start_date: str, end_date: str, account_id: Optional[str] = None) -> pd.DataFrame:
+def fetch_meta_data(
+    start_date: str,
+    end_date: str,
+    account_id: Optional[str] = None,
+    raise_errors: bool = False,
+) -> pd.DataFrame:
     """
     Fetch Meta (Facebook) Ads data.
 
     Uses live API data if USE_LIVE_META_DATA=true and credentials are configured,
-    otherwise falls back to mock data.
+    otherwise falls back to mock data. Live pulls go through the insights
+    cache and fetch accounts concurrently (MetaAdsClient.fetch_all_accounts_insights).
 
     Args:
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
         account_id: Optional specific account ID (fetches all if None)
+        raise_errors: Propagate API errors (e.g. rate limits) instead of
+            returning whatever the other accounts produced
 
     Returns:
         DataFrame with ad performance data
     """
     if USE_LIVE_META_DATA:
         # Use live Meta API
-        df = fetch_meta_live_data(start_date, end_date, account_id)
+        df = fetch_meta_live_data(start_date, end_date, account_id, raise_errors=raise_errors)
         if not df.empty:
             # Rename columns to match expected format
             df = df.rename(columns={
@@ -44,6 +52,42 @@ def fetch_meta_data(start_date: str, end_date: str, account_id: Optional[str] =
     return _generate_mock_meta_data(start_date, account_id)
 
 
+def iter_meta_data(
+    start_date: str,
+    end_date: str,
+    account_id: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream Meta (Facebook) Ads data in chunks instead of one DataFrame.
+
+    With live data enabled, each configured account (or just account_id) is
+    paged through MetaAdsClient.iter_insights, so only one chunk is held in
+    memory at a time. Otherwise the mock data is yielded as a single chunk.
+
+    Args:
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
+        account_id: Optional specific account ID (streams all if None)
+        chunk_size: Rows per chunk (defaults to the client's page size)
+
+    Yields:
+        DataFrame chunks in the same format as fetch_meta_data
+    """
+    if USE_LIVE_META_DATA:
+        client = get_meta_client()
+        streamed = False
+        for acc_id in ([account_id] if account_id else client.account_ids):
+            for chunk in client.iter_insights(acc_id, start_date, end_date, chunk_size=chunk_size):
+                streamed = True
+                yield chunk.rename(columns={'date_start': 'report_date'})
+        if streamed:
+            return
+
+    # Fallback to mock data
+    yield _generate_mock_meta_data(start_date, account_id)
+
+
 def _generate_mock_meta_data(start_date: str, account_id: Optional[str] = None) -> pd.DataFrame:
     """Generate mock Meta data (legacy function)."""
     # Get account prefix for IDs
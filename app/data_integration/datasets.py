@@ -0,0 +1,212 @@
+# datasets.py
+# Cross-page dataset registry: each named dataset is loaded once per
+# parameter set and shared by reference across pages and sessions
+
+import itertools
+import logging
+import weakref
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config import DATA_CACHE_TTL
+from app.analysis_modules.metrics import add_ratio_metrics
+from app.data_integration.frame_index import FrameIndex
+from app.data_integration.schema import apply_schema, memory_report
+from app.data_integration.demo_data import (
+    generate_campaign_data, generate_creative_data, generate_dashboard_demo_data, generate_persona_data,
+)
+
+logger = logging.getLogger(__name__)
+
+# Distinct (dataset, params) combinations kept in memory at once
+MAX_CACHED_DATASETS = 32
+
+_LOADERS: Dict[str, Callable[..., pd.DataFrame]] = {}
+
+# (name, params) -> weak reference to the cached frame, for the memory report;
+# entries die with the frame when the cache evicts it
+_LOADED: Dict[tuple, weakref.ref] = {}
+
+# (name, params) -> token of the frame currently cached for it. Every load
+# draws a new token, so a reload (TTL expiry, clear_datasets) changes the
+# identity that derived caches key on even when the params are the same
+_LOAD_TOKENS = itertools.count(1)
+_LOAD_VERSIONS: Dict[tuple, int] = {}
+
+
+def register_dataset(name: str, loader: Callable[..., pd.DataFrame]) -> None:
+    """Register a loader under a dataset name; keyword params become part of the cache key."""
+    _LOADERS[name] = loader
+
+
+def available_datasets() -> list:
+    return sorted(_LOADERS)
+
+
+# ============================================================================
+# LOADERS
+# ============================================================================
+
+def load_dashboard_campaign_daily(start_date: str = None, end_date: str = None, account_id: str = None) -> pd.DataFrame:
+    """
+    Load campaign data from Meta API.
+    Falls back to demo data if API is not configured or fails.
+    """
+    from app.data_integration.meta_api import fetch_meta_live_data
+
+    # Default date range: last 30 days
+    if not end_date:
+        end_date = datetime.now().strftime('%Y-%m-%d')
+    if not start_date:
+        start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+
+    try:
+        df = fetch_meta_live_data(start_date, end_date, account_id)
+
+        if not df.empty:
+            # Normalize column names for dashboard compatibility
+            df = df.rename(columns={
+                'account_friendly_name': 'account_name',
+                'date_start': 'date',
+            })
+            if 'date' in df.columns:
+                df['date'] = pd.to_datetime(df['date'])
+
+            # All Meta data; region defaults until a geo breakdown is wired in
+            df['platform'] = 'Meta Ads'
+            df['region'] = 'Saudi Arabia'
+
+            for col in ['impressions', 'clicks', 'spend', 'conversions', 'revenue']:
+                if col not in df.columns:
+                    df[col] = 0
+
+            return add_ratio_metrics(df)
+    except Exception as e:
+        st.warning(f"Could not fetch Meta API data: {e}. Using demo data.")
+
+    return generate_dashboard_demo_data()
+
+
+register_dataset('dashboard_campaign_daily', load_dashboard_campaign_daily)
+register_dataset('campaign_daily', generate_campaign_data)
+register_dataset('creative', generate_creative_data)
+register_dataset('persona', generate_persona_data)
+
+
+# ============================================================================
+# ACCESS
+# ============================================================================
+
+@st.cache_resource(ttl=DATA_CACHE_TTL, max_entries=MAX_CACHED_DATASETS, show_spinner=False)
+def _load_shared(name: str, params: tuple) -> pd.DataFrame:
+    logger.info(f"Loading dataset {name} {dict(params)}")
+    df = apply_schema(_LOADERS[name](**dict(params)))
+    _LOADED[(name, params)] = weakref.ref(df)
+    _LOAD_VERSIONS[(name, params)] = next(_LOAD_TOKENS)
+    return df
+
+
+def apply_filters(df: pd.DataFrame, filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    Row filters by column.
+
+    A (start, end) tuple is an inclusive range (dates are compared as
+    Timestamps), a list/set/array keeps rows whose value is in it, and any
+    other value is an equality match. None values are ignored.
+    """
+    if not filters:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    for column, value in filters.items():
+        if value is None:
+            continue
+        values = df[column]
+        if isinstance(value, tuple) and len(value) == 2:
+            start, end = value
+            if pd.api.types.is_datetime64_any_dtype(values):
+                start, end = pd.Timestamp(start), pd.Timestamp(end)
+            mask &= ((values >= start) & (values <= end)).to_numpy()
+        elif isinstance(value, (list, set, frozenset, np.ndarray, pd.Index, pd.Series)):
+            mask &= values.isin(list(value)).to_numpy()
+        else:
+            mask &= (values == value).to_numpy()
+    return df[mask]
+
+
+def get_dataset(name: str, filters: Optional[Dict[str, Any]] = None, **params) -> pd.DataFrame:
+    """
+    Named dataset shared across every page and session.
+
+    The frame is loaded once per (name, params) and held in
+    st.cache_resource, so pages asking for the same dataset share one copy
+    instead of each holding its own. Callers get a filtered frame or a
+    shallow copy: adding columns is safe, but values must not be modified
+    in place.
+
+    Args:
+        name: Registered dataset ('dashboard_campaign_daily', 'campaign_daily', 'creative', 'persona')
+        filters: Optional row filters, see apply_filters
+        **params: Loader arguments (e.g. start_date, account_id)
+
+    Returns:
+        DataFrame in the compact schema (see schema.apply_schema): label
+        columns are categorical, so group them with observed=True
+    """
+    if name not in _LOADERS:
+        raise KeyError(f"Unknown dataset '{name}'. Available: {available_datasets()}")
+    shared = _load_shared(name, tuple(sorted(params.items())))
+    if filters:
+        return apply_filters(shared, filters)
+    return shared.copy(deep=False)
+
+
+@st.cache_resource(ttl=DATA_CACHE_TTL, max_entries=MAX_CACHED_DATASETS, show_spinner=False)
+def _index_shared(name: str, params: tuple) -> FrameIndex:
+    logger.info(f"Indexing dataset {name} {dict(params)}")
+    df = _load_shared(name, params)
+    return FrameIndex(df, version=_LOAD_VERSIONS.get((name, params)))
+
+
+def get_dataset_index(name: str, **params) -> FrameIndex:
+    """
+    FrameIndex over a named dataset, built once per (name, params) and shared like get_dataset.
+
+    Use it for frames that are filtered over and over (dashboard sidebar
+    filters): index.filter(date=(start, end), platform=[...]) costs two
+    binary searches plus code lookups instead of a full boolean mask per
+    column. index.version identifies the load the index was built on; add
+    it to the key of anything cached from the index's rows.
+    """
+    if name not in _LOADERS:
+        raise KeyError(f"Unknown dataset '{name}'. Available: {available_datasets()}")
+    return _index_shared(name, tuple(sorted(params.items())))
+
+
+def clear_datasets() -> None:
+    """Drop every shared frame and index (e.g. after an upload or refresh)."""
+    _load_shared.clear()
+    _index_shared.clear()
+    _LOADED.clear()
+    _LOAD_VERSIONS.clear()
+
+
+def dataset_memory_report() -> List[Dict]:
+    """
+    Memory held by each cached dataset, largest first.
+
+    Returns:
+        One dictionary per live (dataset, params) entry: dataset, params and
+        the schema.memory_report fields (rows, total_bytes, columns)
+    """
+    report = []
+    for (name, params), ref in list(_LOADED.items()):
+        df = ref()
+        if df is None:
+            _LOADED.pop((name, params), None)
+            continue
+        report.append({'dataset': name, 'params': dict(params), **memory_report(df)})
+    return sorted(report, key=lambda entry: entry['total_bytes'], reverse=True)
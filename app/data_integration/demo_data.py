@@ -0,0 +1,181 @@
+# demo_data.py
+# Seeded, NumPy-vectorized demo data shared by the dashboard and pages
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from app.analysis_modules.metrics import add_ratio_metrics
+
+DEFAULT_SEED = 42
+
+# Campaign x platform grid used by the ML Insights and Export pages
+DEMO_CAMPAIGNS = ["Spring Sale 2025", "Summer Collection", "Bedroom Special", "Living Room Deals", "Office Furniture"]
+DEMO_PLATFORMS = ["Meta", "Google", "TikTok", "Snapchat"]
+
+# Main dashboard campaigns: platform and region follow from the name
+DASHBOARD_CAMPAIGNS = [
+    "FB_Furniture_SAU_Ret_001",
+    "GGL_Search_SAU_Conv_045",
+    "TT_Feed_UAE_Pros_022",
+    "META_Bedroom_KSA_Ret_089",
+    "GGL_Shopping_UAE_Conv_033",
+    "SNAP_Story_QAT_Aware_015",
+    "FB_Living_KWT_Ret_067",
+    "TT_TopView_SAU_Brand_012",
+]
+
+# Draw ranges: daily spend, spend -> impressions (CPM^-1 x 1000),
+# click-through, click -> conversion and revenue per conversion
+METRIC_PROFILES = {
+    'default': {'spend': (500, 2000), 'impr_per_spend': (800, 1200), 'ctr': (0.008, 0.035),
+                'cvr': (0.02, 0.08), 'aov': (300, 800)},
+    'dashboard': {'spend': (500, 2500), 'impr_per_spend': (800, 1200), 'ctr': (0.015, 0.045),
+                  'cvr': (0.03, 0.10), 'aov': (150, 450)},
+}
+
+CREATIVE_FORMATS = ['Video', 'Image', 'Carousel']
+PERSONA_SEGMENTS = ['High Value Shoppers', 'Budget Conscious', 'Design Enthusiasts', 'First Time Buyers', 'Repeat Customers']
+
+
+def campaign_platform(campaign: str) -> str:
+    """Dashboard platform label implied by a campaign name prefix."""
+    if campaign.startswith("FB") or campaign.startswith("META"):
+        return "Meta Ads"
+    if campaign.startswith("GGL"):
+        return "Google Ads"
+    if campaign.startswith("TT"):
+        return "TikTok Ads"
+    return "Snapchat Ads"
+
+
+def campaign_region(campaign: str) -> str:
+    """Region implied by the market code in a campaign name."""
+    if "SAU" in campaign or "KSA" in campaign:
+        return "Saudi Arabia"
+    if "UAE" in campaign:
+        return "UAE"
+    if "QAT" in campaign:
+        return "Qatar"
+    return "Kuwait"
+
+
+def _demo_dates(days: int, end: Optional[datetime]) -> pd.DatetimeIndex:
+    end = end or datetime.now()
+    return pd.date_range(start=end - timedelta(days=days), end=end, freq="D")
+
+
+def _campaign_names(campaigns: Union[int, Sequence[str]]) -> List[str]:
+    if isinstance(campaigns, int):
+        return [f"Campaign {i:05d}" for i in range(1, campaigns + 1)]
+    return list(campaigns)
+
+
+def _draw_metrics(rng: np.random.Generator, n: int, profile: Dict) -> Dict[str, np.ndarray]:
+    """Funnel metrics for n rows, each stage drawn from the previous one."""
+    spend = rng.uniform(*profile['spend'], n)
+    impressions = (spend * rng.uniform(*profile['impr_per_spend'], n)).astype(np.int64)
+    clicks = np.maximum(1, (impressions * rng.uniform(*profile['ctr'], n)).astype(np.int64))
+    conversions = np.maximum(0, (clicks * rng.uniform(*profile['cvr'], n)).astype(np.int64))
+    revenue = conversions * rng.uniform(*profile['aov'], n)
+    return {'spend': spend, 'impressions': impressions, 'clicks': clicks,
+            'conversions': conversions, 'revenue': revenue}
+
+
+def generate_campaign_data(
+    days: int = 90,
+    campaigns: Union[int, Sequence[str]] = DEMO_CAMPAIGNS,
+    platforms: Sequence[str] = DEMO_PLATFORMS,
+    seed: int = DEFAULT_SEED,
+    profile: str = 'default',
+    end: Optional[datetime] = None,
+) -> pd.DataFrame:
+    """
+    Daily campaign x platform demo frame with derived KPIs.
+
+    One row per (date, campaign, platform). Pass a larger `days` or an
+    integer `campaigns` (generated names) to build load-test sized frames.
+
+    Args:
+        days: Days of history ending at `end` (inclusive, so days + 1 dates)
+        campaigns: Campaign names, or how many to generate
+        platforms: Platform labels
+        seed: Seed for numpy's default_rng
+        profile: Key of METRIC_PROFILES
+        end: Last date (defaults to now)
+
+    Returns:
+        DataFrame with date, campaign_name, platform, metrics and KPIs
+    """
+    rng = np.random.default_rng(seed)
+    dates = _demo_dates(days, end)
+    names = _campaign_names(campaigns)
+    per_date = len(names) * len(platforms)
+    n = len(dates) * per_date
+
+    df = pd.DataFrame({
+        'date': np.repeat(dates.values, per_date),
+        'campaign_name': np.tile(np.repeat(names, len(platforms)), len(dates)),
+        'platform': np.tile(list(platforms), len(dates) * len(names)),
+    })
+    for column, values in _draw_metrics(rng, n, METRIC_PROFILES[profile]).items():
+        df[column] = values
+    return add_ratio_metrics(df)
+
+
+def generate_dashboard_demo_data(
+    days: int = 90,
+    campaigns: Sequence[str] = DASHBOARD_CAMPAIGNS,
+    seed: int = DEFAULT_SEED,
+    end: Optional[datetime] = None,
+) -> pd.DataFrame:
+    """Main-dashboard demo frame: one row per (date, campaign) with platform and region from the name."""
+    rng = np.random.default_rng(seed)
+    dates = _demo_dates(days, end)
+    names = list(campaigns)
+    n = len(dates) * len(names)
+
+    df = pd.DataFrame({
+        'date': np.repeat(dates.values, len(names)),
+        'campaign_name': np.tile(names, len(dates)),
+        'platform': np.tile([campaign_platform(c) for c in names], len(dates)),
+        'region': np.tile([campaign_region(c) for c in names], len(dates)),
+    })
+    for column, values in _draw_metrics(rng, n, METRIC_PROFILES['dashboard']).items():
+        df[column] = values
+    return add_ratio_metrics(df)
+
+
+def generate_creative_data(n: int = 50, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Per-creative totals for the Creative Analysis and Export pages."""
+    rng = np.random.default_rng(seed)
+    impressions = rng.uniform(10000, 100000, n).astype(np.int64)
+    clicks = (impressions * rng.uniform(0.01, 0.03, n)).astype(np.int64)
+    return pd.DataFrame({
+        'creative_id': [f"CR_{i:04d}" for i in range(1, n + 1)],
+        'format': rng.choice(CREATIVE_FORMATS, n),
+        'impressions': impressions,
+        'clicks': clicks,
+        'conversions': (clicks * rng.uniform(0.02, 0.08, n)).astype(np.int64),
+        'spend': rng.uniform(200, 1500, n).round(2),
+        'revenue': rng.uniform(500, 4000, n).round(2),
+        'ctr': (clicks / impressions * 100).round(2),
+    })
+
+
+def generate_persona_data(n: int = 1000, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Customer personas for the Segmentation Analysis and Export pages."""
+    rng = np.random.default_rng(seed)
+    segment = rng.choice(PERSONA_SEGMENTS, n)
+    high_value = segment == 'High Value Shoppers'
+    ltv = np.where(high_value, rng.uniform(500, 5000, n), rng.uniform(300, 2000, n))
+    return pd.DataFrame({
+        'customer_id': [f"CUST_{i:05d}" for i in range(n)],
+        'segment': segment,
+        'lifetime_value': ltv.round(2),
+        'avg_order_value': (ltv / rng.uniform(1, 5, n)).round(2),
+        'purchase_frequency': rng.uniform(1, 8, n).round(1),
+        'conversion_rate': rng.uniform(1, 8, n).round(2),
+    })
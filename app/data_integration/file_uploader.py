@@ -7,12 +7,63 @@ import pandas as pd
 import sqlite3
 from datetime import datetime
 from config import DB_PATH
+from database.rollups import refresh_rollups
+from database.columnar_store import sync_after_ingest
+from database.connection import get_connection
 from io import StringIO
+import os
 
 # ============================================================================
 # VALIDATION FUNCTIONS
 # ============================================================================
 
+def find_missing_ids(conn: sqlite3.Connection, table: str, column: str, ids: pd.Series) -> list:
+    """
+    Return the distinct uploaded IDs that have no row in table.column.
+
+    Only the upload's distinct IDs are sent to SQLite (into a TEMP table) and
+    anti-joined against the key index, so the full catalog is never loaded.
+    Missing IDs are returned in order of first appearance.
+    """
+    distinct = [str(v) for v in pd.unique(ids.dropna())]
+    if not distinct:
+        return []
+    
+    # The connection may be shared with a caller's open transaction: only end
+    # the implicit one the INSERT below opens if none was open before
+    caller_transaction = conn.in_transaction
+    conn.execute("DROP TABLE IF EXISTS temp.upload_ids")
+    conn.execute("CREATE TEMP TABLE upload_ids (id TEXT PRIMARY KEY)")
+    try:
+        conn.executemany("INSERT OR IGNORE INTO upload_ids (id) VALUES (?)", [(v,) for v in distinct])
+        missing = {row[0] for row in conn.execute(
+            f"SELECT u.id FROM upload_ids u LEFT JOIN {table} t ON t.{column} = u.id WHERE t.{column} IS NULL"
+        )}
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.upload_ids")
+        if not caller_transaction and conn.in_transaction:
+            conn.rollback()
+    
+    return [v for v in distinct if v in missing]
+
+
+def find_blank_ids(ids: pd.Series) -> list:
+    """
+    Return the index labels of rows whose ID is missing or blank.
+
+    find_missing_ids only compares real values, so key columns are checked
+    with this first: a null key would otherwise pass validation and fail the
+    NOT NULL constraint on upload.
+    """
+    blank = ids.isna() | ids.astype(str).str.strip().eq('')
+    return ids.index[blank].tolist()
+
+
+def _blank_ids_message(column: str, rows: list) -> str:
+    shown = ', '.join(map(str, rows[:10])) + (', ...' if len(rows) > 10 else '')
+    return f"Missing '{column}' in {len(rows)} row(s): {shown}"
+
+
 def validate_daily_performance_data(df: pd.DataFrame) -> tuple:
     """
     Validate daily performance data from CSV/Excel.
@@ -63,17 +114,20 @@ def validate_daily_performance_data(df: pd.DataFrame) -> tuple:
         if col not in validated_df.columns:
             validated_df[col] = default_value
     
-    # Check if campaign_ids and ad_ids exist in database
-    conn = sqlite3.connect(DB_PATH)
-    existing_campaigns = pd.read_sql_query("SELECT campaign_id FROM campaigns", conn)['campaign_id'].tolist()
-    existing_ads = pd.read_sql_query("SELECT ad_id FROM ads", conn)['ad_id'].tolist()
+    # Check if campaign_ids and ad_ids are present and exist in database
+    for col in ('campaign_id', 'ad_id'):
+        blank_rows = find_blank_ids(validated_df[col])
+        if blank_rows:
+            return False, _blank_ids_message(col, blank_rows), None
+    
+    conn = get_connection(DB_PATH)
+    invalid_campaigns = find_missing_ids(conn, 'campaigns', 'campaign_id', validated_df['campaign_id'])
+    invalid_ads = find_missing_ids(conn, 'ads', 'ad_id', validated_df['ad_id'])
     conn.close()
     
-    invalid_campaigns = validated_df[~validated_df['campaign_id'].isin(existing_campaigns)]['campaign_id'].unique()
     if len(invalid_campaigns) > 0:
         return False, f"Campaign IDs not found in database: {', '.join(map(str, invalid_campaigns))}", None
     
-    invalid_ads = validated_df[~validated_df['ad_id'].isin(existing_ads)]['ad_id'].unique()
     if len(invalid_ads) > 0:
         return False, f"Ad IDs not found in database: {', '.join(map(str, invalid_ads))}", None
     
@@ -116,16 +170,19 @@ def validate_segmented_data(df: pd.DataFrame) -> tuple:
             return False, f"Error validating '{col}': {str(e)}", None
     
     # Check foreign keys
-    conn = sqlite3.connect(DB_PATH)
-    existing_campaigns = pd.read_sql_query("SELECT campaign_id FROM campaigns", conn)['campaign_id'].tolist()
-    existing_ads = pd.read_sql_query("SELECT ad_id FROM ads", conn)['ad_id'].tolist()
+    for col in ('campaign_id', 'ad_id'):
+        blank_rows = find_blank_ids(validated_df[col])
+        if blank_rows:
+            return False, _blank_ids_message(col, blank_rows), None
+    
+    conn = get_connection(DB_PATH)
+    invalid_campaigns = find_missing_ids(conn, 'campaigns', 'campaign_id', validated_df['campaign_id'])
+    invalid_ads = find_missing_ids(conn, 'ads', 'ad_id', validated_df['ad_id'])
     conn.close()
     
-    invalid_campaigns = validated_df[~validated_df['campaign_id'].isin(existing_campaigns)]['campaign_id'].unique()
     if len(invalid_campaigns) > 0:
         return False, f"Invalid campaign IDs: {', '.join(map(str, invalid_campaigns))}", None
     
-    invalid_ads = validated_df[~validated_df['ad_id'].isin(existing_ads)]['ad_id'].unique()
     if len(invalid_ads) > 0:
         return False, f"Invalid ad IDs: {', '.join(map(str, invalid_ads))}", None
     
@@ -175,146 +232,365 @@ def validate_country_data(df: pd.DataFrame) -> tuple:
     return True, f"Validation successful! {len(validated_df)} rows ready to upload.", validated_df
 
 
+# ============================================================================
+# BULK UPSERT ENGINE
+# ============================================================================
+
+# Per-table column layout: conflict key, value columns with their type and
+# default (None = required), matching the UNIQUE constraints in schema.sql.
+UPSERT_SPECS = {
+    'daily_performance': {
+        'key': ['report_date', 'ad_id'],
+        'columns': {
+            'report_date': (str, None), 'ad_id': (str, None), 'campaign_id': (str, None),
+            'impressions': (int, None), 'reach': (int, 0), 'frequency': (float, 1.0),
+            'clicks': (int, None), 'spend': (float, None), 'video_views': (int, 0),
+            'add_to_carts': (int, 0), 'conversions': (int, None), 'revenue': (float, None),
+        },
+    },
+    'performance_by_segment': {
+        'key': ['report_date', 'ad_id', 'segment_type', 'segment_value'],
+        'columns': {
+            'report_date': (str, None), 'ad_id': (str, None), 'campaign_id': (str, None),
+            'segment_type': (str, None), 'segment_value': (str, None),
+            'impressions': (int, None), 'clicks': (int, None), 'spend': (float, None),
+            'conversions': (int, None), 'revenue': (float, None),
+        },
+    },
+    'performance_by_country': {
+        'key': ['report_date', 'platform', 'country'],
+        'columns': {
+            'report_date': (str, None), 'platform': (str, None), 'country': (str, None),
+            'impressions': (int, None), 'clicks': (int, None), 'spend': (float, None),
+            'conversions': (int, None), 'revenue': (float, None),
+        },
+    },
+}
+
+
+def _upsert_rows(df: pd.DataFrame, spec: dict) -> list:
+    """Convert a frame to a list of parameter tuples in spec column order."""
+    columns = []
+    for col, (kind, default) in spec['columns'].items():
+        if col in df.columns:
+            series = df[col]
+        elif default is not None:
+            series = pd.Series(default, index=df.index)
+        else:
+            raise KeyError(f"Missing required column '{col}'")
+        if kind is int:
+            series = series.astype('int64')
+        elif kind is float:
+            series = series.astype('float64')
+        else:
+            series = series.astype(str)
+        # Series.tolist() yields native Python scalars that sqlite3 can bind
+        columns.append(series.tolist())
+    return list(zip(*columns))
+
+
+def bulk_upsert(
+    df: pd.DataFrame,
+    table: str,
+    on_conflict: str = 'nothing',
+    use_staging: bool = False,
+    conn: sqlite3.Connection = None,
+    sync_mirror: bool = True,
+) -> dict:
+    """
+    Write a validated frame to one of the upload tables in a single transaction.
+
+    Rows are sent with executemany, either straight into the table or via a
+    temporary staging table followed by one INSERT ... SELECT. Conflicts on
+    the table's natural key are either skipped ('nothing') or overwrite the
+    existing row ('update'); updates that would not change anything count as
+    skipped.
+
+    Args:
+        df: Validated data (see validate_* functions)
+        table: 'daily_performance', 'performance_by_segment' or 'performance_by_country'
+        on_conflict: 'nothing' to keep existing rows, 'update' to overwrite them
+        use_staging: Load through a TEMP staging table
+        conn: Optional open connection (committed by this function)
+        sync_mirror: Rebuild the Parquet mirror months touched by the upload
+            once committed (False lets a caller sync once after many batches)
+
+    Returns:
+        dict with rows, inserted, updated, skipped and seconds
+    """
+    if table not in UPSERT_SPECS:
+        raise ValueError(f"Unsupported table: {table}")
+    if on_conflict not in ('nothing', 'update'):
+        raise ValueError("on_conflict must be 'nothing' or 'update'")
+
+    spec = UPSERT_SPECS[table]
+    cols = list(spec['columns'])
+    key = spec['key']
+    values = [c for c in cols if c not in key]
+
+    if on_conflict == 'update':
+        changed = ' OR '.join(f'{table}.{c} IS NOT excluded.{c}' for c in values)
+        conflict_sql = (
+            f"ON CONFLICT({', '.join(key)}) DO UPDATE SET "
+            + ', '.join(f'{c} = excluded.{c}' for c in values)
+            + f" WHERE {changed}"
+        )
+    else:
+        conflict_sql = f"ON CONFLICT({', '.join(key)}) DO NOTHING"
+
+    started = datetime.now()
+    rows = _upsert_rows(df, spec)
+    own_conn = conn is None
+    conn = conn or get_connection(DB_PATH)
+    try:
+        max_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+        changes_before = conn.total_changes
+
+        with conn:
+            if use_staging:
+                conn.execute("DROP TABLE IF EXISTS temp.upload_staging")
+                conn.execute(f"CREATE TEMP TABLE upload_staging AS SELECT {', '.join(cols)} FROM {table} WHERE 0")
+                conn.executemany(
+                    f"INSERT INTO upload_staging ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})", rows
+                )
+                changes_before = conn.total_changes
+                # "WHERE true" disambiguates the ON CONFLICT clause after a SELECT
+                conn.execute(
+                    f"INSERT INTO {table} ({', '.join(cols)}) "
+                    f"SELECT {', '.join(cols)} FROM upload_staging WHERE true {conflict_sql}"
+                )
+            else:
+                conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) {conflict_sql}",
+                    rows,
+                )
+
+            written = conn.total_changes - changes_before
+            # Ids are AUTOINCREMENT, so every new row lands above the old maximum
+            inserted = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE id > ?", (max_id,)).fetchone()[0]
+
+            if table == 'daily_performance' and written:
+                refresh_rollups(conn, df['report_date'].unique())
+            if use_staging:
+                conn.execute("DROP TABLE temp.upload_staging")
+
+        if sync_mirror and written:
+            sync_after_ingest(sorted(df['report_date'].astype(str).unique()), conn)
+    finally:
+        if own_conn:
+            conn.close()
+
+    updated = written - inserted
+    return {
+        'rows': len(rows),
+        'inserted': inserted,
+        'updated': updated,
+        'skipped': len(rows) - inserted - updated,
+        'seconds': (datetime.now() - started).total_seconds(),
+    }
+
+
+def _upsert_message(result: dict) -> str:
+    message = f"Successfully inserted {result['inserted']} rows."
+    if result['updated'] > 0:
+        message += f" Updated {result['updated']} existing records."
+    if result['skipped'] > 0:
+        message += f" Skipped {result['skipped']} duplicate records."
+    return message
+
+
 # ============================================================================
 # DATABASE INSERTION FUNCTIONS
 # ============================================================================
 
-def insert_daily_performance(df: pd.DataFrame) -> tuple:
+def insert_daily_performance(df: pd.DataFrame, on_conflict: str = 'nothing') -> tuple:
     """
     Insert daily performance data into the database.
     
+    Args:
+        df: Validated daily performance data
+        on_conflict: 'nothing' skips rows whose (report_date, ad_id) exists,
+            'update' overwrites them
+    
     Returns:
         tuple: (success: bool, message: str)
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        inserted_count = 0
-        skipped_count = 0
-        
-        for _, row in df.iterrows():
-            try:
-                cursor.execute("""
-                    INSERT INTO daily_performance 
-                    (report_date, ad_id, campaign_id, impressions, reach, frequency, 
-                     clicks, spend, video_views, add_to_carts, conversions, revenue)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    row['report_date'], row['ad_id'], row['campaign_id'],
-                    int(row['impressions']), int(row.get('reach', 0)), float(row.get('frequency', 1.0)),
-                    int(row['clicks']), float(row['spend']), 
-                    int(row.get('video_views', 0)), int(row.get('add_to_carts', 0)),
-                    int(row['conversions']), float(row['revenue'])
-                ))
-                inserted_count += 1
-            except sqlite3.IntegrityError:
-                # Skip duplicate records (same date + ad_id)
-                skipped_count += 1
-                continue
-        
-        conn.commit()
-        conn.close()
-        
-        message = f"Successfully inserted {inserted_count} rows."
-        if skipped_count > 0:
-            message += f" Skipped {skipped_count} duplicate records."
-        
-        return True, message
-        
+        return True, _upsert_message(bulk_upsert(df, 'daily_performance', on_conflict))
     except Exception as e:
         return False, f"Database error: {str(e)}"
 
 
-def insert_segmented_data(df: pd.DataFrame) -> tuple:
+def insert_segmented_data(df: pd.DataFrame, on_conflict: str = 'nothing') -> tuple:
     """
     Insert segmented performance data into the database.
     
+    Args:
+        df: Validated segmented data
+        on_conflict: 'nothing' to skip existing segments, 'update' to overwrite them
+    
     Returns:
         tuple: (success: bool, message: str)
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        inserted_count = 0
-        skipped_count = 0
-        
-        for _, row in df.iterrows():
-            try:
-                cursor.execute("""
-                    INSERT INTO performance_by_segment 
-                    (report_date, ad_id, campaign_id, segment_type, segment_value,
-                     impressions, clicks, spend, conversions, revenue)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    row['report_date'], row['ad_id'], row['campaign_id'],
-                    row['segment_type'], row['segment_value'],
-                    int(row['impressions']), int(row['clicks']), float(row['spend']),
-                    int(row['conversions']), float(row['revenue'])
-                ))
-                inserted_count += 1
-            except sqlite3.IntegrityError:
-                skipped_count += 1
-                continue
-        
-        conn.commit()
-        conn.close()
-        
-        message = f"Successfully inserted {inserted_count} rows."
-        if skipped_count > 0:
-            message += f" Skipped {skipped_count} duplicate records."
-        
-        return True, message
-        
+        return True, _upsert_message(bulk_upsert(df, 'performance_by_segment', on_conflict))
     except Exception as e:
         return False, f"Database error: {str(e)}"
 
 
-def insert_country_data(df: pd.DataFrame) -> tuple:
+def insert_country_data(df: pd.DataFrame, on_conflict: str = 'nothing') -> tuple:
     """
     Insert country performance data into the database.
     
+    Args:
+        df: Validated country data
+        on_conflict: 'nothing' to skip existing rows, 'update' to overwrite them
+    
     Returns:
         tuple: (success: bool, message: str)
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        inserted_count = 0
-        skipped_count = 0
-        
-        for _, row in df.iterrows():
-            try:
-                cursor.execute("""
-                    INSERT INTO performance_by_country 
-                    (report_date, platform, country, impressions, clicks, 
-                     spend, conversions, revenue)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    row['report_date'], row['platform'], row['country'],
-                    int(row['impressions']), int(row['clicks']), float(row['spend']),
-                    int(row['conversions']), float(row['revenue'])
-                ))
-                inserted_count += 1
-            except sqlite3.IntegrityError:
-                skipped_count += 1
-                continue
-        
-        conn.commit()
-        conn.close()
-        
-        message = f"Successfully inserted {inserted_count} rows."
-        if skipped_count > 0:
-            message += f" Skipped {skipped_count} duplicate records."
-        
-        return True, message
-        
+        return True, _upsert_message(bulk_upsert(df, 'performance_by_country', on_conflict))
     except Exception as e:
         return False, f"Database error: {str(e)}"
 
 
+# ============================================================================
+# STREAMING INGESTION
+# ============================================================================
+
+# data_type -> (validator, target table)
+STREAM_TARGETS = {
+    'daily_performance': (validate_daily_performance_data, 'daily_performance'),
+    'segmented': (validate_segmented_data, 'performance_by_segment'),
+    'country': (validate_country_data, 'performance_by_country'),
+}
+
+DEFAULT_CHUNK_ROWS = 50000
+
+
+def iter_file_chunks(file, file_name: str, chunk_size: int = DEFAULT_CHUNK_ROWS):
+    """
+    Yield DataFrame chunks of at most chunk_size rows from a CSV or Excel file.
+
+    CSVs are read with pandas' chunked reader. .xlsx sheets are streamed row
+    by row through openpyxl's read-only mode; legacy .xls files have no
+    streaming reader and are loaded whole, then sliced.
+
+    Args:
+        file: Path or binary file-like object (e.g. a Streamlit UploadedFile)
+        file_name: Original file name, used to detect the format
+        chunk_size: Rows per chunk
+    """
+    name = file_name.lower()
+    if name.endswith('.csv'):
+        for chunk in pd.read_csv(file, chunksize=chunk_size):
+            yield chunk
+        return
+
+    if name.endswith('.xls'):
+        df = pd.read_excel(file)
+        for offset in range(0, len(df), chunk_size):
+            yield df.iloc[offset:offset + chunk_size]
+        return
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(c) if c is not None else f'column_{i}' for i, c in enumerate(header)]
+        batch = []
+        for row in rows:
+            if row is None or all(v is None for v in row):
+                continue
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns)
+    finally:
+        workbook.close()
+
+
+def stream_upload(
+    file,
+    file_name: str,
+    data_type: str,
+    chunk_size: int = DEFAULT_CHUNK_ROWS,
+    on_conflict: str = 'nothing',
+    progress_callback=None,
+) -> dict:
+    """
+    Validate and load a file chunk by chunk through the bulk upsert path.
+
+    Only one chunk is held in memory at a time. A chunk that fails
+    validation is not written; its error is recorded with its row range and
+    the remaining chunks are still processed.
+
+    Args:
+        file: Path or binary file-like object
+        file_name: Original file name, used to detect the format
+        data_type: One of STREAM_TARGETS ('daily_performance', 'segmented', 'country')
+        chunk_size: Rows per chunk
+        on_conflict: Passed to bulk_upsert ('nothing' or 'update')
+        progress_callback: Optional callable(rows_done, fraction, result) after each chunk;
+            fraction is None when the file size is unknown
+
+    Returns:
+        dict with rows, inserted, updated, skipped, chunks, rejected_rows, errors, seconds
+    """
+    if data_type not in STREAM_TARGETS:
+        raise ValueError(f"Unknown data type: {data_type}")
+    validator, table = STREAM_TARGETS[data_type]
+
+    total_bytes = getattr(file, 'size', None)
+    if total_bytes is None and isinstance(file, str) and os.path.exists(file):
+        total_bytes = os.path.getsize(file)
+
+    result = {
+        'rows': 0, 'inserted': 0, 'updated': 0, 'skipped': 0,
+        'chunks': 0, 'rejected_rows': 0, 'errors': [], 'seconds': 0.0,
+    }
+    started = datetime.now()
+    written_dates = set()
+    conn = get_connection(DB_PATH)
+    try:
+        for chunk in iter_file_chunks(file, file_name, chunk_size):
+            first_row = result['rows'] + result['rejected_rows'] + 1
+            is_valid, message, validated = validator(chunk)
+            if is_valid:
+                counts = bulk_upsert(validated, table, on_conflict, conn=conn, sync_mirror=False)
+                for key in ('rows', 'inserted', 'updated', 'skipped'):
+                    result[key] += counts[key]
+                if counts['inserted'] or counts['updated']:
+                    written_dates.update(validated['report_date'].astype(str).unique())
+            else:
+                result['rejected_rows'] += len(chunk)
+                result['errors'].append(f"Rows {first_row}-{first_row + len(chunk) - 1}: {message}")
+            result['chunks'] += 1
+            del chunk, validated
+
+            if progress_callback:
+                fraction = None
+                # Byte position is only meaningful for the streaming CSV reader
+                if total_bytes and hasattr(file, 'tell') and file_name.lower().endswith('.csv'):
+                    fraction = min(file.tell() / total_bytes, 1.0)
+                progress_callback(result['rows'] + result['rejected_rows'], fraction, result)
+
+        # One mirror rebuild for the whole file instead of one per chunk
+        if written_dates:
+            sync_after_ingest(sorted(written_dates), conn)
+    finally:
+        conn.close()
+
+    result['seconds'] = (datetime.now() - started).total_seconds()
+    return result
+
+
 # ============================================================================
 # TEMPLATE GENERATION
 # ============================================================================
@@ -0,0 +1,161 @@
+# frame_index.py
+# In-memory index over a campaign frame for repeated dashboard filtering:
+# rows sorted by date once, date ranges found by binary search, and
+# platform/region/campaign held as small integer codes with per-code
+# posting lists, so a filter only touches rows inside its date range.
+
+import logging
+from typing import Dict, Hashable, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+INDEXED_COLUMNS = ('platform', 'region', 'campaign_name')
+
+# Posting lists are merged only when they select under 1/N of all rows;
+# broader filters scan the date slice instead
+POSTING_SELECTIVITY = 8
+
+
+class FrameIndex:
+    """
+    Date-sorted, category-coded view of a frame.
+
+    Built once per dataset (see datasets.get_dataset_index); every filter
+    afterwards is a pair of binary searches plus posting-list lookups and
+    returns a slice or an index array into `frame` rather than a copy.
+    `version` is the load token of the data it was built on, so results
+    cached from the index can be keyed on it.
+
+    Usage:
+        index = FrameIndex(df)
+        rows = index.positions(date=(start, end), platform=['Meta Ads'])
+        view = index.take(rows)
+    """
+
+    def __init__(self, df: pd.DataFrame, date_column: str = 'date', columns: Sequence[str] = INDEXED_COLUMNS,
+                 version: Hashable = None):
+        self.date_column = date_column
+        self.version = version
+        self.frame = df.sort_values(date_column, kind='stable').reset_index(drop=True)
+        self._dates = self.frame[date_column].to_numpy(dtype='datetime64[ns]')
+
+        self._codes: Dict[str, np.ndarray] = {}
+        self._lookup: Dict[str, Dict] = {}
+        self._postings: Dict[str, list] = {}
+        # Columns with missing values (factorize code -1); no value list selects them
+        self._has_missing: Dict[str, bool] = {}
+        for column in columns:
+            if column not in self.frame.columns:
+                continue
+            codes, uniques = pd.factorize(self.frame[column])
+            has_missing = bool((codes < 0).any())
+            # Keep a signed dtype when -1 is present so it stays distinguishable
+            codes = codes.astype(np.int32 if has_missing else np.min_scalar_type(max(len(uniques), 1)))
+            self._codes[column] = codes
+            self._has_missing[column] = has_missing
+            self._lookup[column] = {value: code for code, value in enumerate(uniques)}
+            # Row positions per code, ascending, i.e. in date order
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self._postings[column] = [order[bounds[c]:bounds[c + 1]] for c in range(len(uniques))]
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def categories(self, column: str) -> list:
+        """Distinct values of an indexed column, in first-seen order."""
+        return list(self._lookup[column])
+
+    def _date_bounds(self, date_range: Optional[Tuple]) -> Tuple[int, int]:
+        """Row slice [lo, hi) whose dates fall in the inclusive (start, end) range."""
+        if date_range is None:
+            return 0, len(self._dates)
+        start, end = date_range
+        lo = 0 if start is None else int(np.searchsorted(self._dates, pd.Timestamp(start).to_datetime64(), 'left'))
+        hi = len(self._dates) if end is None else int(np.searchsorted(self._dates, pd.Timestamp(end).to_datetime64(), 'right'))
+        return lo, max(lo, hi)
+
+    def _allowed_codes(self, column: str, values: Iterable) -> Optional[np.ndarray]:
+        """Codes for the selected values, or None when they select every row (all categories, no missing values)."""
+        lookup = self._lookup[column]
+        codes = np.unique([lookup[v] for v in values if v in lookup]).astype(np.int64)
+        return None if len(codes) == len(lookup) and not self._has_missing[column] else codes
+
+    def positions(self, date: Optional[Tuple] = None, **filters: Optional[Iterable]) -> Union[slice, np.ndarray]:
+        """
+        Rows matching an inclusive date range and per-column value lists.
+
+        Args:
+            date: (start, end) bounds, either may be None
+            **filters: Indexed column -> selected values (None = no filter)
+
+        Returns:
+            A slice when only the date range applies, else a sorted int64
+            array of row positions into `frame`
+        """
+        lo, hi = self._date_bounds(date)
+        active = {}
+        for column, values in filters.items():
+            if values is None:
+                continue
+            if column not in self._codes:
+                raise KeyError(f"Column '{column}' is not indexed. Indexed: {list(self._codes)}")
+            allowed = self._allowed_codes(column, [values] if isinstance(values, str) else values)
+            if allowed is not None:
+                active[column] = allowed
+        if not active:
+            return slice(lo, hi)
+        if any(len(allowed) == 0 for allowed in active.values()):
+            return np.empty(0, dtype=np.int64)
+
+        # Selective filter: union the posting lists of the column selecting the
+        # fewest rows, cut each to the date range, then check the other columns
+        def selected_rows(column):
+            return sum(len(self._postings[column][c]) for c in active[column])
+        driver = min(active, key=selected_rows)
+        if len(active[driver]) == 1 or selected_rows(driver) * POSTING_SELECTIVITY < len(self._dates):
+            parts = []
+            for code in active.pop(driver):
+                posting = self._postings[driver][code]
+                parts.append(posting[np.searchsorted(posting, lo):np.searchsorted(posting, hi)])
+            rows = np.concatenate(parts) if len(parts) > 1 else parts[0]
+            if len(parts) > 1:
+                rows.sort()
+            for column, allowed in active.items():
+                rows = rows[self._match(self._codes[column][rows], allowed)]
+            return rows
+
+        # Broad filter: match codes over the contiguous date slice
+        mask = np.ones(hi - lo, dtype=bool)
+        for column, allowed in active.items():
+            mask &= self._match(self._codes[column][lo:hi], allowed)
+        return lo + np.flatnonzero(mask)
+
+    @staticmethod
+    def _match(codes: np.ndarray, allowed: np.ndarray) -> np.ndarray:
+        """Boolean mask of codes in allowed; missing values (code -1) never match."""
+        if len(allowed) <= 8:
+            # A few compares on narrow int codes beat a fancy-indexed lookup table
+            mask = codes == allowed[0]
+            for code in allowed[1:]:
+                mask |= codes == code
+            return mask
+        table = np.zeros(int(allowed.max()) + 1, dtype=bool)
+        table[allowed] = True
+        inside = (codes >= 0) & (codes <= allowed.max())
+        mask = np.zeros(len(codes), dtype=bool)
+        mask[inside] = table[codes[inside].astype(np.intp)]
+        return mask
+
+    def take(self, rows: Union[slice, np.ndarray]) -> pd.DataFrame:
+        """Frame for positions(): a view for a slice, a gathered copy for an index array."""
+        if isinstance(rows, slice):
+            return self.frame.iloc[rows]
+        return self.frame.take(rows)
+
+    def filter(self, date: Optional[Tuple] = None, **filters: Optional[Iterable]) -> pd.DataFrame:
+        """positions() and take() in one call."""
+        return self.take(self.positions(date, **filters))
@@ -0,0 +1,243 @@
+# insights_cache.py
+# Persistent on-disk cache for daily Meta insights
+
+import json
+import logging
+import math
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from database.connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Days newer than this many days ago may still receive late-attributed
+# conversions, so they are never treated as cached (today and yesterday).
+OPEN_DAYS = 2
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def date_range_days(start_date, end_date) -> List[date]:
+    """Every calendar day in [start_date, end_date], inclusive."""
+    start, end = _to_date(start_date), _to_date(end_date)
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def is_day_closed(day, today: Optional[date] = None) -> bool:
+    """A day is closed (immutable) once it is older than yesterday."""
+    today = today or date.today()
+    return _to_date(day) <= today - timedelta(days=OPEN_DAYS)
+
+
+def merge_day_gaps(days: List[date], max_bridge_days: int = 0) -> List[Tuple[date, date]]:
+    """
+    Collapse a list of days into inclusive (since, until) ranges.
+
+    Consecutive days always share a range. Two gaps separated by at most
+    max_bridge_days already-cached days are merged as well, trading a few
+    re-downloaded days for one fewer API call.
+    """
+    ranges: List[Tuple[date, date]] = []
+    for day in sorted(set(_to_date(d) for d in days)):
+        if ranges and (day - ranges[-1][1]).days <= max_bridge_days + 1:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+class InsightsCache:
+    """
+    SQLite-backed store of Meta insights partitioned by
+    (account_id, level, breakdown, day).
+
+    Each partition holds the processed rows returned by the API for that day
+    as a JSON payload. Empty days are stored too, so a day with no delivery is
+    not re-requested. Only closed days count as cached.
+    """
+
+    def __init__(self, path: str = None):
+        import config
+        self.path = path or config.META_INSIGHTS_CACHE_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS insights_partitions (
+                    account_id TEXT NOT NULL,
+                    level TEXT NOT NULL,
+                    breakdown TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL,
+                    PRIMARY KEY (account_id, level, breakdown, day)
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = get_connection(self.path)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def cached_days(
+        self,
+        account_id: str,
+        level: str,
+        breakdown: Optional[str],
+        start_date,
+        end_date,
+    ) -> List[date]:
+        """Closed days in the range that already have a stored partition."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT day FROM insights_partitions "
+                "WHERE account_id = ? AND level = ? AND breakdown = ? AND day BETWEEN ? AND ?",
+                (account_id, level, breakdown or '', str(_to_date(start_date)), str(_to_date(end_date))),
+            ).fetchall()
+        return sorted(_to_date(r[0]) for r in rows if is_day_closed(r[0]))
+
+    def missing_days(
+        self,
+        account_id: str,
+        level: str,
+        breakdown: Optional[str],
+        start_date,
+        end_date,
+    ) -> List[date]:
+        """Days in the range that must be fetched from the API."""
+        cached = set(self.cached_days(account_id, level, breakdown, start_date, end_date))
+        return [d for d in date_range_days(start_date, end_date) if d not in cached]
+
+    def plan_fetch(
+        self,
+        account_id: str,
+        level: str,
+        breakdown: Optional[str],
+        start_date,
+        end_date,
+        max_bridge_days: int = 0,
+        page_size: int = 500,
+    ) -> Dict[str, Any]:
+        """
+        Work out which time_ranges must be requested to cover [start_date, end_date].
+
+        Returns:
+            Dict with 'ranges' (list of (since, until) dates to fetch) and
+            counters describing how much of the window the cache covers:
+            requested_days, cached_days, fetch_days, api_calls,
+            api_calls_avoided and rows_avoided. api_calls_avoided counts the
+            paged requests (page_size rows each) that would have been needed
+            to download the rows served from the cache.
+        """
+        start, end = str(_to_date(start_date)), str(_to_date(end_date))
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT day, row_count FROM insights_partitions "
+                "WHERE account_id = ? AND level = ? AND breakdown = ? AND day BETWEEN ? AND ?",
+                (account_id, level, breakdown or '', start, end),
+            ).fetchall()
+        cached = {_to_date(day): count for day, count in rows if is_day_closed(day)}
+
+        requested = date_range_days(start, end)
+        missing = [d for d in requested if d not in cached]
+        ranges = merge_day_gaps(missing, max_bridge_days)
+
+        refetched = set()
+        for since, until in ranges:
+            refetched.update(date_range_days(since, until))
+        served = [d for d in cached if d not in refetched]
+        rows_avoided = sum(cached[d] for d in served)
+
+        return {
+            'ranges': ranges,
+            'requested_days': len(requested),
+            'cached_days': len(served),
+            'fetch_days': len(refetched),
+            'api_calls': len(ranges),
+            'api_calls_avoided': math.ceil(rows_avoided / page_size) if page_size else 0,
+            'rows_avoided': rows_avoided,
+        }
+
+    def read(
+        self,
+        account_id: str,
+        level: str,
+        breakdown: Optional[str],
+        start_date,
+        end_date,
+    ) -> pd.DataFrame:
+        """Load all stored rows for the range, ordered by day."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM insights_partitions "
+                "WHERE account_id = ? AND level = ? AND breakdown = ? AND day BETWEEN ? AND ? "
+                "AND row_count > 0 ORDER BY day",
+                (account_id, level, breakdown or '', str(_to_date(start_date)), str(_to_date(end_date))),
+            ).fetchall()
+
+        records = []
+        for (payload,) in rows:
+            records.extend(json.loads(payload))
+        return pd.DataFrame(records)
+
+    def write(
+        self,
+        account_id: str,
+        level: str,
+        breakdown: Optional[str],
+        days: List[date],
+        df: pd.DataFrame,
+        day_column: str = 'date_start',
+    ) -> None:
+        """
+        Store one partition per day in `days`, splitting df on day_column.
+        Days with no rows in df are stored as empty partitions.
+        """
+        by_day: Dict[str, pd.DataFrame] = {}
+        if not df.empty and day_column in df.columns:
+            day_keys = df[day_column].astype(str).str[:10]
+            by_day = {key: part for key, part in df.groupby(day_keys, sort=False)}
+
+        fetched_at = datetime.now().isoformat(timespec='seconds')
+        rows = []
+        for day in days:
+            part = by_day.get(str(_to_date(day)))
+            records = [] if part is None else part.to_dict(orient='records')
+            rows.append((
+                account_id, level, breakdown or '', str(_to_date(day)),
+                len(records), json.dumps(records, default=str), fetched_at,
+            ))
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO insights_partitions "
+                "(account_id, level, breakdown, day, row_count, payload, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        logger.info(f"Cached {len(rows)} day partitions for {account_id} ({level}, {breakdown or 'none'})")
+
+    def clear(self, account_id: str = None) -> None:
+        """Drop stored partitions (all, or for one account)."""
+        with self._connect() as conn:
+            if account_id:
+                conn.execute("DELETE FROM insights_partitions WHERE account_id = ?", (account_id,))
+            else:
+                conn.execute("DELETE FROM insights_partitions")
@@ -4,8 +4,10 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import logging
+import time
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -27,6 +29,7 @@ except ImportError:
 import sys
 sys.path.insert(0, '.')
 import config
+from app.data_integration.insights_cache import InsightsCache, date_range_days, is_day_closed
 
 
 def get_config_values():
@@ -39,9 +42,60 @@ def get_config_values():
         'ad_accounts': config.META_AD_ACCOUNTS,
         'account_names': config.META_ACCOUNT_NAMES,
         'use_live_data': config.USE_LIVE_META_DATA,
+        'max_workers': getattr(config, 'META_FETCH_MAX_WORKERS', 8),
+        'account_timeout': getattr(config, 'META_ACCOUNT_TIMEOUT', 120.0),
+        'cache_enabled': getattr(config, 'META_INSIGHTS_CACHE_ENABLED', False),
     }
 
 
+def extract_action_columns(actions: pd.Series, action_types: List[str] = None) -> pd.DataFrame:
+    """
+    Flatten a column of Meta action lists into a wide numeric frame.
+
+    Each cell is a list of {'action_type': ..., 'value': ...} dicts (or
+    missing). All lists are walked once, collecting (row, type, value)
+    triples that are scattered into a preallocated float matrix with one
+    column per action type, aligned with the input rows. The
+    first entry wins if a type repeats within a row; absent types are 0.
+
+    Args:
+        actions: Series of action lists (e.g. df['actions'])
+        action_types: Types to return as columns, in order (None = every type seen)
+
+    Returns:
+        DataFrame indexed like `actions` with one column per action type
+    """
+    columns = list(action_types) if action_types is not None else []
+    position = {action_type: i for i, action_type in enumerate(columns)}
+    rows, cols, values = [], [], []
+
+    for i, cell in enumerate(actions.to_numpy()):
+        if not isinstance(cell, list):
+            continue
+        for action in cell:
+            action_type = action.get('action_type')
+            j = position.get(action_type)
+            if j is None:
+                if action_types is not None or action_type is None:
+                    continue
+                j = position[action_type] = len(columns)
+                columns.append(action_type)
+            rows.append(i)
+            cols.append(j)
+            values.append(action.get('value', 0))
+
+    wide = np.zeros((len(actions), len(columns)), dtype=np.float64)
+    if rows:
+        try:
+            numeric = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            numeric = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').fillna(0.0).to_numpy()
+        # Assign in reverse so the first occurrence of a repeated type wins
+        wide[rows[::-1], cols[::-1]] = numeric[::-1]
+
+    return pd.DataFrame(wide, index=actions.index, columns=list(columns))
+
+
 class MetaAdsClient:
     """
     Multi-account Meta Ads API client.
@@ -72,6 +126,14 @@ class MetaAdsClient:
         'date_stop',
     ]
 
+    # Action types extracted from `actions` (as action_<type>) and
+    # `action_values` (as <type>_value); override per client if needed
+    ACTION_TYPES = ['purchase', 'add_to_cart', 'lead', 'complete_registration', 'link_click']
+    ACTION_VALUE_TYPES = ['purchase']
+
+    # Rows per page requested from the insights endpoint
+    INSIGHTS_PAGE_SIZE = 500
+
     # Breakdown fields for segmented data
     BREAKDOWN_FIELDS = {
         'age_gender': ['age', 'gender'],
@@ -81,13 +143,27 @@ class MetaAdsClient:
         'region': ['region'],
     }
 
-    def __init__(self, access_token: str = None, account_ids: List[str] = None):
+    def __init__(
+        self,
+        access_token: str = None,
+        account_ids: List[str] = None,
+        max_workers: int = None,
+        account_timeout: float = None,
+        cache: Optional[InsightsCache] = None,
+        action_types: List[str] = None,
+        action_value_types: List[str] = None,
+    ):
         """
         Initialize the Meta Ads client.
 
         Args:
             access_token: Meta API access token (uses config if not provided)
             account_ids: List of ad account IDs (uses config if not provided)
+            max_workers: Max accounts fetched in parallel (1 = sequential)
+            account_timeout: Seconds to wait for a single account before giving up
+            cache: On-disk insights cache (created from config for live data if not provided)
+            action_types: Action types to extract from `actions` (default ACTION_TYPES)
+            action_value_types: Action types to extract from `action_values` (default ACTION_VALUE_TYPES)
         """
         # Get fresh config values
         cfg = get_config_values()
@@ -96,8 +172,23 @@ class MetaAdsClient:
         self.account_ids = account_ids or cfg['ad_accounts']
         self.account_names = cfg['account_names']
         self.use_live_data = cfg['use_live_data']
+        self.max_workers = max(1, int(max_workers or cfg['max_workers']))
+        self.account_timeout = account_timeout or cfg['account_timeout']
+        self.action_types = list(action_types or self.ACTION_TYPES)
+        self.action_value_types = list(
+            self.ACTION_VALUE_TYPES if action_value_types is None else action_value_types
+        )
         self.initialized = False
 
+        # Outcome of the last multi-account fetch (see _fetch_per_account)
+        self.last_fetch_report: Dict[str, Any] = {}
+
+        # Per-account cache plan counters from the last cached insights pull.
+        # Cached days separated by at most max_bridge_days are re-fetched so
+        # that neighbouring gaps share a single time_range.
+        self.fetch_plans: Dict[str, Dict[str, int]] = {}
+        self.max_bridge_days = 3
+
         if META_SDK_AVAILABLE and self.access_token and self.use_live_data:
             try:
                 FacebookAdsApi.init(access_token=self.access_token)
@@ -107,6 +198,14 @@ class MetaAdsClient:
                 logger.error(f"Failed to initialize Meta API: {e}")
                 self.initialized = False
 
+        # Only live data is persisted; mock data is regenerated on every call
+        self.cache = cache
+        if self.cache is None and self.initialized and cfg['cache_enabled']:
+            try:
+                self.cache = InsightsCache()
+            except Exception as e:
+                logger.error(f"Failed to open Meta insights cache: {e}")
+
     def get_account_name(self, account_id: str) -> str:
         """Get friendly name for an account ID."""
         return self.account_names.get(account_id, account_id)
@@ -172,48 +271,167 @@ class MetaAdsClient:
         Returns:
             DataFrame with insights data
         """
-        if not self.initialized:
-            return self._mock_insights(account_id, start_date, end_date, level)
-
         try:
-            account = AdAccount(account_id)
+            return self._request_insights(
+                account_id, start_date, end_date, level, breakdown, time_increment
+            )
+        except Exception as e:
+            logger.error(f"Error fetching insights for {account_id}: {e}")
+            return pd.DataFrame()
+
+    def _request_insights(
+        self,
+        account_id: str,
+        start_date: str,
+        end_date: str,
+        level: str = 'ad',
+        breakdown: str = None,
+        time_increment: str = '1',
+    ) -> pd.DataFrame:
+        """
+        Fetch insights for one account, letting API errors propagate.
 
-            params = {
-                'time_range': {
-                    'since': start_date,
-                    'until': end_date,
-                },
-                'level': level,
-                'time_increment': time_increment,
-            }
-
-            # Add breakdown if specified
-            if breakdown and breakdown in self.BREAKDOWN_FIELDS:
-                params['breakdowns'] = self.BREAKDOWN_FIELDS[breakdown]
-
-            insights = account.get_insights(
-                fields=self.INSIGHT_FIELDS,
-                params=params,
+        Daily pulls go through the on-disk cache when one is configured:
+        the cache plans which day ranges are not yet stored, only those
+        gaps (plus today/yesterday) are requested from the API, and the
+        result is stitched together from cached and fresh partitions.
+        """
+        if self.cache is None or str(time_increment) != '1':
+            return self._call_insights_api(
+                account_id, start_date, end_date, level, breakdown, time_increment
             )
 
-            # Convert to DataFrame
-            data = [dict(insight) for insight in insights]
-            df = pd.DataFrame(data)
+        plan = self.cache.plan_fetch(
+            account_id, level, breakdown, start_date, end_date,
+            max_bridge_days=self.max_bridge_days,
+            page_size=self.INSIGHTS_PAGE_SIZE,
+        )
+        fresh_parts = []
+        for since, until in plan['ranges']:
+            df = self._call_insights_api(
+                account_id, str(since), str(until), level, breakdown, time_increment
+            )
+            closed = [d for d in date_range_days(since, until) if is_day_closed(d)]
+            if closed:
+                self.cache.write(account_id, level, breakdown, closed, df)
+            if not df.empty and 'date_start' in df.columns:
+                # Open days are served fresh and never persisted
+                df = df[~df['date_start'].map(is_day_closed)]
+            if not df.empty:
+                fresh_parts.append(df)
+
+        self.fetch_plans[account_id] = {k: v for k, v in plan.items() if k != 'ranges'}
+        logger.info(
+            f"Insights plan for {account_id}: {plan['api_calls']} API call(s) for "
+            f"{plan['fetch_days']}/{plan['requested_days']} days, "
+            f"{plan['rows_avoided']} rows served from cache"
+        )
+
+        cached = self.cache.read(account_id, level, breakdown, start_date, end_date)
+        parts = [part for part in [cached] + fresh_parts if not part.empty]
+        if not parts:
+            return pd.DataFrame()
+        df = pd.concat(parts, ignore_index=True)
+        if 'date_start' in df.columns:
+            df = df.sort_values('date_start', kind='stable', ignore_index=True)
+        return df
 
-            if df.empty:
-                return df
+    def _call_insights_api(
+        self,
+        account_id: str,
+        start_date: str,
+        end_date: str,
+        level: str = 'ad',
+        breakdown: str = None,
+        time_increment: str = '1',
+    ) -> pd.DataFrame:
+        """Issue a single get_insights request (or generate mock data)."""
+        chunks = list(self.iter_insights(
+            account_id, start_date, end_date,
+            level=level, breakdown=breakdown, time_increment=time_increment,
+        ))
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
 
-            # Process actions and action_values
-            df = self._process_actions(df)
+    def iter_insights(
+        self,
+        account_id: str,
+        start_date: str,
+        end_date: str,
+        level: str = 'ad',
+        breakdown: str = None,
+        time_increment: str = '1',
+        chunk_size: int = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream insights as processed DataFrame chunks of at most chunk_size rows.
 
-            # Add account friendly name
-            df['account_friendly_name'] = self.get_account_name(account_id)
+        The SDK cursor loads the next page only when the current one is
+        consumed, so peak memory is about one page plus one chunk regardless
+        of how large the result is. Chunks bypass the insights cache and are
+        meant to be written out (e.g. to the database) as they arrive.
 
-            return df
+        Args:
+            account_id: Meta ad account ID
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            level: Aggregation level (account, campaign, adset, ad)
+            breakdown: Optional breakdown (age_gender, country, placement, device)
+            time_increment: Time increment (1 = daily, monthly, all_days)
+            chunk_size: Rows per yielded chunk (defaults to INSIGHTS_PAGE_SIZE)
 
-        except Exception as e:
-            logger.error(f"Error fetching insights for {account_id}: {e}")
-            return pd.DataFrame()
+        Yields:
+            DataFrame chunks with the same columns as fetch_insights
+        """
+        chunk_size = chunk_size or self.INSIGHTS_PAGE_SIZE
+
+        if not self.initialized:
+            df = self._mock_insights(account_id, start_date, end_date, level)
+            for offset in range(0, len(df), chunk_size):
+                yield df.iloc[offset:offset + chunk_size].reset_index(drop=True)
+            return
+
+        params = {
+            'time_range': {
+                'since': start_date,
+                'until': end_date,
+            },
+            'level': level,
+            'time_increment': time_increment,
+            'limit': min(chunk_size, self.INSIGHTS_PAGE_SIZE),
+        }
+
+        # Add breakdown if specified
+        if breakdown and breakdown in self.BREAKDOWN_FIELDS:
+            params['breakdowns'] = self.BREAKDOWN_FIELDS[breakdown]
+
+        insights = AdAccount(account_id).get_insights(
+            fields=self.INSIGHT_FIELDS,
+            params=params,
+        )
+
+        records = []
+        for insight in insights:
+            records.append(dict(insight))
+            if len(records) >= chunk_size:
+                yield self._insights_chunk(records, account_id)
+                records = []
+
+        if records:
+            yield self._insights_chunk(records, account_id)
+
+    def _insights_chunk(self, records: List[Dict[str, Any]], account_id: str) -> pd.DataFrame:
+        """Build one processed DataFrame from raw insight records."""
+        df = pd.DataFrame(records)
+
+        # Process actions and action_values
+        df = self._process_actions(df)
+
+        # Add account friendly name
+        df['account_friendly_name'] = self.get_account_name(account_id)
+
+        return df
 
     def fetch_all_accounts_insights(
         self,
@@ -221,6 +439,7 @@ class MetaAdsClient:
         end_date: str,
         level: str = 'ad',
         breakdown: str = None,
+        raise_errors: bool = False,
     ) -> pd.DataFrame:
         """
         Fetch insights from all configured accounts.
@@ -230,109 +449,194 @@ class MetaAdsClient:
             end_date: End date (YYYY-MM-DD)
             level: Data level
             breakdown: Optional breakdown
+            raise_errors: Re-raise the first account failure instead of
+                returning the other accounts' data (see _fetch_per_account)
 
         Returns:
-            Combined DataFrame from all accounts
+            Combined DataFrame from all accounts, in account_ids order.
+            Per-account failures are logged and recorded in last_fetch_report.
         """
-        all_data = []
-
-        for account_id in self.account_ids:
-            logger.info(f"Fetching data for account: {account_id}")
-            df = self.fetch_insights(
+        self.fetch_plans = {}
+        df = self._fetch_per_account(
+            lambda account_id: self._request_insights(
                 account_id=account_id,
                 start_date=start_date,
                 end_date=end_date,
                 level=level,
                 breakdown=breakdown,
+            ),
+            label='insights',
+            raise_errors=raise_errors,
+        )
+
+        if self.fetch_plans:
+            totals = {}
+            for plan in self.fetch_plans.values():
+                for key, value in plan.items():
+                    totals[key] = totals.get(key, 0) + value
+            self.last_fetch_report['plan'] = totals
+            logger.info(
+                f"Insights cache avoided {totals['api_calls_avoided']} API call(s) "
+                f"and {totals['rows_avoided']} rows across {len(self.fetch_plans)} accounts"
             )
-            if not df.empty:
-                all_data.append(df)
-
-        if not all_data:
-            return pd.DataFrame()
 
-        return pd.concat(all_data, ignore_index=True)
+        return df
 
     def fetch_campaigns(self, account_id: str) -> pd.DataFrame:
         """Fetch all campaigns for an account."""
-        if not self.initialized:
-            return self._mock_campaigns(account_id)
-
         try:
-            account = AdAccount(account_id)
-            # NOTE: Cost/spend/budget metrics excluded (daily_budget, lifetime_budget, budget_remaining)
-            campaigns = account.get_campaigns(
-                fields=[
-                    'id',
-                    'name',
-                    'status',
-                    'effective_status',
-                    'objective',
-                    'created_time',
-                    'start_time',
-                    'stop_time',
-                ],
-                params={'limit': 500}
-            )
-
-            data = [dict(campaign) for campaign in campaigns]
-            df = pd.DataFrame(data)
-            df['account_id'] = account_id
-            df['account_friendly_name'] = self.get_account_name(account_id)
-
-            return df
-
+            return self._request_campaigns(account_id)
         except Exception as e:
             logger.error(f"Error fetching campaigns for {account_id}: {e}")
             return pd.DataFrame()
 
+    def _request_campaigns(self, account_id: str) -> pd.DataFrame:
+        """Fetch campaigns for one account, letting API errors propagate."""
+        if not self.initialized:
+            return self._mock_campaigns(account_id)
+
+        account = AdAccount(account_id)
+        # NOTE: Cost/spend/budget metrics excluded (daily_budget, lifetime_budget, budget_remaining)
+        campaigns = account.get_campaigns(
+            fields=[
+                'id',
+                'name',
+                'status',
+                'effective_status',
+                'objective',
+                'created_time',
+                'start_time',
+                'stop_time',
+            ],
+            params={'limit': 500}
+        )
+
+        data = [dict(campaign) for campaign in campaigns]
+        df = pd.DataFrame(data)
+        df['account_id'] = account_id
+        df['account_friendly_name'] = self.get_account_name(account_id)
+
+        return df
+
     def fetch_all_campaigns(self) -> pd.DataFrame:
         """Fetch campaigns from all accounts."""
-        all_campaigns = []
+        return self._fetch_per_account(self._request_campaigns, label='campaigns')
 
-        for account_id in self.account_ids:
-            df = self.fetch_campaigns(account_id)
-            if not df.empty:
-                all_campaigns.append(df)
+    def _fetch_per_account(
+        self,
+        fetch_fn: Callable[[str], pd.DataFrame],
+        label: str = 'data',
+        raise_errors: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Run fetch_fn for every configured account on a bounded thread pool.
 
-        if not all_campaigns:
+        Each account gets at most self.account_timeout seconds once it starts
+        running; accounts that raise or time out are skipped and reported in
+        self.last_fetch_report instead of failing the whole fetch. Callers
+        that must not store a partial result (e.g. a backfill checkpoint)
+        pass raise_errors to get the first failing account's exception
+        (TimeoutError for a timeout) once every account has finished.
+
+        Args:
+            fetch_fn: Callable taking an account ID and returning a DataFrame
+            label: Name used in log messages
+            raise_errors: Raise instead of skipping failed accounts
+
+        Returns:
+            Combined DataFrame, concatenated in self.account_ids order
+        """
+        started_at = time.monotonic()
+        results: Dict[str, pd.DataFrame] = {}
+        failed: Dict[str, str] = {}
+        errors: Dict[str, Exception] = {}
+        timed_out: List[str] = []
+        run_started: Dict[str, float] = {}
+
+        def run(account_id: str) -> pd.DataFrame:
+            run_started[account_id] = time.monotonic()
+            logger.info(f"Fetching {label} for account: {account_id}")
+            return fetch_fn(account_id)
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, max(1, len(self.account_ids))),
+            thread_name_prefix='meta-fetch',
+        )
+        try:
+            pending = {executor.submit(run, acc): acc for acc in self.account_ids}
+            while pending:
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    account_id = pending.pop(future)
+                    try:
+                        results[account_id] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error fetching {label} for {account_id}: {e}")
+                        failed[account_id] = str(e)
+                        errors[account_id] = e
+
+                # Abandon accounts that have been running longer than the timeout
+                now = time.monotonic()
+                for future, account_id in list(pending.items()):
+                    begun = run_started.get(account_id)
+                    if begun is not None and now - begun > self.account_timeout:
+                        logger.error(
+                            f"Timed out fetching {label} for {account_id} "
+                            f"after {self.account_timeout:g}s"
+                        )
+                        future.cancel()
+                        timed_out.append(account_id)
+                        failed[account_id] = f"timeout after {self.account_timeout:g}s"
+                        errors[account_id] = TimeoutError(
+                            f"Fetching {label} for {account_id} timed out after {self.account_timeout:g}s"
+                        )
+                        del pending[future]
+        finally:
+            # Don't block on hung requests; their results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.last_fetch_report = {
+            'label': label,
+            'succeeded': [acc for acc in self.account_ids if acc in results],
+            'failed': failed,
+            'timed_out': timed_out,
+            'elapsed_seconds': round(time.monotonic() - started_at, 3),
+        }
+        if failed:
+            logger.warning(
+                f"Fetched {label} for {len(results)}/{len(self.account_ids)} accounts; "
+                f"failed: {', '.join(failed)}"
+            )
+            if raise_errors:
+                raise next(errors[acc] for acc in self.account_ids if acc in errors)
+
+        all_data = [
+            results[acc] for acc in self.account_ids
+            if acc in results and not results[acc].empty
+        ]
+        if not all_data:
             return pd.DataFrame()
 
-        return pd.concat(all_campaigns, ignore_index=True)
+        return pd.concat(all_data, ignore_index=True)
 
     def _process_actions(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Process the actions column to extract specific action types."""
+        """
+        Extract configured action types from the nested actions/action_values
+        columns into numeric action_<type> and <type>_value columns.
+        """
         if 'actions' not in df.columns:
             return df
 
-        # Extract common action types
-        action_types = ['purchase', 'add_to_cart', 'lead', 'complete_registration', 'link_click']
-
-        for action_type in action_types:
-            df[f'action_{action_type}'] = df['actions'].apply(
-                lambda x: self._get_action_value(x, action_type) if pd.notna(x) else 0
-            )
+        actions = extract_action_columns(df['actions'], self.action_types)
+        df[[f'action_{t}' for t in self.action_types]] = actions.to_numpy()
 
         # Process action values (revenue)
-        if 'action_values' in df.columns:
-            df['purchase_value'] = df['action_values'].apply(
-                lambda x: self._get_action_value(x, 'purchase') if pd.notna(x) else 0
-            )
+        if 'action_values' in df.columns and self.action_value_types:
+            values = extract_action_columns(df['action_values'], self.action_value_types)
+            df[[f'{t}_value' for t in self.action_value_types]] = values.to_numpy()
 
         return df
 
-    @staticmethod
-    def _get_action_value(actions: list, action_type: str) -> float:
-        """Extract value for a specific action type."""
-        if not actions:
-            return 0
-
-        for action in actions:
-            if action.get('action_type') == action_type:
-                return float(action.get('value', 0))
-
-        return 0
-
     # =========================================================================
     # MOCK DATA METHODS (used when API is not available)
     # =========================================================================
@@ -431,7 +735,8 @@ def get_meta_client() -> MetaAdsClient:
     return MetaAdsClient()
 
 
-def fetch_meta_live_data(start_date: str, end_date: str, account_id: str = None) -> pd.DataFrame:
+def fetch_meta_live_data(start_date: str, end_date: str, account_id: str = None,
+                         raise_errors: bool = False) -> pd.DataFrame:
     """
     Fetch Meta data for specified date range.
 
@@ -439,6 +744,7 @@ def fetch_meta_live_data(start_date: str, end_date: str, account_id: str = None)
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
         account_id: Specific account ID (optional, fetches all if not provided)
+        raise_errors: Propagate API errors instead of returning partial/empty data
 
     Returns:
         DataFrame with insights data
@@ -446,9 +752,11 @@ def fetch_meta_live_data(start_date: str, end_date: str, account_id: str = None)
     client = get_meta_client()
 
     if account_id:
+        if raise_errors:
+            return client._request_insights(account_id, start_date, end_date)
         return client.fetch_insights(account_id, start_date, end_date)
     else:
-        return client.fetch_all_accounts_insights(start_date, end_date)
+        return client.fetch_all_accounts_insights(start_date, end_date, raise_errors=raise_errors)
 
 
 def fetch_meta_campaigns(account_id: str = None) -> pd.DataFrame:
@@ -0,0 +1,93 @@
+# schema.py
+# Load-time dtype schema for campaign frames: repeated labels (platform,
+# region, campaign...) become pandas categoricals and counters int32 when
+# they fit, so cached frames take a fraction of the memory
+# and group on integer codes instead of strings.
+
+import logging
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.analysis_modules.metrics import RATIO_METRICS
+
+logger = logging.getLogger(__name__)
+
+DIMENSION_COLUMNS = ('campaign_name', 'platform', 'region', 'account_name', 'format', 'segment')
+COUNTER_COLUMNS = ('impressions', 'clicks', 'conversions')
+# Derived ratios are display values recomputed from summed counters, so
+# float32 is enough; spend and revenue stay float64 to keep totals exact
+RATIO_COLUMNS = tuple(RATIO_METRICS)
+
+# A label column is only made categorical when its distinct values are at
+# most this share of the rows; near-unique labels would cost more as codes
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _narrow_int(values: pd.Series) -> pd.Series:
+    """int32 when every value fits, else int64; floats only if all whole and non-missing."""
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return values
+    # Never below int32: int8/int16 counters wrap silently in elementwise
+    # arithmetic (numpy 2 keeps the narrow dtype), e.g. clicks * 100
+    narrowed = pd.to_numeric(values, downcast='integer')
+    if not pd.api.types.is_integer_dtype(narrowed):
+        return narrowed
+    if narrowed.dtype.itemsize < np.dtype(np.int32).itemsize:
+        return narrowed.astype(np.int32)
+    return narrowed
+
+
+def apply_schema(
+    df: pd.DataFrame,
+    dimensions: Sequence[str] = DIMENSION_COLUMNS,
+    counters: Sequence[str] = COUNTER_COLUMNS,
+    ratios: Sequence[str] = RATIO_COLUMNS,
+) -> pd.DataFrame:
+    """
+    Cast a loaded frame to the compact schema, in place.
+
+    Columns that are absent are skipped, so every loader's frame can go
+    through the same call. int32 counters are safe to aggregate: pandas
+    and numpy sums accumulate them in int64.
+
+    Args:
+        df: Frame straight from a loader
+        dimensions: Label columns to make categorical
+        counters: Count columns to downcast to int32
+        ratios: Float columns to store as float32
+
+    Returns:
+        The same DataFrame
+    """
+    rows = len(df)
+    for column in dimensions:
+        if column not in df.columns or isinstance(df[column].dtype, pd.CategoricalDtype):
+            continue
+        values = df[column].astype('category')
+        if len(values.cat.categories) <= max(1, rows * MAX_CATEGORY_RATIO):
+            df[column] = values
+    for column in counters:
+        if column in df.columns:
+            df[column] = _narrow_int(df[column])
+    for column in ratios:
+        if column in df.columns and pd.api.types.is_float_dtype(df[column]):
+            df[column] = df[column].astype(np.float32)
+    return df
+
+
+def memory_report(df: pd.DataFrame) -> Dict:
+    """
+    Memory held by a frame, per column.
+
+    Returns:
+        Dictionary with rows, total_bytes and columns ({column: {'dtype', 'bytes'}}),
+        counting string payloads (deep=True)
+    """
+    usage = df.memory_usage(deep=True, index=True)
+    return {
+        'rows': len(df),
+        'total_bytes': int(usage.sum()),
+        'columns': {column: {'dtype': str(df[column].dtype), 'bytes': int(usage[column])} for column in df.columns},
+    }
@@ -5,8 +5,11 @@ Startup helper: ensure DB schema exists and run idempotency migration.
 This module is safe to call on every app start (idempotent). It:
 - Creates the database schema if furniture.db is missing (uses database.db_setup.create_database)
 - Ensures the ingestion_runs audit table exists
+- Adds the sales.source column that scopes feed re-runs to the feed's own rows
 - Creates a UNIQUE index idx_daily_perf_unique on (report_date, platform, ad_id, campaign_id)
   only if the required columns exist.
+- Creates the daily/monthly rollup tables and backfills them once.
+- Creates covering indexes for the hot analytical queries and checks their query plans.
 - Does NOT populate sample data automatically.
 """
 import os
@@ -15,6 +18,7 @@ import logging
 from typing import List
 
 import config
+from database.connection import get_connection
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +29,54 @@ def _table_has_columns(conn: sqlite3.Connection, table: str, cols: List[str]) ->
     return all(c in existing for c in cols)
 
 
+def ensure_ingestion_runs_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the ingestion_runs audit table and add columns introduced later.
+    Commits only when it had to change the schema, so it is safe to call
+    inside an open transaction once the table is current.
+    """
+    if _table_has_columns(conn, 'ingestion_runs', ['id', 'stage_timings']):
+        return
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ingestion_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            platform TEXT,
+            start_date TEXT,
+            end_date TEXT,
+            user TEXT,
+            rows_deleted INTEGER,
+            rows_inserted INTEGER,
+            status TEXT,
+            created_at TEXT,
+            stage_timings TEXT
+        )
+    """)
+    # Per-stage timings (JSON) were added after the table first shipped
+    if not _table_has_columns(conn, 'ingestion_runs', ['stage_timings']):
+        conn.execute("ALTER TABLE ingestion_runs ADD COLUMN stage_timings TEXT")
+    conn.commit()
+
+
+def ensure_sales_source_column(conn: sqlite3.Connection) -> None:
+    """
+    Add sales.source (which ingestion owns a sale) to databases created before it existed.
+    Commits only when it had to change the schema.
+    """
+    if _table_has_columns(conn, 'sales', ['source']):
+        return
+    conn.execute("ALTER TABLE sales ADD COLUMN source TEXT")
+    conn.commit()
+
+
+def ensure_hot_indexes(conn: sqlite3.Connection) -> None:
+    """Create the hot-path covering indexes and warn if a hot query still full-scans."""
+    from database.indexes import ensure_indexes, verify_query_plans
+    ensure_indexes(conn)
+    for name, scans in verify_query_plans(conn).items():
+        if scans:
+            logger.warning(f"Hot query {name} falls back to a full scan: {'; '.join(scans)}")
+
+
 def ensure_db_initialized():
     """
     Ensure the SQLite DB (config.DB_PATH) has the schema and required index.
@@ -45,23 +97,11 @@ def ensure_db_initialized():
                 return
 
         # Connect to DB and ensure ingestion_runs table exists and create index
-        conn = sqlite3.connect(db_path)
+        conn = get_connection(db_path)
         try:
             # Ensure ingestion_runs exists
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS ingestion_runs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    platform TEXT,
-                    start_date TEXT,
-                    end_date TEXT,
-                    user TEXT,
-                    rows_deleted INTEGER,
-                    rows_inserted INTEGER,
-                    status TEXT,
-                    created_at TEXT
-                )
-            """)
-            conn.commit()
+            ensure_ingestion_runs_table(conn)
+            ensure_sales_source_column(conn)
 
             # Create UNIQUE index for idempotency if the required columns exist
             required_cols = ['report_date', 'platform', 'ad_id', 'campaign_id']
@@ -74,6 +114,13 @@ def ensure_db_initialized():
                 logger.info("Ensured unique index idx_daily_perf_unique exists.")
             else:
                 logger.info("daily_performance table missing required columns for unique index. Skipping index creation.")
+
+            # Pre-aggregated rollups (backfilled once from existing rows)
+            from database.rollups import ensure_rollup_tables
+            ensure_rollup_tables(conn)
+
+            # Covering indexes for the hot analytical queries
+            ensure_hot_indexes(conn)
         finally:
             conn.close()
     except Exception:
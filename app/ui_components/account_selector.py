@@ -15,6 +15,7 @@ from app.data_integration.meta_api import (
     fetch_meta_campaigns,
     get_config_values,
 )
+from app.analysis_modules.metrics import add_ratio_metrics
 
 
 def render_account_selector(
@@ -147,10 +148,9 @@ def render_account_performance_comparison(
     }).reset_index()
 
     # Calculate derived metrics
-    account_metrics['CTR'] = (account_metrics['clicks'] / account_metrics['impressions'] * 100).round(2)
-    account_metrics['CPC'] = (account_metrics['spend'] / account_metrics['clicks']).round(2)
-    account_metrics['ROAS'] = (account_metrics['revenue'] / account_metrics['spend']).round(2)
-    account_metrics['Conv. Rate'] = (account_metrics['conversions'] / account_metrics['clicks'] * 100).round(2)
+    ratio_names = {'ctr': 'CTR', 'cpc': 'CPC', 'roas': 'ROAS', 'cvr': 'Conv. Rate'}
+    add_ratio_metrics(account_metrics, ratio_names, names=ratio_names)
+    account_metrics = account_metrics.round({name: 2 for name in ratio_names.values()})
 
     # Display metrics table
     st.dataframe(
@@ -0,0 +1,114 @@
+# chart_data.py
+# Shrinks frames to what a chart can actually show before they reach Plotly.
+# Every point handed to a figure is serialized to JSON and sent to the
+# browser, so traces are capped at CHART_MAX_POINTS.
+
+import logging
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from config import CHART_MAX_POINTS
+
+logger = logging.getLogger(__name__)
+
+
+def _as_float(values) -> np.ndarray:
+    """Numeric view of an x/y column; datetimes become int64 nanoseconds."""
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').view(np.int64).astype(np.float64)
+    return np.nan_to_num(values.to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of n_out points that keep the visual shape of y(x).
+
+    The first and last points are always kept. Each of the n_out - 2 buckets
+    in between contributes the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket, so peaks and dips
+    survive where plain striding would drop them.
+
+    Args:
+        x: Sorted x values (numeric or datetime)
+        y: y values
+        n_out: Number of points to keep
+
+    Returns:
+        Sorted integer positions into x/y
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i < n_out - 3 else (n - 1, n)
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def downsample_series(
+    df: pd.DataFrame,
+    x: str,
+    y: Union[str, Sequence[str]],
+    max_points: Optional[int] = None,
+    by: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Cap a line chart's frame at max_points per trace with LTTB.
+
+    Args:
+        df: Frame already aggregated to one row per x (per group)
+        x: x column; rows are sorted by it
+        y: y column(s) drawn against the same x. The kept rows are the union
+           of each column's LTTB points, each column getting an equal share
+        max_points: Points per trace (defaults to CHART_MAX_POINTS)
+        by: Column that splits the frame into traces (e.g. 'variant')
+
+    Returns:
+        The frame itself if already small enough, else the kept rows sorted by x
+    """
+    max_points = max_points or CHART_MAX_POINTS
+    y_cols = [y] if isinstance(y, str) else list(y)
+
+    if by is not None:
+        if df.groupby(by, observed=True).size().max() <= max_points:
+            return df
+        parts = [downsample_series(part, x, y_cols, max_points) for _, part in df.groupby(by, observed=True, sort=False)]
+        return pd.concat(parts, ignore_index=True)
+
+    if len(df) <= max_points:
+        return df
+    df = df.sort_values(x)
+    share = max(3, max_points // len(y_cols))
+    keep = np.unique(np.concatenate([lttb_indices(df[x], df[col], share) for col in y_cols]))
+    logger.debug(f"Downsampled {len(df):,} -> {len(keep):,} points ({', '.join(y_cols)} by {x})")
+    return df.iloc[keep]
+
+
+def sample_points(df: pd.DataFrame, max_points: Optional[int] = None, seed: int = 42) -> pd.DataFrame:
+    """Seeded uniform sample for scatter clouds, where every point is drawn as a marker."""
+    max_points = max_points or CHART_MAX_POINTS
+    if len(df) <= max_points:
+        return df
+    return df.sample(n=max_points, random_state=seed)
+
+
+def top_n(df: pd.DataFrame, column: str, max_points: Optional[int] = None) -> pd.DataFrame:
+    """Keep the max_points largest rows by column (e.g. biggest campaigns in a bubble chart)."""
+    max_points = max_points or CHART_MAX_POINTS
+    if len(df) <= max_points:
+        return df
+    return df.nlargest(max_points, column)
+
@@ -1,435 +1,39 @@
+import hashlib
+import os
+import re
 import streamlit as st
 import datetime
+from typing import Tuple
+
+# Theme stylesheet, served from /app/static when server.enableStaticServing is on
+THEME_CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "theme.css")
+THEME_CSS_URL = "app/static/theme.css"
+
+@st.cache_resource
+def _load_theme_css() -> Tuple[str, str]:
+    """Minified stylesheet and a content hash (cache-busting query string for the static URL)."""
+    with open(THEME_CSS_PATH, encoding="utf-8") as f:
+        css = f.read()
+    version = hashlib.md5(css.encode("utf-8")).hexdigest()[:10]
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", re.sub(r"\s+", " ", css))
+    css = re.sub(r":\s+", ":", css).strip()
+    return css, version
 
 def apply_custom_css():
-    st.markdown(
-        """
-        <style>
-        /* ============================================
-           AL-AI.AI DASHBOARD THEME
-           Dark theme with blue/green gradient accents
-           ============================================ */
-
-        /* Main Background */
-        .stApp {
-            background: #0e1117;
-        }
-
-        /* Global Text Color - Make ALL text white */
-        .stApp, .stApp * {
-            color: #fafafa;
-        }
-
-        /* Main content area text */
-        .main .block-container {
-            color: #fafafa !important;
-        }
-
-        .main h1, .main h2, .main h3, .main h4, .main h5, .main h6,
-        .main p, .main span, .main label, .main div {
-            color: #fafafa !important;
-        }
-
-        /* Streamlit text elements */
-        .stMarkdown, .stMarkdown p, .stMarkdown span,
-        .stText, .stCaption, .stTitle, .stHeader, .stSubheader {
-            color: #fafafa !important;
-        }
-
-        /* Sidebar Styling */
-        [data-testid="stSidebar"] {
-            background: #262730;
-            border-right: 1px solid #333;
-        }
-
-        [data-testid="stSidebar"] h1,
-        [data-testid="stSidebar"] h2,
-        [data-testid="stSidebar"] h3,
-        [data-testid="stSidebar"] p,
-        [data-testid="stSidebar"] span,
-        [data-testid="stSidebar"] label,
-        [data-testid="stSidebar"] div {
-            color: #fafafa !important;
-        }
-
-        /* Sidebar Logo Box */
-        .sidebar-logo {
-            background: #1f77b4;
-            color: white;
-            padding: 15px;
-            text-align: center;
-            border-radius: 8px;
-            margin-bottom: 20px;
-            font-size: 1.2rem;
-            font-weight: bold;
-        }
-
-        /* Sidebar Section Headers */
-        .sidebar-header {
-            color: #fafafa;
-            font-size: 1.1rem;
-            margin: 20px 0 10px 0;
-            border-bottom: 2px solid #1f77b4;
-            padding-bottom: 5px;
-        }
-
-        /* Header Banner */
-        .header-banner {
-            text-align: center;
-            margin-bottom: 30px;
-            padding: 20px;
-            background: linear-gradient(135deg, #1f77b4 0%, #2ca02c 100%);
-            border-radius: 10px;
-        }
-
-        .header-banner h1 {
-            font-size: 2rem;
-            margin-bottom: 10px;
-            color: white;
-        }
-
-        .header-banner p {
-            font-size: 1rem;
-            color: rgba(255,255,255,0.9);
-        }
-
-        /* KPI Cards */
-        .kpi-card {
-            background: linear-gradient(135deg, #262730 0%, #1e1e1e 100%);
-            padding: 25px;
-            border-radius: 10px;
-            border-left: 5px solid #1f77b4;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.3);
-            margin-bottom: 15px;
-        }
-
-        .kpi-card .label {
-            font-size: 0.9rem;
-            color: #999;
-            margin-bottom: 10px;
-        }
-
-        .kpi-card .value {
-            font-size: 2rem;
-            font-weight: bold;
-            color: #1f77b4;
-            margin-bottom: 5px;
-        }
-
-        .kpi-card .delta {
-            font-size: 0.85rem;
-            color: #2ca02c;
-        }
-
-        .kpi-card .delta.negative {
-            color: #d62728;
-        }
-
-        /* Metric Values Override */
-        [data-testid="stMetricValue"] {
-            color: #1f77b4 !important;
-            font-weight: 700;
-            font-size: 1.8rem !important;
-        }
-
-        [data-testid="stMetricDelta"] svg {
-            display: none;
-        }
-
-        /* Tab Styling */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 8px;
-            border-bottom: 2px solid #333;
-            background: transparent;
-        }
-
-        .stTabs [data-baseweb="tab"] {
-            padding: 12px 24px;
-            background: #262730 !important;
-            border-radius: 8px 8px 0 0;
-            color: #fafafa !important;
-            font-weight: 500;
-            border: 1px solid #333;
-            border-bottom: none;
-        }
-
-        .stTabs [data-baseweb="tab"]:hover {
-            background: #333 !important;
-            color: #fff !important;
-        }
-
-        .stTabs [aria-selected="true"] {
-            background: #1f77b4 !important;
-            color: white !important;
-            border-color: #1f77b4 !important;
-        }
-
-        .stTabs [data-baseweb="tab-panel"] {
-            background: transparent;
-            padding-top: 20px;
-        }
-
-        /* Tab content text */
-        .stTabs [data-baseweb="tab-panel"] p,
-        .stTabs [data-baseweb="tab-panel"] span,
-        .stTabs [data-baseweb="tab-panel"] div,
-        .stTabs [data-baseweb="tab-panel"] label,
-        .stTabs [data-baseweb="tab-panel"] h1,
-        .stTabs [data-baseweb="tab-panel"] h2,
-        .stTabs [data-baseweb="tab-panel"] h3,
-        .stTabs [data-baseweb="tab-panel"] h4 {
-            color: #fafafa !important;
-        }
-
-        /* Chart Container */
-        .chart-container {
-            background: #262730;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.3);
-            margin-bottom: 20px;
-        }
-
-        .chart-container h3 {
-            margin-bottom: 15px;
-            color: #fafafa;
-            border-bottom: 2px solid #1f77b4;
-            padding-bottom: 10px;
-        }
-
-        /* Table Styling */
-        .stDataFrame {
-            background: #262730;
-            border-radius: 10px;
-        }
-
-        .stDataFrame thead tr th {
-            background: #1f77b4 !important;
-            color: white !important;
-            padding: 12px !important;
-        }
-
-        .stDataFrame tbody tr td {
-            padding: 12px !important;
-            border-bottom: 1px solid #333 !important;
-        }
-
-        .stDataFrame tbody tr:hover {
-            background: #1e1e1e !important;
-        }
-
-        /* Alert Cards */
-        .alert {
-            padding: 15px;
-            border-radius: 8px;
-            margin-bottom: 10px;
-            border-left: 5px solid;
-        }
-
-        .alert.critical {
-            background: rgba(214, 39, 40, 0.1);
-            border-color: #d62728;
-        }
-
-        .alert.warning {
-            background: rgba(255, 193, 7, 0.1);
-            border-color: #ffc107;
-        }
-
-        .alert.good {
-            background: rgba(44, 160, 44, 0.1);
-            border-color: #2ca02c;
-        }
-
-        .alert-title {
-            font-weight: bold;
-            margin-bottom: 5px;
-            color: #fafafa;
-        }
-
-        .alert-body {
-            color: #ccc;
-        }
-
-        .alert-recommendation {
-            margin-top: 5px;
-            font-size: 0.9rem;
-            color: #999;
-        }
-
-        /* Buttons */
-        .stButton > button {
-            width: 100%;
-            padding: 12px;
-            background: #1f77b4;
-            color: white;
-            border: none;
-            border-radius: 5px;
-            font-size: 1rem;
-            transition: background 0.3s;
-        }
-
-        .stButton > button:hover {
-            background: #1557a0;
-            color: white;
-        }
-
-        /* Select boxes */
-        .stSelectbox > div > div {
-            background: #1e1e1e !important;
-            border: 1px solid #444 !important;
-            color: #fafafa !important;
-        }
-
-        .stSelectbox label {
-            color: #fafafa !important;
-        }
-
-        /* Date inputs */
-        .stDateInput > div > div > input {
-            background: #1e1e1e !important;
-            border: 1px solid #444 !important;
-            color: #fafafa !important;
-        }
-
-        .stDateInput label {
-            color: #fafafa !important;
-        }
-
-        /* Multiselect */
-        .stMultiSelect > div > div {
-            background: #1e1e1e !important;
-            border: 1px solid #444 !important;
-        }
-
-        .stMultiSelect label,
-        .stMultiSelect span {
-            color: #fafafa !important;
-        }
-
-        /* Text inputs */
-        .stTextInput > div > div > input {
-            background: #1e1e1e !important;
-            border: 1px solid #444 !important;
-            color: #fafafa !important;
-        }
-
-        .stTextInput label {
-            color: #fafafa !important;
-        }
-
-        /* Number inputs */
-        .stNumberInput > div > div > input {
-            background: #1e1e1e !important;
-            border: 1px solid #444 !important;
-            color: #fafafa !important;
-        }
-
-        /* DataFrame / Table styling */
-        .stDataFrame {
-            background: #262730 !important;
-            border-radius: 10px;
-        }
-
-        .stDataFrame th {
-            background: #1f77b4 !important;
-            color: white !important;
-            padding: 12px !important;
-            font-weight: 600 !important;
-        }
-
-        .stDataFrame td {
-            background: #262730 !important;
-            color: #fafafa !important;
-            padding: 10px !important;
-            border-bottom: 1px solid #333 !important;
-        }
-
-        .stDataFrame tr:hover td {
-            background: #333 !important;
-        }
-
-        /* Subheader styling */
-        .stSubheader, h2, h3 {
-            color: #fafafa !important;
-        }
-
-        /* Info/Warning/Error boxes */
-        .stAlert {
-            background: #262730 !important;
-            border-radius: 8px;
-        }
-
-        .stAlert p, .stAlert span {
-            color: #fafafa !important;
-        }
-
-        /* Login Container */
-        .login-container {
-            max-width: 400px;
-            margin: auto;
-            padding: 2rem;
-            background: rgba(38, 39, 48, 0.95);
-            border-radius: 10px;
-            border: 1px solid #333;
-        }
-
-        .login-container h1,
-        .login-container h2,
-        .login-container h3,
-        .login-container p,
-        .login-container span,
-        .login-container label,
-        .login-container div {
-            color: #fafafa !important;
-        }
-
-        /* Divider */
-        hr {
-            border: 1px solid #333;
-            margin: 30px 0;
-        }
-
-        /* Footer */
-        .footer {
-            margin-top: 50px;
-            padding: 20px;
-            text-align: center;
-            border-top: 2px solid #333;
-            color: #999;
-        }
-
-        .footer strong {
-            color: #1f77b4;
-        }
-
-        /* Grafana Panel (legacy support) */
-        .grafana-panel {
-            background-color: #262730;
-            border: 1px solid #333;
-            border-radius: 10px;
-            padding: 20px;
-            margin-bottom: 15px;
-        }
-
-        .panel-header {
-            color: #fafafa;
-            font-weight: 500;
-            font-size: 16px;
-            margin-bottom: 10px;
-            border-bottom: 2px solid #1f77b4;
-            padding-bottom: 10px;
-        }
-
-        /* Hide Streamlit branding */
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        header {visibility: hidden;}
+    """
+    Apply the dashboard theme.
 
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    Streamlit re-sends every element on each rerun, so with static serving
+    enabled only a <link> tag goes over the websocket and the browser loads
+    theme.css once (revalidated by ETag, new URL when the file changes).
+    Without it the minified stylesheet is inlined.
+    """
+    css, version = _load_theme_css()
+    if st.get_option("server.enableStaticServing"):
+        st.markdown(f'<link rel="stylesheet" href="{THEME_CSS_URL}?v={version}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
 def render_header_banner(title: str, subtitle: str = None):
     """Render the header banner with gradient background."""
@@ -0,0 +1,149 @@
+"""
+Benchmark: row-by-row upload inserts vs the bulk upsert engine.
+
+Loads N daily_performance rows into an empty table, then re-uploads the same
+file with 10% of rows changed, for the legacy iterrows/execute loop and for
+bulk_upsert (direct executemany and via a staging table). Prints rows/second
+and the inserted/updated/skipped counts reported by each pass.
+
+First checks that the validators reject uploads with a null or blank
+ad_id/campaign_id (which would otherwise abort bulk_upsert on NOT NULL)
+or with IDs that are not in the catalog, and accept a clean upload.
+
+USAGE:
+    python benchmarks/bench_bulk_upsert.py --rows 200000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.data_integration import file_uploader
+from app.data_integration.file_uploader import bulk_upsert, validate_daily_performance_data, validate_segmented_data
+
+
+def make_upload(rows: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ads = max(rows // 365, 1)
+    days = pd.date_range('2024-01-01', periods=-(-rows // ads)).strftime('%Y-%m-%d')
+    df = pd.DataFrame({
+        'report_date': np.repeat(days, ads)[:rows],
+        'ad_id': np.tile([f'AD{i:05d}' for i in range(ads)], len(days))[:rows],
+        'campaign_id': 'C0001',
+        'impressions': rng.integers(100, 20000, rows),
+        'clicks': rng.integers(1, 400, rows),
+        'spend': rng.uniform(5, 300, rows).round(2),
+        'conversions': rng.integers(0, 20, rows),
+        'revenue': rng.uniform(0, 2000, rows).round(2),
+    })
+    return df
+
+
+def legacy_insert(df: pd.DataFrame, conn: sqlite3.Connection) -> dict:
+    """The pre-bulk implementation: one execute per row, IntegrityError = duplicate."""
+    cursor = conn.cursor()
+    inserted = skipped = 0
+    for _, row in df.iterrows():
+        try:
+            cursor.execute("""
+                INSERT INTO daily_performance
+                (report_date, ad_id, campaign_id, impressions, reach, frequency,
+                 clicks, spend, video_views, add_to_carts, conversions, revenue)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                row['report_date'], row['ad_id'], row['campaign_id'],
+                int(row['impressions']), int(row.get('reach', 0)), float(row.get('frequency', 1.0)),
+                int(row['clicks']), float(row['spend']),
+                int(row.get('video_views', 0)), int(row.get('add_to_carts', 0)),
+                int(row['conversions']), float(row['revenue'])
+            ))
+            inserted += 1
+        except sqlite3.IntegrityError:
+            skipped += 1
+    conn.commit()
+    return {'inserted': inserted, 'updated': 0, 'skipped': skipped}
+
+
+def fresh_db(path: str) -> sqlite3.Connection:
+    schema = open(os.path.join(os.path.dirname(__file__), '..', 'database', 'schema.sql')).read()
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.executescript(schema)
+    return conn
+
+
+def check_validation(tmp: str) -> None:
+    """Validators must reject null, blank and unknown keys before anything is written."""
+    path = os.path.join(tmp, 'validate.db')
+    conn = fresh_db(path)
+    upload = make_upload(20)
+    conn.execute("INSERT INTO campaigns (campaign_id, campaign_name, platform) VALUES ('C0001', 'Bench', 'Meta')")
+    conn.executemany("INSERT INTO ads (ad_id, ad_name) VALUES (?, ?)", [(a, a) for a in upload['ad_id'].unique()])
+    conn.commit()
+    conn.close()
+
+    cases = {
+        'clean': (upload, True),
+        'null ad_id': (upload.assign(ad_id=upload['ad_id'].mask(upload.index == 3)), False),
+        'blank campaign_id': (upload.assign(campaign_id=upload['campaign_id'].mask(upload.index == 5, ' ')), False),
+        'unknown ad_id': (upload.assign(ad_id=upload['ad_id'].mask(upload.index == 7, 'AD99999')), False),
+    }
+    db_path = file_uploader.DB_PATH
+    file_uploader.DB_PATH = path
+    try:
+        for name, (data, expected) in cases.items():
+            for validate, frame in ((validate_daily_performance_data, data),
+                                    (validate_segmented_data, data.assign(segment_type='age', segment_value='25-34'))):
+                is_valid, message, _ = validate(frame)
+                assert is_valid == expected, f"{validate.__name__} {name}: {message}"
+    finally:
+        file_uploader.DB_PATH = db_path
+    print(f"validation: {len(cases)} cases ok (null, blank and unknown keys rejected)")
+
+
+def run(rows: int, legacy_rows: int) -> None:
+    df = make_upload(rows)
+    changed = df.copy()
+    touched = changed.sample(frac=0.1, random_state=1).index
+    changed.loc[touched, 'clicks'] += 1
+
+    variants = {
+        'legacy iterrows': lambda d, c, mode: legacy_insert(d.head(legacy_rows), c),
+        'bulk executemany': lambda d, c, mode: bulk_upsert(d, 'daily_performance', mode, conn=c),
+        'bulk via staging': lambda d, c, mode: bulk_upsert(d, 'daily_performance', mode, use_staging=True, conn=c),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_validation(tmp)
+        print(f"{'variant':<18} {'pass':<16} {'rows':>8} {'seconds':>8} {'rows/s':>10}  inserted/updated/skipped")
+        for label, fn in variants.items():
+            conn = fresh_db(os.path.join(tmp, 'bench.db'))
+            n = legacy_rows if label.startswith('legacy') else rows
+            passes = [('initial load', df, 'nothing'), ('re-upload upd.', changed, 'update')]
+            for pass_label, data, mode in passes:
+                start = time.perf_counter()
+                result = fn(data, conn, mode)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{label:<18} {pass_label:<16} {n:>8,} {elapsed:8.2f} {n / elapsed:10,.0f}  "
+                    f"{result['inserted']}/{result['updated']}/{result['skipped']}"
+                )
+            conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--legacy-rows', type=int, default=20000,
+                        help='Rows for the slow legacy loop (throughput is per row)')
+    args = parser.parse_args()
+    run(args.rows, args.legacy_rows)
@@ -0,0 +1,81 @@
+"""
+Benchmark: Plotly figure JSON size with and without chart_data reduction.
+
+Builds a daily-trend line chart (two traces, like the dashboard overview)
+and a spend-vs-conversions scatter (like ML Insights) from N-point frames,
+and reports the serialized figure size, the reduction time and how much of
+the series' range the downsampled line keeps.
+
+USAGE:
+    python benchmarks/bench_chart_payload.py --points 1000 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.ui_components.chart_data import downsample_series, sample_points
+from config import CHART_MAX_POINTS
+
+
+def trend_frame(n: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    seasonal = 1 + 0.3 * np.sin(np.arange(n) / 58.0)
+    return pd.DataFrame({
+        'date': pd.date_range('2015-01-01', periods=n, freq='h'),
+        'spend': rng.gamma(4, 250, n) * seasonal,
+        'revenue': rng.gamma(4, 900, n) * seasonal,
+    })
+
+
+def line_figure(df: pd.DataFrame) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df['date'], y=df['spend'], name='Spend'))
+    fig.add_trace(go.Scatter(x=df['date'], y=df['revenue'], name='Revenue'))
+    return fig
+
+
+def json_kb(fig) -> float:
+    return len(fig.to_json()) / 1024
+
+
+def run(point_counts, max_kb: float) -> bool:
+    ok = True
+    print(f"cap: {CHART_MAX_POINTS:,} points per trace\n")
+    print(f"{'chart':<8} {'points':>10} {'full KB':>10} {'reduced KB':>11} {'kept':>7} {'reduce ms':>10} {'range kept':>11}")
+    for n in point_counts:
+        df = trend_frame(n)
+
+        start = time.perf_counter()
+        reduced = downsample_series(df, 'date', ['spend', 'revenue'])
+        line_ms = (time.perf_counter() - start) * 1000
+        full_kb, small_kb = json_kb(line_figure(df)), json_kb(line_figure(reduced))
+        # Share of the spend min..max span still visible after downsampling
+        span = (reduced['spend'].max() - reduced['spend'].min()) / (df['spend'].max() - df['spend'].min())
+        print(f"{'line':<8} {n:>10,} {full_kb:>10,.0f} {small_kb:>11,.0f} {len(reduced):>7,} {line_ms:>10.1f} {span:>10.1%}")
+
+        start = time.perf_counter()
+        sampled = sample_points(df)
+        scatter_ms = (time.perf_counter() - start) * 1000
+        full_kb = json_kb(px.scatter(df, x='spend', y='revenue'))
+        small_kb = json_kb(px.scatter(sampled, x='spend', y='revenue'))
+        print(f"{'scatter':<8} {n:>10,} {full_kb:>10,.0f} {small_kb:>11,.0f} {len(sampled):>7,} {scatter_ms:>10.1f} {'':>11}")
+        ok &= small_kb <= max_kb
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--max-kb', type=float, default=250.0,
+                        help='Fail if any reduced figure is larger than this')
+    args = parser.parse_args()
+    sys.exit(0 if run(args.points, args.max_kb) else 1)
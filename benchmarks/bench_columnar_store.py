@@ -0,0 +1,135 @@
+"""
+Benchmark: SQLite daily_performance reads vs the Parquet columnar mirror.
+
+Builds a throwaway database with one year of daily rows for N ads spread
+over four platforms, mirrors it, then times the fetch_performance_data
+style query (date window + platform filter + a handful of columns) on both.
+
+USAGE:
+    python benchmarks/bench_columnar_store.py --ads 1000 --days 365
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.columnar_store import ColumnarStore
+
+PLATFORMS = ['Meta', 'Google', 'TikTok', 'Snapchat']
+COLUMNS = ['report_date', 'platform', 'campaign_id', 'impressions', 'clicks', 'spend', 'conversions', 'revenue']
+SQL = (
+    "SELECT dp.report_date, c.platform, dp.campaign_id, dp.impressions, dp.clicks, dp.spend, "
+    "dp.conversions, dp.revenue FROM daily_performance dp JOIN campaigns c ON dp.campaign_id = c.campaign_id "
+    "WHERE dp.report_date BETWEEN ? AND ?"
+)
+
+
+def build_database(path: str, ads: int, days: int, seed: int = 42) -> int:
+    rng = np.random.default_rng(seed)
+    schema = open(os.path.join(os.path.dirname(__file__), '..', 'database', 'schema.sql')).read()
+    conn = sqlite3.connect(path)
+    conn.executescript(schema)
+
+    n_campaigns = max(ads // 20, 1)
+    campaigns = pd.DataFrame({
+        'campaign_id': [f'C{i:04d}' for i in range(n_campaigns)],
+        'campaign_name': [f'Campaign {i}' for i in range(n_campaigns)],
+        'platform': [PLATFORMS[i % len(PLATFORMS)] for i in range(n_campaigns)],
+    })
+    campaigns.to_sql('campaigns', conn, if_exists='append', index=False)
+
+    start = date.today() - timedelta(days=days)
+    dates = np.array([(start + timedelta(days=d)).isoformat() for d in range(days)])
+    ad_ids = np.array([f'AD{i:05d}' for i in range(ads)])
+    ad_campaigns = campaigns['campaign_id'].to_numpy()[np.arange(ads) % n_campaigns]
+
+    n = ads * days
+    impressions = rng.integers(100, 20000, n)
+    clicks = (impressions * rng.uniform(0.005, 0.04, n)).astype(int)
+    df = pd.DataFrame({
+        'report_date': np.repeat(dates, ads),
+        'ad_id': np.tile(ad_ids, days),
+        'campaign_id': np.tile(ad_campaigns, days),
+        'impressions': impressions,
+        'reach': (impressions * 0.8).astype(int),
+        'frequency': rng.uniform(1.0, 4.0, n),
+        'clicks': clicks,
+        'spend': rng.uniform(5, 300, n).round(2),
+        'conversions': (clicks * rng.uniform(0, 0.1, n)).astype(int),
+        'revenue': rng.uniform(0, 2000, n).round(2),
+    })
+    df.to_sql('daily_performance', conn, if_exists='append', index=False, chunksize=50000)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_dp_date ON daily_performance(report_date)")
+    conn.commit()
+    conn.close()
+    return n
+
+
+def timed(fn, repeat: int):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def run(ads: int, days: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        start = time.perf_counter()
+        rows = build_database(db_path, ads, days)
+        print(f"Built {rows:,} daily_performance rows in {time.perf_counter() - start:.1f}s")
+
+        store = ColumnarStore(root=os.path.join(tmp, 'columnar'), db_path=db_path)
+        start = time.perf_counter()
+        store.rebuild(tables=['daily_performance'])
+        print(f"Mirrored to Parquet in {time.perf_counter() - start:.1f}s\n")
+
+        end_date = date.today() - timedelta(days=1)
+        windows = {
+            'full year, all platforms': (end_date - timedelta(days=days - 1), None),
+            'last 30 days, all platforms': (end_date - timedelta(days=29), None),
+            'last 30 days, Meta only': (end_date - timedelta(days=29), ['Meta']),
+        }
+
+        print(f"{'query':<30} {'sqlite':>9} {'parquet':>9} {'speedup':>8} {'rows':>9}")
+        for label, (since, platforms) in windows.items():
+            params = [since.isoformat(), end_date.isoformat()]
+            sql = SQL
+            if platforms:
+                sql += f" AND c.platform IN ({','.join(['?'] * len(platforms))})"
+                params += platforms
+
+            def read_sqlite():
+                conn = sqlite3.connect(db_path)
+                try:
+                    return pd.read_sql_query(sql, conn, params=params)
+                finally:
+                    conn.close()
+
+            sqlite_t, sqlite_df = timed(read_sqlite, repeat)
+            parquet_t, parquet_df = timed(
+                lambda: store.read('daily_performance', params[0], params[1], platforms, COLUMNS), repeat
+            )
+            assert len(sqlite_df) == len(parquet_df), (len(sqlite_df), len(parquet_df))
+            print(f"{label:<30} {sqlite_t:8.3f}s {parquet_t:8.3f}s {sqlite_t / parquet_t:7.1f}x {len(parquet_df):>9,}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ads', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.ads, args.days, args.repeat)
@@ -0,0 +1,75 @@
+"""
+Benchmark: theme bytes sent over the websocket per rerun.
+
+Streamlit re-sends every element on each rerun, so whatever
+apply_custom_css emits is paid again on every widget interaction. Runs a
+minimal page through streamlit.testing.AppTest, clicks a button, and sums
+the serialized element protos of that rerun for:
+
+  legacy inline   the unminified stylesheet in a <style> block (old behaviour)
+  minified inline apply_custom_css with static serving off
+  static link     apply_custom_css with server.enableStaticServing on
+
+USAGE:
+    python benchmarks/bench_css_payload.py --interactions 20
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from streamlit import config
+from streamlit.testing.v1 import AppTest
+
+import app_utils
+
+PAGE = f'''
+import sys
+sys.path.insert(0, {ROOT!r})
+import streamlit as st
+import app_utils
+
+mode = {{mode!r}}
+if mode == 'legacy':
+    with open(app_utils.THEME_CSS_PATH, encoding='utf-8') as f:
+        st.markdown(f"<style>{{{{f.read()}}}}</style>", unsafe_allow_html=True)
+else:
+    app_utils.apply_custom_css()
+st.button("Refresh")
+'''
+
+MODES = {
+    'legacy inline': ('legacy', False),
+    'minified inline': ('current', False),
+    'static link': ('current', True),
+}
+
+
+def rerun_bytes(mode: str, static_serving: bool) -> int:
+    """Serialized size of every element produced by one button-click rerun."""
+    config.set_option('server.enableStaticServing', static_serving)
+    at = AppTest.from_string(PAGE.format(mode=mode)).run()
+    at.button[0].click().run()
+    return sum(element.proto.ByteSize() for element in at.main if getattr(element, 'proto', None) is not None)
+
+
+def run(interactions: int, max_bytes: int) -> bool:
+    results = {name: rerun_bytes(*args) for name, args in MODES.items()}
+    baseline = results['legacy inline']
+    print(f"{'mode':<16} {'bytes/rerun':>12} {f'x{interactions} reruns':>14} {'saved':>7}")
+    for name, size in results.items():
+        print(f"{name:<16} {size:>12,} {size * interactions:>14,} {1 - size / baseline:>6.0%}")
+    print(f"\nstylesheet on disk: {os.path.getsize(app_utils.THEME_CSS_PATH):,} bytes (fetched once, then 304s)")
+    return results['static link'] <= max_bytes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interactions', type=int, default=20)
+    parser.add_argument('--max-bytes', type=int, default=512,
+                        help='Fail if the static-link rerun payload exceeds this')
+    args = parser.parse_args()
+    sys.exit(0 if run(args.interactions, args.max_bytes) else 1)
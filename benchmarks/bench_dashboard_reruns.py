@@ -0,0 +1,105 @@
+"""
+Benchmark: dashboard work per widget interaction, full rerun vs fragment rerun.
+
+Before fragments, changing the platform or report selectbox reran the whole
+script: re-filter the frame and rebuild all five tabs. Now only the owning
+fragment (render_platform_tab / render_reports_tab) reruns, with its
+inputs memoized per view.
+
+Runs the dashboard functions in Streamlit bare mode on an N-row demo frame:
+
+  full rerun      render_dashboard with every cache cleared (old per-interaction cost)
+  fragment, cold  the fragment for a selection not seen yet
+  fragment, warm  the fragment for a selection seen before
+
+USAGE:
+    python benchmarks/bench_dashboard_reruns.py --rows 100000 1000000
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import streamlit as st
+from streamlit.logger import set_log_level
+
+import dashboard
+from app.data_integration.frame_index import FrameIndex
+from app.data_integration.demo_data import generate_dashboard_demo_data
+
+DAYS = 365
+PLATFORMS = ["Meta Ads", "Google Ads", "TikTok Ads", "Snapchat Ads"]
+REGIONS = ["Saudi Arabia", "UAE", "Qatar", "Kuwait"]
+
+
+def campaign_names(n: int):
+    """Names whose prefix/market code map onto every dashboard platform and region."""
+    prefixes, markets = ['FB', 'GGL', 'TT', 'SNAP'], ['SAU', 'UAE', 'QAT', 'KWT']
+    return [f"{prefixes[i % 4]}_Bench_{markets[(i // 4) % 4]}_Ret_{i:05d}" for i in range(n)]
+
+
+# st.fragment skips its body outside a script run, so bare mode calls the
+# undecorated functions
+FRAGMENTS = {name: getattr(dashboard, name).__wrapped__ for name in ('render_platform_tab', 'render_reports_tab')}
+
+
+def timed(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def run(row_counts, repeats: int) -> None:
+    print(f"{'rows':>10} {'full rerun':>11} {'platform cold':>14} {'platform warm':>14} {'reports cold':>13} {'reports warm':>13}")
+    for rows in row_counts:
+        df = generate_dashboard_demo_data(DAYS, campaign_names(math.ceil(rows / (DAYS + 1))))
+        index = FrameIndex(df)
+        date_range = (df['date'].min().date(), df['date'].max().date())
+        source_key = ('bench', rows)
+
+        def full_rerun():
+            st.cache_data.clear()
+            dashboard.render_dashboard(index, PLATFORMS, REGIONS, date_range, source_key=source_key)
+
+        decorated = {name: getattr(dashboard, name) for name in FRAGMENTS}
+        vars(dashboard).update(FRAGMENTS)
+        try:
+            full_ms = timed(full_rerun, repeats)
+        finally:
+            vars(dashboard).update(decorated)
+
+        # The fragments rerun with the arguments of the last full run
+        view = index.filter(date=date_range, platform=PLATFORMS, region=REGIONS)
+        view_key = (source_key, index.version, date_range, tuple(PLATFORMS), tuple(REGIONS))
+
+        def cold(tab_fn, cache_fn):
+            def call():
+                cache_fn.clear()
+                tab_fn(view, view_key)
+            return call
+
+        platform_tab, reports_tab = FRAGMENTS['render_platform_tab'], FRAGMENTS['render_reports_tab']
+        platform_cold = timed(cold(platform_tab, dashboard._platform_tab_data), repeats)
+        platform_warm = timed(lambda: platform_tab(view, view_key), repeats)
+        reports_cold = timed(cold(reports_tab, dashboard._report_table), repeats)
+        reports_warm = timed(lambda: reports_tab(view, view_key), repeats)
+        print(f"{len(df):>10,} {full_ms:>9.0f}ms {platform_cold:>12.0f}ms {platform_warm:>12.0f}ms "
+              f"{reports_cold:>11.0f}ms {reports_warm:>11.0f}ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    # Bare mode logs a warning for every widget and cache call
+    set_log_level('error')
+    run(args.rows, args.repeats)
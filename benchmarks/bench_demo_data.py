@@ -0,0 +1,86 @@
+"""
+Benchmark: the old per-row demo data loop vs the vectorized generator.
+
+The legacy loop is the pre-refactor ML Insights / Export implementation
+(one dict per row, five scalar RNG calls each). Both build the same
+90-day campaign x platform grid, scaled to N rows by adding campaigns.
+
+USAGE:
+    python benchmarks/bench_demo_data.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.data_integration.demo_data import DEMO_PLATFORMS, _campaign_names, generate_campaign_data
+
+DAYS = 90
+
+
+def legacy_campaign_data(campaigns, platforms, days: int = DAYS) -> pd.DataFrame:
+    now = datetime.now()
+    dates = pd.date_range(start=now - timedelta(days=days), end=now, freq="D")
+    rng = np.random.default_rng(42)
+
+    rows = []
+    for date in dates:
+        for campaign in campaigns:
+            for platform in platforms:
+                spend = rng.uniform(500, 2000)
+                impressions = int(spend * rng.uniform(800, 1200))
+                clicks = max(1, int(impressions * rng.uniform(0.008, 0.035)))
+                conversions = max(0, int(clicks * rng.uniform(0.02, 0.08)))
+                revenue = conversions * rng.uniform(300, 800)
+                rows.append({
+                    'date': date, 'campaign_name': campaign, 'platform': platform,
+                    'spend': spend, 'impressions': impressions, 'clicks': clicks,
+                    'conversions': conversions, 'revenue': revenue
+                })
+
+    df = pd.DataFrame(rows)
+    df['roas'] = (df['revenue'] / df['spend']).replace([np.inf, -np.inf], 0).fillna(0)
+    df['cpa'] = (df['spend'] / df['conversions']).replace([np.inf, -np.inf], 0).fillna(0)
+    df['ctr'] = (df['clicks'] / df['impressions'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
+    df['cpc'] = (df['spend'] / df['clicks']).replace([np.inf, -np.inf], 0).fillna(0)
+    df['cpm'] = (df['spend'] / df['impressions'] * 1000).replace([np.inf, -np.inf], 0).fillna(0)
+    return df
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run(row_counts, min_speedup: float) -> bool:
+    ok = True
+    print(f"{'rows':>10} {'legacy':>9} {'vectorized':>11} {'speedup':>8}")
+    for rows in row_counts:
+        n_campaigns = math.ceil(rows / ((DAYS + 1) * len(DEMO_PLATFORMS)))
+        names = _campaign_names(n_campaigns)
+        legacy_t, legacy_df = timed(lambda: legacy_campaign_data(names, DEMO_PLATFORMS))
+        fast_t, fast_df = timed(lambda: generate_campaign_data(DAYS, names, DEMO_PLATFORMS))
+        assert list(legacy_df.columns) == list(fast_df.columns) and len(legacy_df) == len(fast_df)
+        speedup = legacy_t / fast_t
+        print(f"{len(fast_df):>10,} {legacy_t:8.2f}s {fast_t:10.3f}s {speedup:7.1f}x")
+        if rows >= 1_000_000 and speedup < min_speedup:
+            ok = False
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--min-speedup', type=float, default=10.0,
+                        help='Fail if the 1M-row speedup is below this')
+    args = parser.parse_args()
+    sys.exit(0 if run(args.rows, args.min_speedup) else 1)
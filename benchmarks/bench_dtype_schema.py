@@ -0,0 +1,91 @@
+"""
+Benchmark: memory and groupby time of a campaign frame before and after schema.apply_schema.
+
+Builds the dashboard campaign frame at N rows as the loaders return it
+(label columns as strings, counters as int64, ratios as float64), then
+casts a copy to the compact schema (categorical labels, int32 counters,
+float32 ratios) and compares:
+
+  memory      DataFrame.memory_usage(deep=True)
+  groupby     per-platform / per-campaign / campaign x platform sums
+  aggregate   metrics.aggregate_metrics by platform (the dashboard's path)
+
+Sums must match between the two frames.
+
+USAGE:
+    python benchmarks/bench_dtype_schema.py --rows 1000000 5000000
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from streamlit.logger import set_log_level
+
+from app.analysis_modules.metrics import aggregate_metrics
+from app.data_integration.demo_data import generate_dashboard_demo_data
+from app.data_integration.schema import apply_schema, memory_report
+from bench_dashboard_reruns import campaign_names
+
+DAYS = 365
+SUMS = ['spend', 'revenue', 'impressions', 'clicks', 'conversions']
+
+
+def cases():
+    return {
+        'groupby platform': lambda df: df.groupby('platform', observed=True)[SUMS].sum(),
+        'groupby campaign': lambda df: df.groupby('campaign_name', observed=True)[SUMS].sum(),
+        'groupby campaign x platform': lambda df: df.groupby(['campaign_name', 'platform'], observed=True)[SUMS].sum(),
+        'aggregate_metrics platform': lambda df: aggregate_metrics(df, 'platform').set_index('platform'),
+    }
+
+
+def best_ms(fn, number: int = 1) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1000
+
+
+def run(row_counts, min_ratio: float) -> bool:
+    ok = True
+    for rows in row_counts:
+        raw = generate_dashboard_demo_data(DAYS, campaign_names(math.ceil(rows / (DAYS + 1))))
+        start = time.perf_counter()
+        compact = apply_schema(raw.copy())
+        cast_ms = (time.perf_counter() - start) * 1000
+
+        before, after = memory_report(raw), memory_report(compact)
+        ratio = before['total_bytes'] / after['total_bytes']
+        print(f"\n{len(raw):,} rows: {before['total_bytes'] / 1024 ** 2:,.0f} MB -> "
+              f"{after['total_bytes'] / 1024 ** 2:,.0f} MB ({ratio:.1f}x smaller, cast {cast_ms:.0f} ms)")
+        print(f"  {'column':<16} {'before':>16} {'after':>16} {'MB before':>10} {'MB after':>9}")
+        for column, info in before['columns'].items():
+            new = after['columns'][column]
+            print(f"  {column:<16} {info['dtype']:>16} {new['dtype']:>16} "
+                  f"{info['bytes'] / 1024 ** 2:>10.1f} {new['bytes'] / 1024 ** 2:>9.1f}")
+
+        print(f"  {'case':<28} {'strings':>10} {'compact':>10} {'speedup':>8}")
+        for name, fn in cases().items():
+            expected, got = fn(raw), fn(compact)
+            assert np.allclose(expected['spend'].to_numpy(), got['spend'].to_numpy()), name
+            assert (expected['clicks'].to_numpy() == got['clicks'].to_numpy()).all(), name
+            raw_ms, compact_ms = best_ms(lambda: fn(raw)), best_ms(lambda: fn(compact))
+            print(f"  {name:<28} {raw_ms:>8.0f}ms {compact_ms:>8.0f}ms {raw_ms / compact_ms:>7.1f}x")
+        ok &= ratio >= min_ratio
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 5_000_000])
+    parser.add_argument('--min-ratio', type=float, default=2.0,
+                        help='Fail if the compact frame is not at least this many times smaller')
+    args = parser.parse_args()
+    set_log_level('error')
+    sys.exit(0 if run(args.rows, args.min_ratio) else 1)
@@ -0,0 +1,117 @@
+"""
+Benchmark: boolean-mask filtering vs FrameIndex on the dashboard campaign frame.
+
+Compares datasets.apply_filters (one full-length mask per column, the
+pre-index dashboard path) with FrameIndex.positions (binary-searched date
+slice + code lookups, returns a slice or index array) and FrameIndex.filter
+(positions plus materializing the rows). Both must select the same rows.
+
+Before timing, --checks random filters (value subsets, including every
+category, over random date ranges) run against a copy with missing labels
+and must select exactly the rows apply_filters (Series.isin) selects.
+
+USAGE:
+    python benchmarks/bench_frame_index.py --rows 1000000 5000000
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from streamlit.logger import set_log_level
+
+from app.data_integration.datasets import apply_filters
+from app.data_integration.demo_data import generate_dashboard_demo_data
+from app.data_integration.frame_index import FrameIndex
+from bench_dashboard_reruns import campaign_names
+
+DAYS = 365
+ALL_REGIONS = ["Saudi Arabia", "UAE", "Qatar", "Kuwait"]
+
+
+def cases(df: pd.DataFrame) -> dict:
+    end = df['date'].max()
+    last_30 = (end - pd.Timedelta(days=30), end)
+    return {
+        'last 30 days': dict(date=last_30),
+        'dashboard default': dict(date=last_30, platform=['Meta Ads'], region=ALL_REGIONS),
+        '2 platforms x 1 region': dict(date=last_30, platform=['Meta Ads', 'TikTok Ads'], region=['UAE']),
+        '3 platforms, full year': dict(platform=['Meta Ads', 'Google Ads', 'TikTok Ads']),
+        '20 campaigns': dict(date=last_30, campaign_name=sorted(df['campaign_name'].unique())[:20]),
+    }
+
+
+def check_against_isin(df: pd.DataFrame, checks: int, seed: int = 7) -> None:
+    """Random filters on a frame with missing labels must match apply_filters row for row."""
+    rng = np.random.default_rng(seed)
+    df = df.reset_index(drop=True)
+    for column in ('platform', 'region', 'campaign_name'):
+        df[column] = df[column].mask(rng.random(len(df)) < 0.02)
+    index = FrameIndex(df)
+    dates = np.sort(df['date'].unique())
+    for _ in range(checks):
+        filters = {}
+        if rng.random() < 0.7:
+            start, end = np.sort(rng.choice(dates, 2))
+            filters['date'] = (start, end)
+        for column in ('platform', 'region', 'campaign_name'):
+            if rng.random() < 0.5:
+                continue
+            categories = index.categories(column)
+            size = len(categories) if rng.random() < 0.3 else int(rng.integers(0, len(categories) + 1))
+            filters[column] = list(rng.choice(categories, size, replace=False))
+        expected = apply_filters(df, filters)
+        got = index.filter(**filters)
+        assert len(got) == len(expected), filters
+        assert math.isclose(got['spend'].sum(), expected['spend'].sum()), filters
+    print(f"{len(df):>10,} {'(isin check)':<24} {checks:>9,} random filters match")
+
+
+def best_ms(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def run(row_counts, max_ms: float, checks: int) -> bool:
+    ok = True
+    print(f"{'rows':>10} {'case':<24} {'matched':>9} {'masks':>9} {'positions':>10} {'+ rows':>9}")
+    for rows in row_counts:
+        df = generate_dashboard_demo_data(DAYS, campaign_names(math.ceil(rows / (DAYS + 1))))
+        df = df.sample(frac=1, random_state=42)  # ingestion order, not date order
+        check_against_isin(df, checks)
+        start = time.perf_counter()
+        index = FrameIndex(df)
+        print(f"{len(df):>10,} {'(build index)':<24} {'':>9} {'':>9} {(time.perf_counter() - start) * 1000:>8.0f}ms")
+
+        for name, filters in cases(df).items():
+            expected = apply_filters(df, filters)
+            got = index.filter(**filters)
+            assert len(got) == len(expected) and math.isclose(got['spend'].sum(), expected['spend'].sum()), name
+
+            mask_ms = best_ms(lambda: apply_filters(df, filters), 3)
+            pos_ms = best_ms(lambda: index.positions(**filters), 50)
+            take_ms = best_ms(lambda: index.filter(**filters), 3)
+            print(f"{'':>10} {name:<24} {len(got):>9,} {mask_ms:>7.1f}ms {pos_ms:>8.3f}ms {take_ms:>7.1f}ms")
+            if name in ('last 30 days', 'dashboard default'):
+                ok &= pos_ms <= max_ms
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 5_000_000])
+    parser.add_argument('--max-ms', type=float, default=1.0,
+                        help='Fail if the date-range or dashboard-default lookup is slower than this')
+    parser.add_argument('--checks', type=int, default=300,
+                        help='Random filters compared against apply_filters on a frame with missing labels')
+    args = parser.parse_args()
+    set_log_level('error')
+    sys.exit(0 if run(args.rows, args.max_ms, args.checks) else 1)
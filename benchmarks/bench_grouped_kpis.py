@@ -0,0 +1,81 @@
+"""
+Benchmark: groupby().apply(lambda) ratios vs metrics.aggregate_metrics.
+
+The lambdas are the pre-refactor dashboard tab implementations (ROAS by
+platform for the overview/alerts tabs, CPA by date for the platform tab),
+plus ROAS by campaign, where the per-group Python call hurts most. Each
+case checks both paths give the same ratios.
+
+USAGE:
+    python benchmarks/bench_grouped_kpis.py --rows 1000000
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.analysis_modules.metrics import aggregate_metrics
+from app.data_integration.demo_data import DEMO_PLATFORMS, generate_campaign_data
+
+DAYS = 90
+
+
+def legacy_roas(df, by):
+    return df.groupby(by).apply(
+        lambda x: x['revenue'].sum() / x['spend'].sum() if x['spend'].sum() > 0 else 0
+    ).to_frame(name='roas').reset_index()
+
+
+def legacy_cpa(df, by):
+    return df.groupby(by).apply(
+        lambda x: x['spend'].sum() / x['conversions'].sum() if x['conversions'].sum() > 0 else 0
+    ).to_frame(name='cpa').reset_index()
+
+
+CASES = {
+    'ROAS by platform': (legacy_roas, 'platform', 'roas'),
+    'CPA by date': (legacy_cpa, 'date', 'cpa'),
+    'ROAS by campaign': (legacy_roas, 'campaign_name', 'roas'),
+}
+
+
+def best_of(fn, repeats: int):
+    times, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def run(rows: int, repeats: int, min_speedup: float) -> bool:
+    n_campaigns = math.ceil(rows / ((DAYS + 1) * len(DEMO_PLATFORMS)))
+    df = generate_campaign_data(DAYS, n_campaigns)
+    print(f"{len(df):,} rows, {n_campaigns:,} campaigns")
+    print(f"{'case':<18} {'groups':>7} {'apply':>9} {'aggregate':>10} {'speedup':>8}")
+
+    ok = True
+    for name, (legacy, key, metric) in CASES.items():
+        legacy_t, old = best_of(lambda: legacy(df, key), repeats)
+        fast_t, new = best_of(lambda: aggregate_metrics(df, key, [metric]), repeats)
+        assert np.allclose(old[metric].to_numpy(), new[metric].to_numpy()), name
+        speedup = legacy_t / fast_t
+        print(f"{name:<18} {len(new):>7,} {legacy_t * 1000:7.1f}ms {fast_t * 1000:8.1f}ms {speedup:7.1f}x")
+        ok &= speedup >= min_speedup
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--min-speedup', type=float, default=1.0,
+                        help='Fail if any case is slower than this multiple of the apply version')
+    args = parser.parse_args()
+    sys.exit(0 if run(args.rows, args.repeats, args.min_speedup) else 1)
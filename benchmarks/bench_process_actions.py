@@ -0,0 +1,92 @@
+"""
+Benchmark: MetaAdsClient._process_actions against the previous per-type
+`apply` implementation on synthetic ad-level insights.
+
+USAGE:
+    python benchmarks/bench_process_actions.py --rows 100000 [--all-types]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.data_integration.meta_api import MetaAdsClient
+
+ALL_TYPES = [
+    'purchase', 'add_to_cart', 'lead', 'complete_registration', 'link_click',
+    'landing_page_view', 'view_content', 'post_engagement', 'page_engagement', 'video_view',
+]
+
+
+def make_insights(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Rows with 0-10 actions each, values as strings like the API returns."""
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(0, len(ALL_TYPES) + 1, size=rows)
+    actions, action_values = [], []
+    for n in counts:
+        types = rng.choice(ALL_TYPES, size=n, replace=False)
+        actions.append([{'action_type': t, 'value': str(int(v))} for t, v in zip(types, rng.integers(1, 500, n))] or np.nan)
+        action_values.append([{'action_type': 'purchase', 'value': f'{rng.uniform(50, 900):.2f}'}] if 'purchase' in types else np.nan)
+    return pd.DataFrame({'ad_id': np.arange(rows), 'actions': actions, 'action_values': action_values})
+
+
+def legacy_process_actions(df: pd.DataFrame, action_types: list) -> pd.DataFrame:
+    """Previous implementation: one Series.apply per action type."""
+    def get_action_value(actions, action_type):
+        for action in actions:
+            if action.get('action_type') == action_type:
+                return float(action.get('value', 0))
+        return 0
+
+    for action_type in action_types:
+        df[f'action_{action_type}'] = df['actions'].apply(
+            lambda x: get_action_value(x, action_type) if isinstance(x, list) else 0
+        )
+    df['purchase_value'] = df['action_values'].apply(
+        lambda x: get_action_value(x, 'purchase') if isinstance(x, list) else 0
+    )
+    return df
+
+
+def run(rows: int, repeat: int, all_types: bool) -> None:
+    base = make_insights(rows)
+    action_types = ALL_TYPES if all_types else MetaAdsClient.ACTION_TYPES
+    client = MetaAdsClient(account_ids=['act_bench'], action_types=action_types)
+    columns = [f'action_{t}' for t in action_types] + ['purchase_value']
+
+    timings = {}
+    outputs = {}
+    implementations = [
+        ('legacy apply', lambda df: legacy_process_actions(df, action_types)),
+        ('vectorized', client._process_actions),
+    ]
+    print(f"{rows:,} rows, {len(action_types)} action types")
+    for label, fn in implementations:
+        best = float('inf')
+        for _ in range(repeat):
+            df = base.copy()
+            start = time.perf_counter()
+            out = fn(df)
+            best = min(best, time.perf_counter() - start)
+        timings[label] = best
+        outputs[label] = out[columns].astype(float)
+
+    same = outputs['legacy apply'].equals(outputs['vectorized'])
+    for label, seconds in timings.items():
+        print(f"{label:<13} {seconds * 1000:9.1f} ms")
+    print(f"speedup       {timings['legacy apply'] / timings['vectorized']:9.1f}x   identical={same}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--all-types', action='store_true', help=f'Extract all {len(ALL_TYPES)} synthetic action types')
+    args = parser.parse_args()
+    run(args.rows, args.repeat, args.all_types)
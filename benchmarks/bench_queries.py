@@ -0,0 +1,422 @@
+"""
+Benchmark: every analysis-module function and Data Assistant query type
+over synthetic furniture.db databases at several scales.
+
+Each scale gets its own furniture.db built from the repo's own generators:
+db_setup.populate_sample_data seeds the base catalogue, roles and users, and
+the mock platform fetchers in api_connectors.py are sampled (seeded) to
+produce metric distributions that are then scaled out to thousands of ads,
+campaigns and segment rows. Databases are initialised like the app does
+(ensure_db_initialized: rollups and covering indexes).
+
+For every case it records p50/p95/mean latency and peak Python memory
+(tracemalloc), and writes a JSON report with stable keys so two runs can be
+diffed between commits (or compared with --compare).
+
+USAGE:
+    python benchmarks/bench_queries.py                       # 10k and 1m
+    python benchmarks/bench_queries.py --scales 10k 1m 10m --data-dir /tmp/benchdb
+    python benchmarks/bench_queries.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform as platform_info
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from app.analysis_modules import (
+    ab_test_analysis, assistant_queries, benchmarking_analysis, budget_analysis,
+    campaign_performance, creative_analysis, persona_analysis, segmentation_analysis,
+)
+from app.data_integration import api_connectors
+from app.startup import ensure_db_initialized
+from database import db_setup
+from database.connection import close_thread_connections
+
+# daily_performance rows, ads and days per scale; segment rows come from
+# SEGMENT_AD_SHARE of the ads times their platform's segment breakdowns
+SCALES = {
+    '10k': {'rows': 10_000, 'ads': 200, 'days': 50},
+    '1m': {'rows': 1_000_000, 'ads': 2_000, 'days': 500},
+    '10m': {'rows': 10_000_000, 'ads': 10_000, 'days': 1_000},
+}
+SEGMENT_AD_SHARE = 0.05
+ADS_PER_CAMPAIGN = 20
+CHUNK_ROWS = 500_000
+
+PLATFORM_PREFIX = {'Meta': 'META', 'Google': 'GOOG', 'TikTok': 'TIKTOK', 'Snapchat': 'SNAP'}
+PERF_METRICS = ['impressions', 'reach', 'frequency', 'clicks', 'spend', 'conversions', 'revenue']
+SEGMENT_METRICS = ['impressions', 'clicks', 'spend', 'conversions', 'revenue']
+SEGMENT_FETCHERS = {
+    'Meta': api_connectors.fetch_meta_segmented_data,
+    'Google': api_connectors.fetch_google_segmented_data,
+    'TikTok': api_connectors.fetch_tiktok_segmented_data,
+    'Snapchat': api_connectors.fetch_snapchat_segmented_data,
+}
+
+
+# ============================================================================
+# SYNTHETIC DATABASE
+# ============================================================================
+
+def _metric_pools(samples: int):
+    """Sample the mock fetchers into per-platform metric arrays."""
+    day = date.today().isoformat()
+    perf = {
+        'Meta': pd.concat([api_connectors._generate_mock_meta_data(day) for _ in range(samples)]),
+        'Google': pd.concat([api_connectors.fetch_google_data(day, day) for _ in range(samples)]),
+        'TikTok': pd.concat([api_connectors.fetch_tiktok_data(day, day) for _ in range(samples)]),
+        'Snapchat': pd.concat([api_connectors.fetch_snapchat_data(day, day) for _ in range(samples)]),
+    }
+    segments = {p: pd.concat([fetch(day, day) for _ in range(max(samples // 10, 1))]) for p, fetch in SEGMENT_FETCHERS.items()}
+    return (
+        {p: df[PERF_METRICS].to_numpy(dtype=float) for p, df in perf.items()},
+        {p: df[SEGMENT_METRICS].to_numpy(dtype=float) for p, df in segments.items()},
+        {p: df[['segment_type', 'segment_value']].drop_duplicates().to_numpy() for p, df in segments.items()},
+    )
+
+
+def _rows(columns: dict, ints: set):
+    """Column arrays -> executemany tuples with native Python types."""
+    lists = [col.astype(int).tolist() if name in ints else col.tolist() for name, col in columns.items()]
+    return zip(*lists)
+
+
+def _insert(conn, table: str, columns: dict, ints: set = frozenset()) -> None:
+    names = ', '.join(columns)
+    marks = ', '.join('?' * len(columns))
+    conn.executemany(f"INSERT OR IGNORE INTO {table} ({names}) VALUES ({marks})", _rows(columns, ints))
+
+
+def build_database(path: str, scale: dict, seed: int = 42) -> dict:
+    """
+    Build a synthetic furniture.db at `path`.
+
+    Returns:
+        Dict of row counts per table
+    """
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+    perf_pools, seg_pools, seg_combos = _metric_pools(samples=200)
+    platforms = list(PLATFORM_PREFIX)
+
+    cwd = os.getcwd()
+    os.chdir(os.path.dirname(path))
+    try:
+        db_setup.create_database()
+        db_setup.populate_sample_data()
+        close_thread_connections()
+    finally:
+        os.chdir(cwd)
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA synchronous = OFF")
+
+    # Catalogue: the sample ads plus generated campaigns / ad sets / ads
+    sample_ads = conn.execute("SELECT a.ad_id, s.campaign_id, c.platform FROM ads a JOIN ad_sets s "
+                              "ON a.ad_set_id = s.ad_set_id JOIN campaigns c ON s.campaign_id = c.campaign_id").fetchall()
+    n_generated = max(scale['ads'] - len(sample_ads), 0)
+    ad_platform = np.array([platforms[i % len(platforms)] for i in range(n_generated)])
+    ad_ids = np.array([f'{PLATFORM_PREFIX[p]}_AD{i:06d}' for i, p in enumerate(ad_platform)])
+    campaign_idx = np.arange(n_generated) // ADS_PER_CAMPAIGN
+    campaign_ids = np.array([f'{PLATFORM_PREFIX[p]}_C{c:05d}' for p, c in zip(ad_platform, campaign_idx)])
+
+    campaigns = pd.DataFrame({'campaign_id': campaign_ids, 'platform': ad_platform}).drop_duplicates('campaign_id')
+    _insert(conn, 'campaigns', {
+        'campaign_id': campaigns['campaign_id'].to_numpy(),
+        'campaign_name': (campaigns['platform'] + ' Campaign ' + campaigns['campaign_id'].str[-5:]).to_numpy(),
+        'platform': campaigns['platform'].to_numpy(),
+        'objective': rng.choice(['Awareness', 'Consideration', 'Sales'], len(campaigns)),
+        'funnel_stage': rng.choice(['TOF', 'MOF', 'BOF'], len(campaigns)),
+    })
+    _insert(conn, 'ad_sets', {
+        'ad_set_id': campaigns['campaign_id'].str.replace('_C', '_AS', regex=False).to_numpy(),
+        'ad_set_name': ('Ad set ' + campaigns['campaign_id']).to_numpy(),
+        'campaign_id': campaigns['campaign_id'].to_numpy(),
+    })
+    _insert(conn, 'ads', {
+        'ad_id': ad_ids,
+        'ad_name': np.char.add('Ad ', ad_ids.astype(str)),
+        'ad_set_id': np.char.replace(campaign_ids.astype(str), '_C', '_AS'),
+        'creative_type': rng.choice(['Video', 'Image', 'Carousel', 'AR Lens'], n_generated),
+        'headline_text': rng.choice(['Modern Living', 'Premium Leather Sofas', 'Upgrade Your Space!'], n_generated),
+    })
+    budgets = campaigns['campaign_id'].to_numpy()
+    today = date.today()
+    _insert(conn, 'campaign_budgets', {
+        'campaign_id': budgets,
+        'start_date': np.full(len(budgets), (today - timedelta(days=scale['days'])).isoformat()),
+        'end_date': np.full(len(budgets), (today + timedelta(days=30)).isoformat()),
+        'total_budget': rng.uniform(5_000, 50_000, len(budgets)).round(2),
+    })
+
+    all_ads = np.concatenate([np.array([a[0] for a in sample_ads]), ad_ids])
+    all_campaigns = np.concatenate([np.array([a[1] for a in sample_ads]), campaign_ids])
+    all_platforms = np.concatenate([np.array([a[2] for a in sample_ads]), ad_platform])
+    n_ads = len(all_ads)
+    days = np.array([(today - timedelta(days=scale['days'] - d)).isoformat() for d in range(scale['days'])])
+
+    # daily_performance, one row per (day, ad), in chunks of whole days
+    ints = {'impressions', 'reach', 'clicks', 'conversions'}
+    days_per_chunk = max(CHUNK_ROWS // n_ads, 1)
+    for start in range(0, len(days), days_per_chunk):
+        block = days[start:start + days_per_chunk]
+        metrics = np.empty((len(block), n_ads, len(PERF_METRICS)))
+        for p in platforms:
+            mask = all_platforms == p
+            pool = perf_pools[p]
+            metrics[:, mask] = pool[rng.integers(0, len(pool), (len(block), int(mask.sum())))]
+        flat = metrics.reshape(-1, len(PERF_METRICS))
+        columns = {
+            'report_date': np.repeat(block, n_ads),
+            'ad_id': np.tile(all_ads, len(block)),
+            'campaign_id': np.tile(all_campaigns, len(block)),
+        }
+        columns.update({m: flat[:, i] for i, m in enumerate(PERF_METRICS)})
+        _insert(conn, 'daily_performance', columns, ints)
+        conn.commit()
+
+    # performance_by_segment for a share of the ads, every breakdown of their platform
+    seg_ads = rng.choice(n_ads, max(int(n_ads * SEGMENT_AD_SHARE), 4), replace=False)
+    template = [(all_ads[a], all_campaigns[a], all_platforms[a], t, v)
+                for a in seg_ads for t, v in seg_combos[all_platforms[a]]]
+    t_ad, t_campaign, t_platform, t_type, t_value = (np.array(col) for col in zip(*template))
+    days_per_chunk = max(CHUNK_ROWS // len(template), 1)
+    for start in range(0, len(days), days_per_chunk):
+        block = days[start:start + days_per_chunk]
+        platform_rep = np.tile(t_platform, len(block))
+        metrics = np.empty((len(platform_rep), len(SEGMENT_METRICS)))
+        for p in platforms:
+            mask = platform_rep == p
+            pool = seg_pools[p]
+            metrics[mask] = pool[rng.integers(0, len(pool), int(mask.sum()))]
+        columns = {
+            'report_date': np.repeat(block, len(template)),
+            'ad_id': np.tile(t_ad, len(block)),
+            'campaign_id': np.tile(t_campaign, len(block)),
+            'segment_type': np.tile(t_type, len(block)),
+            'segment_value': np.tile(t_value, len(block)),
+        }
+        columns.update({m: metrics[:, i] for i, m in enumerate(SEGMENT_METRICS)})
+        _insert(conn, 'performance_by_segment', columns, {'impressions', 'clicks', 'conversions'})
+        conn.commit()
+
+    # performance_by_country straight from the generator, one call per day
+    country = pd.concat([api_connectors.fetch_country_data(d, d) for d in days], ignore_index=True)
+    _insert(conn, 'performance_by_country', {c: country[c].to_numpy() for c in country.columns},
+            {'impressions', 'clicks', 'conversions'})
+
+    # sales / customers for the RFM persona analysis
+    sales_pool = pd.concat([api_connectors.fetch_customer_sales_data(today.isoformat()) for _ in range(50)])
+    n_sales = max(scale['rows'] // 20, 100)
+    customers = np.array([f'CUST_{i}' for i in range(max(n_sales // 10, 100))])
+    _insert(conn, 'customers', {'customer_id': customers, 'first_seen_date': np.full(len(customers), days[0])})
+    _insert(conn, 'sales', {
+        'customer_id': rng.choice(customers, n_sales),
+        'sale_date': rng.choice(days, n_sales),
+        'sale_amount': rng.choice(sales_pool['sale_amount'].to_numpy(), n_sales),
+    })
+    conn.commit()
+
+    counts = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+              for t in ('campaigns', 'ads', 'daily_performance', 'performance_by_segment',
+                        'performance_by_country', 'sales')}
+    conn.close()
+
+    # Same initialisation as app start-up (rollups, covering indexes)
+    os.chdir(os.path.dirname(path))
+    try:
+        ensure_db_initialized()
+        close_thread_connections()
+    finally:
+        os.chdir(cwd)
+    return counts
+
+
+# ============================================================================
+# CASES
+# ============================================================================
+
+def benchmark_cases(end_date: str, days: int) -> dict:
+    """Name -> zero-argument callable, for every analysis function and assistant query type."""
+    end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    last_30 = (end - timedelta(days=29)).isoformat()
+    all_time = (end - timedelta(days=days)).isoformat()
+    creative_df = creative_analysis.fetch_creative_performance(last_30, end_date)
+
+    cases = {
+        'campaign_performance.fetch_performance_data[30d]':
+            lambda: campaign_performance.fetch_performance_data(last_30, end_date, [], []),
+        'campaign_performance.fetch_performance_data[30d,Meta]':
+            lambda: campaign_performance.fetch_performance_data(last_30, end_date, ['Meta'], []),
+        'campaign_performance.fetch_performance_data[all]':
+            lambda: campaign_performance.fetch_performance_data(all_time, end_date, [], []),
+        'campaign_performance.get_campaign_list': campaign_performance.get_campaign_list,
+        'segmentation_analysis.fetch_data_by_segment[30d]':
+            lambda: segmentation_analysis.fetch_data_by_segment(last_30, end_date, 'Meta', 'Age'),
+        'benchmarking_analysis.fetch_benchmark_data[30d]':
+            lambda: benchmarking_analysis.fetch_benchmark_data(last_30, end_date, [], []),
+        'budget_analysis.get_budget_pacing': lambda: budget_analysis.get_budget_pacing('META_C01'),
+        'ab_test_analysis.get_ab_test_results': lambda: ab_test_analysis.get_ab_test_results('TEST01'),
+        'creative_analysis.fetch_creative_performance[30d]':
+            lambda: creative_analysis.fetch_creative_performance(last_30, end_date),
+        'creative_analysis.generate_recommendations':
+            lambda: creative_analysis.generate_recommendations(creative_df, 35.0),
+        'persona_analysis.calculate_rfm': persona_analysis.calculate_rfm,
+        'assistant.get_data_summary': assistant_queries.get_data_summary,
+    }
+    for query_type in assistant_queries.QUERY_TYPES:
+        params = {'campaign_name': 'Sofa'} if query_type == 'campaign_details' else {}
+        cases[f'assistant.{query_type}'] = (lambda q=query_type, p=params: assistant_queries.execute_data_query(q, p))
+    return cases
+
+
+def _result_rows(result) -> int:
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, (pd.DataFrame, list, dict)):
+        return len(result)
+    return 0 if result is None else 1
+
+
+def measure(fn, repeat: int) -> dict:
+    fn()  # warm-up: page cache, pooled connection, imports
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'p50_ms': round(float(np.percentile(times, 50)), 3),
+        'p95_ms': round(float(np.percentile(times, 95)), 3),
+        'mean_ms': round(float(np.mean(times)), 3),
+        'runs': repeat,
+        'peak_mb': round(peak / 2 ** 20, 2),
+        'result_rows': _result_rows(result),
+    }
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return 'unknown'
+
+
+def compare(report: dict, baseline: dict) -> None:
+    print(f"\nvs {baseline['meta'].get('commit', '?')}: p50 ratio (new / old; < 1 is faster)")
+    for scale, result in report['scales'].items():
+        old_cases = baseline.get('scales', {}).get(scale, {}).get('cases', {})
+        for name, stats in result['cases'].items():
+            old = old_cases.get(name)
+            if old and old.get('p50_ms') and 'p50_ms' in stats:
+                print(f"  {scale:>4} {name:<58} {stats['p50_ms'] / old['p50_ms']:6.2f}x")
+
+
+def run(scales, repeat: int, data_dir: str, rebuild: bool, seed: int) -> dict:
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform_info.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform_info.machine(),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'scales': {},
+    }
+    cwd = os.getcwd()
+    for name in scales:
+        scale = SCALES[name]
+        scale_dir = os.path.join(data_dir, name)
+        os.makedirs(scale_dir, exist_ok=True)
+        db_path = os.path.join(scale_dir, 'furniture.db')
+        entry = {'target_rows': scale['rows'], 'ads': scale['ads'], 'days': scale['days']}
+
+        if rebuild or not os.path.exists(db_path):
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+            print(f"🏗️  Building {name} database in {scale_dir} ...")
+            start = time.perf_counter()
+            entry['tables'] = build_database(db_path, scale, seed)
+            entry['build_seconds'] = round(time.perf_counter() - start, 1)
+        else:
+            with sqlite3.connect(db_path) as conn:
+                entry['tables'] = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                                   for t in ('campaigns', 'ads', 'daily_performance', 'performance_by_segment',
+                                             'performance_by_country', 'sales')}
+        entry['db_mb'] = round(os.path.getsize(db_path) / 2 ** 20, 1)
+
+        os.chdir(scale_dir)
+        try:
+            with sqlite3.connect(db_path) as conn:
+                end_date = conn.execute("SELECT MAX(report_date) FROM daily_performance").fetchone()[0]
+            cases = benchmark_cases(end_date, scale['days'])
+            entry['cases'] = {}
+            print(f"\n{name}: {entry['tables']['daily_performance']:,} daily_performance rows, {entry['db_mb']} MB")
+            print(f"{'case':<58} {'p50 ms':>9} {'p95 ms':>9} {'peak MB':>8} {'rows':>8}")
+            for case_name, fn in cases.items():
+                try:
+                    stats = measure(fn, repeat)
+                except Exception as e:
+                    tracemalloc.stop()
+                    entry['cases'][case_name] = {'error': f"{type(e).__name__}: {e}"}
+                    print(f"{case_name:<58} ❌ {type(e).__name__}: {e}")
+                    continue
+                entry['cases'][case_name] = stats
+                print(f"{case_name:<58} {stats['p50_ms']:9.2f} {stats['p95_ms']:9.2f} "
+                      f"{stats['peak_mb']:8.1f} {stats['result_rows']:>8,}")
+        finally:
+            close_thread_connections()
+            os.chdir(cwd)
+        report['scales'][name] = entry
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['10k', '1m'])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--data-dir', default=None, help='Where to keep the built databases (reused across runs)')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild databases that already exist')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench_queries.json', help='JSON report path')
+    parser.add_argument('--compare', default=None, help='Earlier JSON report to compare p50 against')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.abspath(args.data_dir) if args.data_dir else tmp
+        report = run(args.scales, args.repeat, data_dir, args.rebuild, args.seed)
+
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\n📝 Report written to {output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
@@ -0,0 +1,91 @@
+"""
+Benchmark: raw daily_performance aggregates vs the rollup query router.
+
+For each table size, times the Data Assistant style aggregates (by campaign,
+by platform, daily trend) straight off daily_performance and through
+database.rollups.aggregate, and checks both return the same totals.
+
+USAGE:
+    python benchmarks/bench_rollups.py --ads 100 300 1000 --days 365
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from bench_columnar_store import build_database
+from database.rollups import aggregate, choose_source, ensure_rollup_tables
+
+RAW_QUERIES = {
+    'by campaign': (
+        "SELECT c.campaign_name, c.platform, SUM(dp.impressions) AS impressions, SUM(dp.clicks) AS clicks, "
+        "SUM(dp.conversions) AS conversions FROM daily_performance dp JOIN campaigns c "
+        "ON dp.campaign_id = c.campaign_id GROUP BY c.campaign_name, c.platform",
+        dict(group_by=['campaign_name', 'platform']),
+    ),
+    'by platform': (
+        "SELECT c.platform, SUM(dp.impressions) AS impressions, SUM(dp.clicks) AS clicks, "
+        "SUM(dp.conversions) AS conversions FROM daily_performance dp JOIN campaigns c "
+        "ON dp.campaign_id = c.campaign_id GROUP BY c.platform",
+        dict(group_by=['platform']),
+    ),
+    'daily trend (90d)': (
+        "SELECT report_date, SUM(impressions) AS impressions, SUM(clicks) AS clicks, "
+        "SUM(conversions) AS conversions FROM daily_performance WHERE report_date >= ? GROUP BY report_date",
+        dict(group_by=['report_date']),
+    ),
+}
+
+
+def timed(fn, repeat: int):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def run(ad_counts, days: int, repeat: int) -> None:
+    since = (date.today() - timedelta(days=90)).isoformat()
+    print(f"{'rows':>10} {'query':<18} {'source':<22} {'raw':>9} {'routed':>9} {'speedup':>8}")
+    for ads in ad_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.db')
+            rows = build_database(db_path, ads, days)
+            conn = sqlite3.connect(db_path)
+            ensure_rollup_tables(conn)
+
+            for label, (sql, kwargs) in RAW_QUERIES.items():
+                params = [since] if '?' in sql else []
+                start_date = since if params else None
+                raw_t, raw_df = timed(lambda: pd.read_sql_query(sql, conn, params=params), repeat)
+                routed_t, routed_df = timed(
+                    lambda: aggregate(conn, ['impressions', 'clicks', 'conversions'], start_date=start_date, **kwargs),
+                    repeat,
+                )
+                assert np.isclose(raw_df['impressions'].sum(), routed_df['impressions'].sum())
+                source = choose_source(kwargs['group_by'], start_date)['table']
+                print(f"{rows:>10,} {label:<18} {source:<22} {raw_t:8.4f}s {routed_t:8.4f}s {raw_t / routed_t:7.1f}x")
+            conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ads', type=int, nargs='+', default=[100, 300, 1000])
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.ads, args.days, args.repeat)
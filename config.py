@@ -50,6 +50,18 @@ def get_secret_dict(key):
 # SQLite database path
 DB_PATH = 'furniture.db'
 
+# SQLite connection profile (database/connection.py)
+# Page cache per connection (KiB), memory-mapped I/O window (bytes) and how
+# long a writer waits on a locked database before failing (milliseconds)
+SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', '65536'))
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '30000'))
+
+# Optional Parquet mirror of the performance tables (requires pyarrow)
+# Partitioned by month and platform; kept in sync on ingest.
+COLUMNAR_STORE_ENABLED = os.getenv('COLUMNAR_STORE_ENABLED', 'false').lower() == 'true'
+COLUMNAR_STORE_PATH = os.getenv('COLUMNAR_STORE_PATH', 'data/columnar')
+
 # ============================================================================
 # MODEL STORAGE
 # ============================================================================
@@ -86,6 +98,17 @@ META_ACCOUNT_NAMES = get_secret_dict('META_ACCOUNT_NAMES')
 _use_live = get_secret('USE_LIVE_META_DATA', 'false')
 USE_LIVE_META_DATA = str(_use_live).lower() == 'true'
 
+# Multi-account fetch tuning
+# Max accounts fetched in parallel (1 = sequential) and per-account timeout (seconds)
+META_FETCH_MAX_WORKERS = int(get_secret('META_FETCH_MAX_WORKERS', '8') or 8)
+META_ACCOUNT_TIMEOUT = float(get_secret('META_ACCOUNT_TIMEOUT', '120') or 120)
+
+# Persistent on-disk cache of daily Meta insights (one partition per account/level/breakdown/day)
+# Closed days are never re-fetched; today and yesterday always are.
+_meta_cache = get_secret('META_INSIGHTS_CACHE_ENABLED', 'true')
+META_INSIGHTS_CACHE_ENABLED = str(_meta_cache).lower() == 'true'
+META_INSIGHTS_CACHE_PATH = get_secret('META_INSIGHTS_CACHE_PATH', 'cache/meta_insights.db')
+
 # Google Ads API
 GOOGLE_DEVELOPER_TOKEN = os.getenv('GOOGLE_DEVELOPER_TOKEN', '')
 GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID', '')
@@ -107,6 +130,18 @@ SNAPCHAT_AD_ACCOUNT_ID = os.getenv('SNAPCHAT_AD_ACCOUNT_ID', '')
 # Data refresh interval (in seconds)
 DATA_CACHE_TTL = 3600  # 1 hour
 
+# Max platform fetchers run in parallel during ingestion
+INGEST_MAX_WORKERS = int(os.getenv('INGEST_MAX_WORKERS', '4'))
+
+# Backfill scheduler (scripts/daily_data_refresh.py backfill)
+# Concurrent (platform, day) fetches and max fetches per minute per platform
+BACKFILL_MAX_WORKERS = int(os.getenv('BACKFILL_MAX_WORKERS', '4'))
+BACKFILL_REQUESTS_PER_MINUTE = float(os.getenv('BACKFILL_REQUESTS_PER_MINUTE', '120'))
+
+# Max points per Plotly trace (app/ui_components/chart_data.py): longer time
+# series are LTTB-downsampled, larger scatter clouds are sampled
+CHART_MAX_POINTS = int(os.getenv('CHART_MAX_POINTS', '1500'))
+
 # Default date range for reports (in days)
 DEFAULT_DATE_RANGE = 30
 
@@ -5,7 +5,6 @@ Version: 3.0 - New Design with Multi-Account Support
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Tuple, Optional
 import plotly.express as px
@@ -26,7 +25,12 @@ from app.ui_components.account_selector import (
     render_data_source_indicator,
     init_account_session_state,
 )
-from app.data_integration.meta_api import get_available_accounts, fetch_meta_live_data, get_meta_client
+from app.data_integration.meta_api import get_available_accounts, get_meta_client
+from app.data_integration.datasets import clear_datasets, get_dataset_index
+from app.data_integration.frame_index import FrameIndex
+from app.analysis_modules.metrics import aggregate_metrics, kpi_totals
+from app.ui_components.chart_data import downsample_series, top_n
+from config import DATA_CACHE_TTL
 
 # =============================
 # PAGE CONFIG & STYLE
@@ -44,131 +48,6 @@ app_utils.apply_custom_css()
 PLOTLY_TEMPLATE = app_utils.PLOTLY_TEMPLATE
 PLOTLY_CONFIG = app_utils.PLOTLY_CONFIG
 
-# =============================
-# DATA LOADING
-# =============================
-
-@st.cache_data(ttl=3600)
-def load_campaign_data(start_date: str = None, end_date: str = None, account_id: str = None) -> pd.DataFrame:
-    """
-    Load campaign data from Meta API.
-    Falls back to demo data if API is not configured or fails.
-    """
-    # Default date range: last 30 days
-    if not end_date:
-        end_date = datetime.now().strftime('%Y-%m-%d')
-    if not start_date:
-        start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-
-    # Try to fetch from Meta API
-    try:
-        df = fetch_meta_live_data(start_date, end_date, account_id)
-
-        if not df.empty:
-            # Normalize column names for dashboard compatibility
-            df = df.rename(columns={
-                'campaign_name': 'campaign_name',
-                'account_friendly_name': 'account_name',
-                'date_start': 'date',
-            })
-
-            # Ensure date column exists and is datetime
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'])
-            elif 'date_start' in df.columns:
-                df['date'] = pd.to_datetime(df['date_start'])
-
-            # Add platform column (all Meta data)
-            df['platform'] = 'Meta Ads'
-
-            # Add region column (default, can be enhanced with geo breakdown)
-            df['region'] = 'Saudi Arabia'
-
-            # Ensure required columns exist
-            for col in ['impressions', 'clicks', 'spend', 'conversions', 'revenue']:
-                if col not in df.columns:
-                    df[col] = 0
-
-            # Calculate derived metrics
-            df['roas'] = (df['revenue'] / df['spend']).replace([np.inf, -np.inf], 0).fillna(0)
-            df['cpa'] = (df['spend'] / df['conversions']).replace([np.inf, -np.inf], 0).fillna(0)
-            df['ctr'] = (df['clicks'] / df['impressions'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
-            df['cpc'] = (df['spend'] / df['clicks']).replace([np.inf, -np.inf], 0).fillna(0)
-            df['cpm'] = (df['spend'] / df['impressions'] * 1000).replace([np.inf, -np.inf], 0).fillna(0)
-
-            return df
-    except Exception as e:
-        st.warning(f"Could not fetch Meta API data: {e}. Using demo data.")
-
-    # Fallback to demo data
-    return _generate_demo_data()
-
-
-def _generate_demo_data() -> pd.DataFrame:
-    """Generate demo data when API is not available."""
-    now = datetime.now()
-    dates = pd.date_range(start=now - timedelta(days=90), end=now, freq="D")
-    campaigns = [
-        "FB_Furniture_SAU_Ret_001",
-        "GGL_Search_SAU_Conv_045",
-        "TT_Feed_UAE_Pros_022",
-        "META_Bedroom_KSA_Ret_089",
-        "GGL_Shopping_UAE_Conv_033",
-        "SNAP_Story_QAT_Aware_015",
-        "FB_Living_KWT_Ret_067",
-        "TT_TopView_SAU_Brand_012"
-    ]
-    rng = np.random.default_rng(42)
-
-    rows = []
-    for date in dates:
-        for campaign in campaigns:
-            # Determine platform based on campaign prefix
-            if campaign.startswith("FB") or campaign.startswith("META"):
-                platform = "Meta Ads"
-            elif campaign.startswith("GGL"):
-                platform = "Google Ads"
-            elif campaign.startswith("TT"):
-                platform = "TikTok Ads"
-            else:
-                platform = "Snapchat Ads"
-
-            # Determine region based on campaign suffix
-            if "SAU" in campaign or "KSA" in campaign:
-                region = "Saudi Arabia"
-            elif "UAE" in campaign:
-                region = "UAE"
-            elif "QAT" in campaign:
-                region = "Qatar"
-            else:
-                region = "Kuwait"
-
-            spend = rng.uniform(500, 2500)
-            impressions = int(spend * rng.uniform(800, 1200))
-            clicks = max(1, int(impressions * rng.uniform(0.015, 0.045)))
-            conversions = max(0, int(clicks * rng.uniform(0.03, 0.10)))
-            revenue = conversions * rng.uniform(150, 450)
-
-            rows.append({
-                'date': date,
-                'campaign_name': campaign,
-                'platform': platform,
-                'region': region,
-                'spend': spend,
-                'impressions': impressions,
-                'clicks': clicks,
-                'conversions': conversions,
-                'revenue': revenue
-            })
-
-    df = pd.DataFrame(rows)
-    df['roas'] = (df['revenue'] / df['spend']).replace([np.inf, -np.inf], 0).fillna(0)
-    df['cpa'] = (df['spend'] / df['conversions']).replace([np.inf, -np.inf], 0).fillna(0)
-    df['ctr'] = (df['clicks'] / df['impressions'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
-    df['cpc'] = (df['spend'] / df['clicks']).replace([np.inf, -np.inf], 0).fillna(0)
-    df['cpm'] = (df['spend'] / df['impressions'] * 1000).replace([np.inf, -np.inf], 0).fillna(0)
-    return df
-
 # =============================
 # SIDEBAR
 # =============================
@@ -227,22 +106,69 @@ def render_sidebar_filters() -> Tuple[List[str], List[str], Tuple, Optional[str]
     # Refresh button
     if st.sidebar.button("🔄 Refresh Data", use_container_width=True):
         st.cache_data.clear()
+        clear_datasets()
         st.rerun()
 
     return selected_platforms, selected_regions, date_range, selected_account_id
 
+# =============================
+# MEMOIZED VIEWS
+# =============================
+# Keyed by view_key (data source, load version + sidebar filters) plus the tab's own
+# widget values. The frame itself is passed as _df so Streamlit does not
+# hash it; only the small aggregates are cached.
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=64, show_spinner=False)
+def _platform_summary(view_key: tuple, _df: pd.DataFrame) -> pd.DataFrame:
+    """Per-platform totals and ratios shared by the overview, budget and alerts tabs."""
+    return aggregate_metrics(_df, 'platform', ['roas', 'cpa'], columns=['conversions'])
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=64, show_spinner=False)
+def _overview_data(view_key: tuple, _df: pd.DataFrame) -> Dict[str, Any]:
+    """KPI totals and chart frames for the overview tab."""
+    daily = _df.groupby('date').agg({'spend': 'sum', 'revenue': 'sum'}).reset_index()
+    top_campaigns = aggregate_metrics(_df, ['campaign_name', 'platform'], ['roas', 'cpa', 'ctr'])
+    return {
+        'totals': kpi_totals(_df, ['roas', 'cpa', 'ctr']),
+        'daily': downsample_series(daily, 'date', ['spend', 'revenue']),
+        'regions': _df.groupby('region', observed=True).agg({'spend': 'sum'}).reset_index(),
+        'top_campaigns': top_campaigns.sort_values('revenue', ascending=False).head(10),
+    }
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=64, show_spinner=False)
+def _platform_tab_data(view_key: tuple, platform: str, _df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Campaign bubbles and daily CPA for one platform."""
+    platform_df = _df[_df['platform'] == platform]
+    bubbles = top_n(aggregate_metrics(platform_df, 'campaign_name', ['cpm', 'ctr']), 'impressions')
+    daily_cpa = downsample_series(aggregate_metrics(platform_df, 'date', ['cpa']), 'date', 'cpa')
+    return bubbles, daily_cpa
+
+@st.cache_data(ttl=DATA_CACHE_TTL, max_entries=64, show_spinner=False)
+def _report_table(view_key: tuple, report_type: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """Summary table for the detailed reports tab."""
+    if report_type == "Campaign Performance Summary":
+        table = _df.groupby('campaign_name', observed=True).agg({'spend': 'sum', 'revenue': 'sum', 'conversions': 'sum', 'clicks': 'sum'})
+    elif report_type == "Platform Comparison":
+        table = aggregate_metrics(_df, 'platform', ['roas'], columns=['conversions'])
+        table = table.set_index('platform')[['spend', 'revenue', 'conversions', 'roas']]
+    elif report_type == "Regional Analysis":
+        table = _df.groupby('region', observed=True).agg({'spend': 'sum', 'revenue': 'sum', 'conversions': 'sum'})
+    else:
+        table = _df.groupby('date').agg({'spend': 'sum', 'revenue': 'sum'})
+    return table.round(2)
+
 # =============================
 # MAIN DASHBOARD
 # =============================
 
-def render_dashboard(df: pd.DataFrame, selected_platforms: List[str], selected_regions: List[str], date_range):
+def render_dashboard(index: FrameIndex, selected_platforms: List[str], selected_regions: List[str], date_range,
+                     source_key: tuple = ()):
     # Filter data
-    if isinstance(date_range, tuple) and len(date_range) == 2:
-        start_date, end_date = date_range
-        df = df[(df['date'] >= pd.Timestamp(start_date)) & (df['date'] <= pd.Timestamp(end_date))]
-
-    df = df[df['platform'].isin(selected_platforms)]
-    df = df[df['region'].isin(selected_regions)]
+    date_filter = tuple(date_range) if isinstance(date_range, tuple) and len(date_range) == 2 else None
+    df = index.filter(date=date_filter, platform=selected_platforms, region=selected_regions)
+    # index.version changes when the shared dataset reloads, so aggregates of
+    # the previous load are not served for the same source and filters
+    view_key = (source_key, index.version, date_filter, tuple(selected_platforms), tuple(selected_regions))
 
     # Header Banner
     last_updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -254,32 +180,33 @@ def render_dashboard(df: pd.DataFrame, selected_platforms: List[str], selected_r
     # Tabs
     tabs = st.tabs(["📈 Overview", "🎯 Platform Deep-Dive", "💰 Budget Optimizer", "🚨 Alerts & Insights", "📊 Detailed Reports"])
 
+    # Platform deep-dive and reports are fragments: their widgets rerun only
+    # that tab, reusing the filtered frame and view_key from the last full run
     with tabs[0]:
-        render_overview_tab(df)
+        render_overview_tab(df, view_key)
 
     with tabs[1]:
-        render_platform_tab(df)
+        render_platform_tab(df, view_key)
 
     with tabs[2]:
-        render_budget_tab(df)
+        render_budget_tab(df, view_key)
 
     with tabs[3]:
-        render_alerts_tab(df)
+        render_alerts_tab(df, view_key)
 
     with tabs[4]:
-        render_reports_tab(df)
+        render_reports_tab(df, view_key)
 
     # Footer
     render_footer()
 
-def render_overview_tab(df: pd.DataFrame):
+def render_overview_tab(df: pd.DataFrame, view_key: tuple = ()):
+    overview = _overview_data(view_key, df)
+
     # KPI Cards
-    total_spend = df['spend'].sum()
-    total_revenue = df['revenue'].sum()
-    total_roas = total_revenue / total_spend if total_spend > 0 else 0
-    total_conversions = df['conversions'].sum()
-    avg_cpa = total_spend / total_conversions if total_conversions > 0 else 0
-    avg_ctr = df['ctr'].mean()
+    totals = overview['totals']
+    total_spend, total_revenue, total_conversions = totals['spend'], totals['revenue'], totals['conversions']
+    total_roas, avg_cpa, avg_ctr = totals['roas'], totals['cpa'], totals['ctr']
 
     # KPI Row
     cols = st.columns(6)
@@ -299,13 +226,13 @@ def render_overview_tab(df: pd.DataFrame):
     st.markdown("<hr>", unsafe_allow_html=True)
 
     # Charts Row 1
+    platform_kpis = _platform_summary(view_key, df)
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown('<div class="chart-container"><h3>📊 Platform Performance Comparison</h3>', unsafe_allow_html=True)
-        platform_data = df.groupby('platform').agg({'spend': 'sum', 'revenue': 'sum'}).reset_index()
         fig = px.bar(
-            platform_data,
+            platform_kpis,
             x='platform',
             y='revenue',
             color='platform',
@@ -325,11 +252,8 @@ def render_overview_tab(df: pd.DataFrame):
 
     with col2:
         st.markdown('<div class="chart-container"><h3>🎯 ROAS by Platform</h3>', unsafe_allow_html=True)
-        platform_roas = df.groupby('platform').apply(
-            lambda x: x['revenue'].sum() / x['spend'].sum() if x['spend'].sum() > 0 else 0
-        ).to_frame(name='roas').reset_index()
         fig = px.bar(
-            platform_roas,
+            platform_kpis,
             x='platform',
             y='roas',
             color='roas',
@@ -353,7 +277,7 @@ def render_overview_tab(df: pd.DataFrame):
 
     with col1:
         st.markdown('<div class="chart-container"><h3>📈 Daily Performance Trend</h3>', unsafe_allow_html=True)
-        daily_data = df.groupby('date').agg({'spend': 'sum', 'revenue': 'sum'}).reset_index()
+        daily_data = overview['daily']
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=daily_data['date'], y=daily_data['spend'], name='Spend', line=dict(color='#1f77b4')))
         fig.add_trace(go.Scatter(x=daily_data['date'], y=daily_data['revenue'], name='Revenue', line=dict(color='#2ca02c')))
@@ -369,7 +293,7 @@ def render_overview_tab(df: pd.DataFrame):
 
     with col2:
         st.markdown('<div class="chart-container"><h3>🌍 Performance by Region</h3>', unsafe_allow_html=True)
-        region_data = df.groupby('region').agg({'spend': 'sum'}).reset_index()
+        region_data = overview['regions']
         fig = px.pie(
             region_data,
             values='spend',
@@ -388,17 +312,7 @@ def render_overview_tab(df: pd.DataFrame):
 
     # Top Campaigns Table
     st.markdown('<div class="chart-container"><h3>📋 Top Performing Campaigns</h3>', unsafe_allow_html=True)
-    top_campaigns = df.groupby(['campaign_name', 'platform']).agg({
-        'spend': 'sum',
-        'revenue': 'sum',
-        'conversions': 'sum',
-        'clicks': 'sum',
-        'impressions': 'sum'
-    }).reset_index()
-    top_campaigns['roas'] = top_campaigns['revenue'] / top_campaigns['spend']
-    top_campaigns['cpa'] = top_campaigns['spend'] / top_campaigns['conversions'].replace(0, 1)
-    top_campaigns['ctr'] = (top_campaigns['clicks'] / top_campaigns['impressions'] * 100).round(2)
-    top_campaigns = top_campaigns.sort_values('revenue', ascending=False).head(10)
+    top_campaigns = overview['top_campaigns']
 
     display_df = top_campaigns[['campaign_name', 'platform', 'spend', 'revenue', 'roas', 'cpa', 'conversions', 'ctr']].copy()
     display_df.columns = ['Campaign Name', 'Platform', 'Spend', 'Revenue', 'ROAS', 'CPA', 'Conversions', 'CTR']
@@ -411,20 +325,19 @@ def render_overview_tab(df: pd.DataFrame):
     st.dataframe(display_df, use_container_width=True, hide_index=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
-def render_platform_tab(df: pd.DataFrame):
+@st.fragment
+def render_platform_tab(df: pd.DataFrame, view_key: tuple = ()):
     st.subheader("Platform Deep-Dive Analysis")
 
-    selected_platform = st.selectbox("Select Platform", df['platform'].unique())
-    platform_df = df[df['platform'] == selected_platform]
+    selected_platform = st.selectbox("Select Platform", _platform_summary(view_key, df)['platform'])
+    bubbles, daily_cpa = _platform_tab_data(view_key, selected_platform, df)
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown('<div class="chart-container"><h3>CTR vs CPM Analysis</h3>', unsafe_allow_html=True)
         fig = px.scatter(
-            platform_df.groupby('campaign_name').agg({
-                'cpm': 'mean', 'ctr': 'mean', 'impressions': 'sum'
-            }).reset_index(),
+            bubbles,
             x='cpm',
             y='ctr',
             size='impressions',
@@ -442,9 +355,6 @@ def render_platform_tab(df: pd.DataFrame):
 
     with col2:
         st.markdown('<div class="chart-container"><h3>CPA Trend</h3>', unsafe_allow_html=True)
-        daily_cpa = platform_df.groupby('date').apply(
-            lambda x: x['spend'].sum() / x['conversions'].sum() if x['conversions'].sum() > 0 else 0
-        ).to_frame(name='cpa').reset_index()
         fig = px.line(daily_cpa, x='date', y='cpa', template=PLOTLY_TEMPLATE)
         fig.update_traces(line_color='#1f77b4')
         fig.update_layout(
@@ -455,33 +365,27 @@ def render_platform_tab(df: pd.DataFrame):
         st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
         st.markdown('</div>', unsafe_allow_html=True)
 
-def render_budget_tab(df: pd.DataFrame):
+def render_budget_tab(df: pd.DataFrame, view_key: tuple = ()):
     st.subheader("Budget Optimizer")
     st.info("💡 Budget optimization recommendations based on current performance")
 
-    platform_perf = df.groupby('platform').agg({
-        'spend': 'sum',
-        'revenue': 'sum',
-        'conversions': 'sum'
-    }).reset_index()
-    platform_perf['roas'] = platform_perf['revenue'] / platform_perf['spend']
+    platform_perf = _platform_summary(view_key, df)[['platform', 'spend', 'revenue', 'conversions', 'roas']]
     platform_perf['recommendation'] = platform_perf['roas'].apply(
         lambda x: "🟢 Scale Up 30%" if x > 2.5 else ("🟡 Maintain" if x > 1.5 else "🔴 Reduce 20%")
     )
 
     st.dataframe(platform_perf, use_container_width=True, hide_index=True)
 
-def render_alerts_tab(df: pd.DataFrame):
+def render_alerts_tab(df: pd.DataFrame, view_key: tuple = ()):
     st.subheader("🚨 Recent Alerts")
 
     # Calculate alerts
-    platform_roas = df.groupby('platform').apply(
-        lambda x: x['revenue'].sum() / x['spend'].sum() if x['spend'].sum() > 0 else 0
-    )
+    platform_summary = _platform_summary(view_key, df)
+    platform_roas = platform_summary.set_index('platform')['roas']
     high_performers = platform_roas[platform_roas > 2.5]
     low_performers = platform_roas[platform_roas < 1.5]
 
-    avg_cpa = df['spend'].sum() / df['conversions'].sum() if df['conversions'].sum() > 0 else 0
+    avg_cpa = kpi_totals(platform_summary, ['cpa'])['cpa']
 
     # Good alerts
     if len(high_performers) > 0:
@@ -509,7 +413,8 @@ def render_alerts_tab(df: pd.DataFrame):
             "Pause lowest performers immediately"
         )
 
-def render_reports_tab(df: pd.DataFrame):
+@st.fragment
+def render_reports_tab(df: pd.DataFrame, view_key: tuple = ()):
     st.subheader("📊 Detailed Reports")
 
     report_type = st.selectbox("Select Report Type", [
@@ -519,31 +424,7 @@ def render_reports_tab(df: pd.DataFrame):
         "Daily Trends"
     ])
 
-    if report_type == "Campaign Performance Summary":
-        st.dataframe(df.groupby('campaign_name').agg({
-            'spend': 'sum',
-            'revenue': 'sum',
-            'conversions': 'sum',
-            'clicks': 'sum'
-        }).round(2), use_container_width=True)
-    elif report_type == "Platform Comparison":
-        st.dataframe(df.groupby('platform').agg({
-            'spend': 'sum',
-            'revenue': 'sum',
-            'conversions': 'sum',
-            'roas': 'mean'
-        }).round(2), use_container_width=True)
-    elif report_type == "Regional Analysis":
-        st.dataframe(df.groupby('region').agg({
-            'spend': 'sum',
-            'revenue': 'sum',
-            'conversions': 'sum'
-        }).round(2), use_container_width=True)
-    else:
-        st.dataframe(df.groupby('date').agg({
-            'spend': 'sum',
-            'revenue': 'sum'
-        }).round(2), use_container_width=True)
+    st.dataframe(_report_table(view_key, report_type, df), use_container_width=True)
 
 # =============================
 # AUTHENTICATION
@@ -610,9 +491,11 @@ def main():
             start_date = date_range[0].strftime('%Y-%m-%d')
             end_date = date_range[1].strftime('%Y-%m-%d')
 
-        df = load_campaign_data(start_date, end_date, selected_account_id)
+        index = get_dataset_index('dashboard_campaign_daily', start_date=start_date, end_date=end_date,
+                                  account_id=selected_account_id)
 
-    render_dashboard(df, selected_platforms, selected_regions, date_range)
+    render_dashboard(index, selected_platforms, selected_regions, date_range,
+                     source_key=(start_date, end_date, selected_account_id))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,296 @@
+# database/columnar_store.py
+# Optional Parquet mirror of the performance tables for fast analytical reads
+
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import uuid
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+import pandas as pd
+
+import config
+from database.connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Try to import pyarrow (optional dependency)
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.info("pyarrow not installed. Columnar store disabled.")
+
+# ============================================================================
+# MIRRORED TABLES
+# ============================================================================
+
+# SQLite source query for each mirrored table. Every query must return
+# report_date and platform; daily_performance and performance_by_segment get
+# platform from campaigns. {where} is replaced by the month filter.
+MIRRORED_TABLES: Dict[str, str] = {
+    'daily_performance': (
+        "SELECT dp.report_date, c.platform, dp.ad_id, dp.campaign_id, dp.impressions, dp.reach, "
+        "dp.frequency, dp.clicks, dp.spend, dp.video_views, dp.add_to_carts, dp.conversions, dp.revenue "
+        "FROM daily_performance dp JOIN campaigns c ON dp.campaign_id = c.campaign_id {where}"
+    ),
+    'performance_by_segment': (
+        "SELECT ps.report_date, c.platform, ps.ad_id, ps.campaign_id, ps.segment_type, ps.segment_value, "
+        "ps.impressions, ps.clicks, ps.spend, ps.conversions, ps.revenue "
+        "FROM performance_by_segment ps JOIN campaigns c ON ps.campaign_id = c.campaign_id {where}"
+    ),
+    'performance_by_country': (
+        "SELECT pc.report_date, pc.platform, pc.country, pc.impressions, pc.clicks, pc.spend, "
+        "pc.conversions, pc.revenue FROM performance_by_country pc {where}"
+    ),
+}
+
+_TABLE_ALIASES = {'daily_performance': 'dp', 'performance_by_segment': 'ps', 'performance_by_country': 'pc'}
+
+# Written into a table's directory once rebuild() has mirrored every month;
+# dataset discovery skips '_'-prefixed files, so readers never list it
+BUILT_MARKER = '_BUILT'
+
+
+def is_enabled() -> bool:
+    """The mirror is used only when switched on in config and pyarrow is installed."""
+    return config.COLUMNAR_STORE_ENABLED and PYARROW_AVAILABLE
+
+
+def _month(value) -> str:
+    return str(value)[:7]
+
+
+class ColumnarStore:
+    """
+    Parquet mirror of the performance tables, hive-partitioned as
+    <root>/<table>/month=YYYY-MM/platform=<platform>/part-0.parquet.
+
+    SQLite stays the source of truth: partitions are rebuilt from it, so a
+    sync is idempotent and can be re-run at any time. Rebuilt files are
+    written to a hidden staging directory and swapped in with os.replace, so
+    a concurrent reader sees either the old or the new partition, never a
+    missing or half-written one.
+
+    A table is readable only after a full rebuild() (has_table). Until then
+    sync_dates rebuilds it whole rather than just the ingested months, and
+    readers stay on SQLite, so switching the mirror on for an existing
+    database never hides the months written before it.
+    """
+
+    def __init__(self, root: str = None, db_path: str = None):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the columnar store")
+        self.root = root or config.COLUMNAR_STORE_PATH
+        self.db_path = db_path or config.DB_PATH
+        self._partitioning = ds.partitioning(
+            pa.schema([('month', pa.string()), ('platform', pa.string())]),
+            flavor='hive',
+        )
+
+    def _table_dir(self, table: str) -> str:
+        if table not in MIRRORED_TABLES:
+            raise ValueError(f"Table '{table}' is not mirrored")
+        return os.path.join(self.root, table)
+
+    def _month_dir(self, table: str, month: str) -> str:
+        return os.path.join(self._table_dir(table), f"month={quote(month, safe='')}")
+
+    def _partition_dir(self, table: str, month: str, platform: str) -> str:
+        return os.path.join(self._month_dir(table, month), f"platform={quote(str(platform), safe='')}")
+
+    # ========================================================================
+    # WRITE PATH
+    # ========================================================================
+
+    def sync_months(self, table: str, months: List[str], conn: sqlite3.Connection = None) -> int:
+        """
+        Rebuild every platform partition of `table` for the given months.
+
+        Args:
+            table: One of MIRRORED_TABLES
+            months: Months to rebuild ('YYYY-MM')
+            conn: Optional open connection to the source database
+
+        Returns:
+            Number of rows written
+        """
+        own_conn = conn is None
+        conn = conn or get_connection(self.db_path)
+        alias = _TABLE_ALIASES[table]
+        written = 0
+        try:
+            for month in sorted(set(_month(m) for m in months)):
+                query = MIRRORED_TABLES[table].format(where=f"WHERE substr({alias}.report_date, 1, 7) = ?")
+                df = pd.read_sql_query(query, conn, params=[month])
+                written += self._replace_month(table, month, df)
+        finally:
+            if own_conn:
+                conn.close()
+
+        logger.info(f"Columnar store: synced {written} {table} rows for {len(set(months))} month(s)")
+        return written
+
+    def _replace_month(self, table: str, month: str, df: pd.DataFrame) -> int:
+        """Swap in the platform partitions of one month, then drop platforms it no longer has."""
+        month_dir = self._month_dir(table, month)
+        # Staged beside the table directories (same filesystem, so os.replace is
+        # atomic) rather than inside one, where dataset discovery would list it
+        staging = os.path.join(self.root, f".staging-{table}-{uuid.uuid4().hex}")
+        platform_dirs, written = set(), 0
+        try:
+            for platform, part in df.groupby('platform', sort=False):
+                name = os.path.basename(self._partition_dir(table, month, platform))
+                os.makedirs(os.path.join(staging, name))
+                arrow_table = pa.Table.from_pandas(
+                    part.drop(columns=['platform']).sort_values('report_date'),
+                    preserve_index=False,
+                )
+                pq.write_table(arrow_table, os.path.join(staging, name, 'part-0.parquet'))
+                platform_dirs.add(name)
+                written += len(part)
+
+            for name in platform_dirs:
+                os.makedirs(os.path.join(month_dir, name), exist_ok=True)
+                os.replace(os.path.join(staging, name, 'part-0.parquet'), os.path.join(month_dir, name, 'part-0.parquet'))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        if os.path.isdir(month_dir):
+            for name in os.listdir(month_dir):
+                if name not in platform_dirs:
+                    shutil.rmtree(os.path.join(month_dir, name), ignore_errors=True)
+            if not platform_dirs:
+                shutil.rmtree(month_dir, ignore_errors=True)
+        return written
+
+    def sync_dates(self, dates: List[str], conn: sqlite3.Connection = None) -> Dict[str, int]:
+        """Rebuild the months touched by `dates` for every mirrored table (all months of a table not yet built)."""
+        months = sorted(set(_month(d) for d in dates))
+        results = {}
+        for table in MIRRORED_TABLES:
+            if self.has_table(table):
+                results[table] = self.sync_months(table, months, conn)
+            else:
+                results.update(self.rebuild([table], conn))
+        return results
+
+    def rebuild(self, tables: List[str] = None, conn: sqlite3.Connection = None) -> Dict[str, int]:
+        """Rebuild the whole mirror (or the given tables) from SQLite."""
+        own_conn = conn is None
+        conn = conn or get_connection(self.db_path)
+        results = {}
+        try:
+            for table in tables or list(MIRRORED_TABLES):
+                table_dir = self._table_dir(table)
+                months = [r[0] for r in conn.execute(
+                    f"SELECT DISTINCT substr(report_date, 1, 7) FROM {table} ORDER BY 1"
+                ).fetchall()]
+                results[table] = self.sync_months(table, months, conn)
+                # Months no longer in SQLite are dropped after the live ones are rebuilt
+                live = {os.path.basename(self._month_dir(table, m)) for m in months}
+                os.makedirs(table_dir, exist_ok=True)
+                for name in os.listdir(table_dir):
+                    if name.startswith('month=') and name not in live:
+                        shutil.rmtree(os.path.join(table_dir, name), ignore_errors=True)
+                open(os.path.join(table_dir, BUILT_MARKER), 'w').close()
+                logger.info(f"Columnar store: {table} fully mirrored ({len(months)} month(s))")
+        finally:
+            if own_conn:
+                conn.close()
+        return results
+
+    # ========================================================================
+    # READ PATH
+    # ========================================================================
+
+    def has_table(self, table: str) -> bool:
+        """True once rebuild() has mirrored every month of `table`; partial syncs before that do not count."""
+        return os.path.isfile(os.path.join(self._table_dir(table), BUILT_MARKER))
+
+    def read(
+        self,
+        table: str,
+        start_date: str = None,
+        end_date: str = None,
+        platforms: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read a mirrored table with filters pushed down to the Parquet scan.
+
+        Month and platform filters prune whole partition directories; the
+        report_date filter is applied to row-group statistics. Only the
+        requested columns are decoded.
+
+        Args:
+            table: One of MIRRORED_TABLES
+            start_date: Inclusive start date (YYYY-MM-DD)
+            end_date: Inclusive end date (YYYY-MM-DD)
+            platforms: Platforms to include (all if None/empty)
+            columns: Columns to load (all if None); may include 'platform'
+
+        Returns:
+            DataFrame of matching rows
+        """
+        if not self.has_table(table):
+            return pd.DataFrame(columns=columns or [])
+
+        dataset = ds.dataset(self._table_dir(table), format='parquet', partitioning=self._partitioning)
+        if not dataset.files:
+            # Built from an empty SQLite table
+            return pd.DataFrame(columns=columns or [])
+
+        conditions = []
+        if start_date:
+            conditions.append(ds.field('month') >= _month(start_date))
+            conditions.append(ds.field('report_date') >= str(start_date))
+        if end_date:
+            conditions.append(ds.field('month') <= _month(end_date))
+            conditions.append(ds.field('report_date') <= str(end_date))
+        if platforms:
+            conditions.append(ds.field('platform').isin(list(platforms)))
+
+        row_filter = None
+        for condition in conditions:
+            row_filter = condition if row_filter is None else row_filter & condition
+
+        if columns is None:
+            columns = [name for name in dataset.schema.names if name != 'month']
+
+        return dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+
+
+def sync_after_ingest(dates: List[str], conn: sqlite3.Connection = None) -> None:
+    """
+    Refresh the mirror for freshly ingested dates. A no-op when the store is
+    disabled; failures are logged so the mirror never blocks ingestion.
+    """
+    if not is_enabled():
+        return
+    try:
+        ColumnarStore().sync_dates(dates, conn)
+    except Exception as e:
+        logger.error(f"Columnar store sync failed for {dates}: {e}")
+
+
+if __name__ == '__main__':
+    # python -m database.columnar_store rebuild [table ...]
+    if sys.argv[1:2] != ['rebuild']:
+        print("Usage: python -m database.columnar_store rebuild [table ...]")
+        sys.exit(2)
+    if not PYARROW_AVAILABLE:
+        print("pyarrow is not installed; the columnar store is unavailable")
+        sys.exit(1)
+    store = ColumnarStore()
+    if not os.path.isfile(store.db_path):
+        print(f"Database {store.db_path} not found")
+        sys.exit(1)
+    for table, rows in store.rebuild(sys.argv[2:] or None).items():
+        print(f"✅ {table}: {rows:,} rows mirrored to {store._table_dir(table)}")
@@ -0,0 +1,158 @@
+# database/connection.py
+# Shared SQLite connection management: one tuned connection per thread and
+# database file, reused across calls instead of reconnecting every query
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+# Per-connection settings applied when a pooled connection is opened.
+# WAL lets readers (every Streamlit session) keep reading while an ingest
+# writes; synchronous=NORMAL is durable across app crashes in WAL mode and
+# only fsyncs at checkpoints.
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -config.SQLITE_CACHE_SIZE_KB,   # negative = KiB, not pages
+    'mmap_size': config.SQLITE_MMAP_SIZE,
+    'busy_timeout': config.SQLITE_BUSY_TIMEOUT_MS,
+    'temp_store': 'MEMORY',
+}
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3 connection owned by a thread-local pool.
+
+    close() hands the connection back instead of closing it: once the last
+    caller holding it has released it, any uncommitted transaction is rolled
+    back, exactly as a real close would do. Nested get_connection() calls on
+    the same thread share the connection, so an inner close() never discards
+    an outer caller's open transaction.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._checkouts = 0
+        self._inode = None
+
+    def close(self) -> None:
+        if self._checkouts > 0:
+            self._checkouts -= 1
+        if self._checkouts == 0 and self.in_transaction:
+            self.rollback()
+
+    def release(self) -> None:
+        """Really close the underlying connection."""
+        super().close()
+
+
+def _pool() -> Dict[str, PooledConnection]:
+    if not hasattr(_local, 'connections'):
+        _local.connections = {}
+    return _local.connections
+
+
+def _pool_key(db_path: str) -> str:
+    if db_path == ':memory:' or db_path.startswith('file:'):
+        return db_path
+    return os.path.abspath(db_path)
+
+
+def _inode(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_ino
+    except OSError:
+        return None
+
+
+def apply_pragmas(conn: sqlite3.Connection) -> None:
+    """Apply the shared performance profile to an open connection."""
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def get_connection(db_path: Optional[str] = None) -> PooledConnection:
+    """
+    Connection to `db_path` (default config.DB_PATH) from this thread's pool.
+
+    The first call on a thread opens and tunes the connection; later calls
+    return the same one. Callers keep using the plain sqlite3 API, including
+    close(), which releases rather than closes. If the database file was
+    deleted or replaced since the connection was opened, a fresh one is made.
+
+    Args:
+        db_path: SQLite database file
+
+    Returns:
+        Open sqlite3 connection (thread-bound)
+    """
+    key = _pool_key(db_path or config.DB_PATH)
+    pool = _pool()
+    conn = pool.get(key)
+
+    if conn is not None and key != ':memory:' and conn._inode != _inode(key):
+        logger.info(f"Database file {key} changed on disk; reopening pooled connection")
+        pool.pop(key).release()
+        conn = None
+
+    if conn is None:
+        conn = sqlite3.connect(
+            key,
+            timeout=config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            factory=PooledConnection,
+            uri=key.startswith('file:'),
+        )
+        try:
+            apply_pragmas(conn)
+        except sqlite3.DatabaseError as e:
+            # e.g. WAL unavailable on network filesystems; keep the defaults
+            logger.warning(f"Could not apply SQLite pragmas to {key}: {e}")
+        conn._inode = _inode(key)
+        pool[key] = conn
+
+    conn._checkouts += 1
+    return conn
+
+
+def close_thread_connections() -> int:
+    """Really close every pooled connection owned by the calling thread."""
+    pool = _pool()
+    count = len(pool)
+    for conn in pool.values():
+        conn.release()
+    pool.clear()
+    return count
+
+
+# Files SQLite keeps beside the database: the WAL, its shared-memory index
+# and the rollback journal
+SIDECAR_SUFFIXES = ('-wal', '-shm', '-journal')
+
+
+def remove_database(db_path: Optional[str] = None) -> bool:
+    """
+    Delete a database file together with its -wal/-shm/-journal sidecars.
+
+    In WAL mode committed pages can still live in the -wal file; left behind,
+    SQLite would replay them into a new database created at the same path.
+    This thread's pooled connections are closed first.
+
+    Returns:
+        True if the database file existed
+    """
+    path = db_path or config.DB_PATH
+    close_thread_connections()
+    existed = os.path.exists(path)
+    for suffix in ('',) + SIDECAR_SUFFIXES:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return existed
@@ -7,6 +7,9 @@ import bcrypt
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # --- END OF FIX ---
 from config import DB_PATH
+from database.connection import get_connection, remove_database
+from database.indexes import ensure_indexes
+from database.rollups import ensure_rollup_tables
 
 SCHEMA_FILE = 'schema.sql'
 
@@ -25,15 +28,17 @@ def create_database():
         print(f"❌ Schema file not found at: {schema_path}")
         return
     
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection(DB_PATH)
     with open(schema_path, 'r') as f:
         conn.executescript(f.read())
+    ensure_rollup_tables(conn)
+    ensure_indexes(conn)
     conn.close()
     print("✅ Tables created or verified successfully.")
 
 def populate_sample_data():
     """Populates the database with all sample data, including a correctly hashed admin user."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection(DB_PATH)
     cursor = conn.cursor()
     
     # (Keep all existing data for campaigns, ads, budgets, etc.)
@@ -117,8 +122,7 @@ def populate_sample_data():
         conn.close()
 
 if __name__ == '__main__':
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH)
+    if remove_database(DB_PATH):
         print("🗑️  Removed existing database")
     
     print("🚀 Setting up the database...")
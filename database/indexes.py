@@ -0,0 +1,192 @@
+# database/indexes.py
+# Covering indexes for the dashboard's hot analytical queries, plus an
+# EXPLAIN QUERY PLAN check that every hot query, as built by the module that
+# issues it, avoids full scans.
+#
+# USAGE (exits non-zero if a hot query scans a fact table):
+#     python database/indexes.py furniture.db
+
+import logging
+import os
+import re
+import sqlite3
+import sys
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Each index leads with the column the queries filter on and carries the
+# columns they read, so SQLite answers from the index b-tree alone.
+INDEXES = [
+    {
+        # Date-window reads: rollup refresh, anomaly detection, creative analysis
+        'name': 'idx_dp_date_cover',
+        'table': 'daily_performance',
+        'columns': ['report_date', 'campaign_id', 'ad_id', 'impressions', 'clicks', 'spend', 'conversions', 'revenue'],
+    },
+    {
+        # fetch_performance_data (joined from campaigns, then report_date BETWEEN)
+        # and get_budget_pacing (WHERE campaign_id = ?)
+        'name': 'idx_dp_campaign_cover',
+        'table': 'daily_performance',
+        'columns': ['campaign_id', 'report_date', 'impressions', 'clicks', 'spend', 'conversions', 'revenue'],
+    },
+    {
+        # get_ab_test_results (joined from ads by ad_id)
+        'name': 'idx_dp_ad_cover',
+        'table': 'daily_performance',
+        'columns': ['ad_id', 'report_date', 'impressions', 'clicks', 'spend'],
+    },
+    {
+        # fetch_data_by_segment (segment_type = ? AND report_date BETWEEN)
+        'name': 'idx_seg_type_date_cover',
+        'table': 'performance_by_segment',
+        'columns': ['segment_type', 'report_date', 'campaign_id', 'segment_value',
+                    'impressions', 'clicks', 'spend', 'conversions', 'revenue'],
+    },
+    {
+        # fetch_benchmark_data (report_date BETWEEN, platform/country filters)
+        'name': 'idx_country_date_cover',
+        'table': 'performance_by_country',
+        'columns': ['report_date', 'platform', 'country', 'impressions', 'clicks', 'spend', 'conversions', 'revenue'],
+    },
+    {
+        # get_ab_test_results (WHERE a.test_id = ?)
+        'name': 'idx_ads_test_id',
+        'table': 'ads',
+        'columns': ['test_id', 'ad_id', 'ad_name'],
+    },
+]
+
+# Large tables that must never be read with a full scan by a hot query
+FACT_TABLES = {'daily_performance', 'performance_by_segment', 'performance_by_country'}
+
+# Sample parameters the hot queries are planned with
+_PLAN_START, _PLAN_END = '2025-01-01', '2025-01-31'
+
+
+def hot_queries() -> Dict[str, Tuple[str, list]]:
+    """
+    The hot queries exactly as their owning functions build them.
+
+    The SQL is imported from the modules that issue it, so the plan check
+    follows any change to those queries. Imported lazily: the analysis
+    modules import the database package themselves.
+    """
+    from app.analysis_modules.ab_test_analysis import AB_DAILY_QUERY, AB_TOTALS_QUERY
+    from app.analysis_modules.benchmarking_analysis import benchmark_query
+    from app.analysis_modules.budget_analysis import SPEND_QUERY
+    from app.analysis_modules.campaign_performance import performance_query
+    from app.analysis_modules.creative_analysis import CREATIVE_QUERY
+    from app.analysis_modules.segmentation_analysis import SEGMENT_QUERY
+    from database.rollups import aggregate_query, refresh_source_query
+    from scripts.anomaly_detector import ANOMALY_QUERY
+
+    return {
+        'fetch_performance_data': performance_query(_PLAN_START, _PLAN_END, [], []),
+        'fetch_performance_data (platform filter)': performance_query(_PLAN_START, _PLAN_END, ['Meta'], []),
+        'fetch_data_by_segment': (SEGMENT_QUERY, [_PLAN_START, _PLAN_END, 'Meta', 'Age']),
+        'fetch_benchmark_data': benchmark_query(_PLAN_START, _PLAN_END, [], ['Meta']),
+        'fetch_creative_performance': (CREATIVE_QUERY, [_PLAN_START, _PLAN_END]),
+        'get_budget_pacing': (SPEND_QUERY, ['META_C01']),
+        'get_ab_test_results': (AB_TOTALS_QUERY, ['TEST01']),
+        'get_ab_test_results (daily)': (AB_DAILY_QUERY, ['TEST01']),
+        'run_anomaly_detection': (ANOMALY_QUERY, [_PLAN_START]),
+        'refresh_rollups': refresh_source_query([_PLAN_START, _PLAN_END]),
+        'rollups.aggregate (by ad)': aggregate_query(['spend', 'revenue'], ['ad_id'], _PLAN_START, _PLAN_END),
+    }
+
+
+def _existing_tables(conn: sqlite3.Connection) -> set:
+    return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def ensure_indexes(conn: sqlite3.Connection) -> List[str]:
+    """
+    Create any missing hot-path index whose table exists.
+
+    Returns:
+        Names of the indexes that were created
+    """
+    tables = _existing_tables(conn)
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    created = []
+    for index in INDEXES:
+        if index['table'] not in tables or index['name'] in existing:
+            continue
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index['name']} ON {index['table']}({', '.join(index['columns'])})")
+        created.append(index['name'])
+    if created:
+        # Refresh planner statistics so the new indexes are actually chosen
+        conn.execute("ANALYZE")
+        logger.info(f"Created indexes: {', '.join(created)}")
+    conn.commit()
+    return created
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, params=()) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines for a query."""
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+
+_SQL_KEYWORDS = {'WHERE', 'JOIN', 'ON', 'LEFT', 'INNER', 'GROUP', 'ORDER', 'LIMIT'}
+
+
+def _table_aliases(sql: str) -> Dict[str, str]:
+    """Map every table name and alias in FROM/JOIN clauses to its table."""
+    aliases = {}
+    for table, alias in re.findall(r'(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', sql, re.IGNORECASE):
+        aliases[table] = table
+        if alias and alias.upper() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def full_scans(plan: List[str], sql: str) -> List[str]:
+    """
+    Plan lines that walk a whole fact table.
+
+    Scans of a full covering index count too: they avoid table lookups but
+    still read every row. Small dimension tables may be scanned.
+    """
+    aliases = _table_aliases(sql)
+    scans = []
+    for line in plan:
+        # 'SCAN dp ...' (SQLite >= 3.36) or 'SCAN TABLE daily_performance AS dp ...'
+        match = re.match(r'SCAN (?:TABLE )?(\w+)', line)
+        if match and aliases.get(match.group(1), match.group(1)) in FACT_TABLES:
+            scans.append(line)
+    return scans
+
+
+def verify_query_plans(conn: sqlite3.Connection) -> Dict[str, List[str]]:
+    """
+    Run EXPLAIN QUERY PLAN over every hot query.
+
+    Returns:
+        Mapping of query name to its full-scan plan lines (empty when the
+        query is fully index-driven). Queries on missing tables are skipped.
+    """
+    results = {}
+    for name, (sql, params) in hot_queries().items():
+        try:
+            results[name] = full_scans(query_plan(conn, sql, params), sql)
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Skipping plan check for {name}: {e}")
+    return results
+
+
+if __name__ == '__main__':
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from database.connection import get_connection
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else 'furniture.db'
+    conn = get_connection(db_path)
+    ensure_indexes(conn)
+    failures = 0
+    for name, scans in verify_query_plans(conn).items():
+        status = '✅' if not scans else '❌'
+        print(f"{status} {name}" + ''.join(f"\n     {line}" for line in scans))
+        failures += bool(scans)
+    conn.close()
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,349 @@
+# database/rollups.py
+# Pre-aggregated rollups of daily_performance and a router that answers
+# aggregate queries from the coarsest rollup able to serve them
+
+import logging
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Additive daily_performance columns carried by every rollup
+ROLLUP_METRICS = [
+    'impressions', 'reach', 'clicks', 'spend', 'video_views',
+    'add_to_carts', 'conversions', 'revenue',
+]
+
+# SQLite caps bound parameters per statement; refresh dates in batches
+_PARAM_BATCH = 500
+
+_METRIC_COLUMNS_DDL = ',\n'.join(f'    {m} {"REAL" if m in ("spend", "revenue") else "INTEGER"}' for m in ROLLUP_METRICS)
+_SUMS = ', '.join(f'SUM({m})' for m in ROLLUP_METRICS)
+
+ROLLUP_DDL = [
+    f"""CREATE TABLE IF NOT EXISTS rollup_daily_campaign (
+    report_date TEXT NOT NULL,
+    campaign_id TEXT NOT NULL,
+    platform TEXT,
+{_METRIC_COLUMNS_DDL},
+    row_count INTEGER,
+    PRIMARY KEY (report_date, campaign_id)
+)""",
+    f"""CREATE TABLE IF NOT EXISTS rollup_daily_platform (
+    report_date TEXT NOT NULL,
+    platform TEXT,
+{_METRIC_COLUMNS_DDL},
+    row_count INTEGER,
+    PRIMARY KEY (report_date, platform)
+)""",
+    f"""CREATE TABLE IF NOT EXISTS rollup_monthly (
+    month TEXT NOT NULL,
+    campaign_id TEXT NOT NULL,
+    platform TEXT,
+{_METRIC_COLUMNS_DDL},
+    row_count INTEGER,
+    PRIMARY KEY (month, campaign_id)
+)""",
+]
+
+# ============================================================================
+# ROUTER CATALOG
+# ============================================================================
+
+# Candidate sources, coarsest first. 'dims' maps each dimension the source
+# can group or filter by to its SQL expression; 'grain' says whether date
+# filters must align to whole months.
+SOURCES = [
+    {
+        'table': 'rollup_monthly',
+        'grain': 'month',
+        'dims': {'month': 'r.month', 'platform': 'r.platform', 'campaign_id': 'r.campaign_id'},
+    },
+    {
+        'table': 'rollup_daily_platform',
+        'grain': 'day',
+        'dims': {'report_date': 'r.report_date', 'month': 'substr(r.report_date, 1, 7)', 'platform': 'r.platform'},
+    },
+    {
+        'table': 'rollup_daily_campaign',
+        'grain': 'day',
+        'dims': {
+            'report_date': 'r.report_date', 'month': 'substr(r.report_date, 1, 7)',
+            'platform': 'r.platform', 'campaign_id': 'r.campaign_id',
+        },
+    },
+    {
+        'table': 'daily_performance',
+        'grain': 'day',
+        'dims': {
+            'report_date': 'r.report_date', 'month': 'substr(r.report_date, 1, 7)',
+            'platform': 'pc.platform', 'campaign_id': 'r.campaign_id', 'ad_id': 'r.ad_id',
+        },
+    },
+]
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def _is_month_start(value) -> bool:
+    return _to_date(value).day == 1
+
+
+def _is_month_end(value) -> bool:
+    return (_to_date(value) + timedelta(days=1)).day == 1
+
+
+def _batches(values: Sequence, size: int = _PARAM_BATCH):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+# ============================================================================
+# MAINTENANCE
+# ============================================================================
+
+def ensure_rollup_tables(conn: sqlite3.Connection) -> None:
+    """Create the rollup tables and backfill them if the raw table already has rows."""
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if 'daily_performance' not in existing:
+        return
+    for ddl in ROLLUP_DDL:
+        conn.execute(ddl)
+    conn.commit()
+
+    empty = conn.execute("SELECT 1 FROM rollup_daily_campaign LIMIT 1").fetchone() is None
+    has_raw = conn.execute("SELECT 1 FROM daily_performance LIMIT 1").fetchone() is not None
+    if empty and has_raw:
+        rebuild_rollups(conn)
+
+
+def rollups_available(conn: sqlite3.Connection) -> bool:
+    """True when all rollup tables exist."""
+    names = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'rollup_%'"
+    )]
+    return {s['table'] for s in SOURCES if s['table'].startswith('rollup_')} <= set(names)
+
+
+def refresh_source_query(days: Sequence[str]) -> Tuple[str, list]:
+    """SELECT over daily_performance that rebuilds rollup_daily_campaign rows for the given days."""
+    marks = ','.join('?' * len(days))
+    query = f"""
+            SELECT dp.report_date, dp.campaign_id, MAX(c.platform), {_SUMS.replace('SUM(', 'SUM(dp.')}, COUNT(*)
+            FROM daily_performance dp LEFT JOIN campaigns c ON dp.campaign_id = c.campaign_id
+            WHERE dp.report_date IN ({marks})
+            GROUP BY dp.report_date, dp.campaign_id
+        """
+    return query, list(days)
+
+
+def refresh_rollups(conn: sqlite3.Connection, report_dates: Iterable) -> int:
+    """
+    Recompute rollup rows for the given report dates (and their months).
+
+    Only the touched days are re-aggregated from daily_performance; the
+    platform and monthly rollups are then derived from the daily campaign
+    rollup. Runs inside the caller's transaction, so the caller commits.
+
+    Args:
+        conn: Open connection to the database
+        report_dates: Dates whose raw rows were inserted, replaced or deleted
+
+    Returns:
+        Number of distinct days refreshed
+    """
+    days = sorted({str(_to_date(d)) for d in report_dates if d is not None and str(d) != ''})
+    if not days or not rollups_available(conn):
+        return 0
+
+    for batch in _batches(days):
+        marks = ','.join('?' * len(batch))
+        conn.execute(f"DELETE FROM rollup_daily_campaign WHERE report_date IN ({marks})", batch)
+        source_query, params = refresh_source_query(batch)
+        conn.execute(f"INSERT INTO rollup_daily_campaign {source_query}", params)
+        conn.execute(f"DELETE FROM rollup_daily_platform WHERE report_date IN ({marks})", batch)
+        conn.execute(f"""
+            INSERT INTO rollup_daily_platform
+            SELECT report_date, platform, {_SUMS}, SUM(row_count)
+            FROM rollup_daily_campaign
+            WHERE report_date IN ({marks})
+            GROUP BY report_date, platform
+        """, batch)
+
+    for month in sorted({d[:7] for d in days}):
+        conn.execute("DELETE FROM rollup_monthly WHERE month = ?", (month,))
+        conn.execute(f"""
+            INSERT INTO rollup_monthly
+            SELECT ?, campaign_id, MAX(platform), {_SUMS}, SUM(row_count)
+            FROM rollup_daily_campaign
+            WHERE report_date BETWEEN ? AND ?
+            GROUP BY campaign_id
+        """, (month, f'{month}-01', f'{month}-31'))
+
+    logger.info(f"Refreshed rollups for {len(days)} day(s)")
+    return len(days)
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> int:
+    """Recompute every rollup from scratch."""
+    for table in ('rollup_daily_campaign', 'rollup_daily_platform', 'rollup_monthly'):
+        conn.execute(f"DELETE FROM {table}")
+    days = [r[0] for r in conn.execute("SELECT DISTINCT report_date FROM daily_performance")]
+    refreshed = refresh_rollups(conn, days)
+    conn.commit()
+    return refreshed
+
+
+# ============================================================================
+# QUERY ROUTER
+# ============================================================================
+
+def choose_source(
+    group_by: Sequence[str] = (),
+    start_date=None,
+    end_date=None,
+    platforms: Optional[List[str]] = None,
+    campaign_ids: Optional[List[str]] = None,
+    use_rollups: bool = True,
+) -> Dict:
+    """
+    Pick the coarsest source that has every dimension needed by the query.
+
+    campaign_name is resolved through campaign_id. Month-grain rollups are
+    only used when the date range covers whole months.
+    """
+    needed = {'campaign_id' if d == 'campaign_name' else d for d in group_by}
+    if start_date or end_date:
+        needed.add('report_date')
+    if platforms:
+        needed.add('platform')
+    if campaign_ids:
+        needed.add('campaign_id')
+
+    for source in SOURCES:
+        if not use_rollups and source['table'].startswith('rollup_'):
+            continue
+        dims = set(source['dims'])
+        if source['grain'] == 'month' and 'report_date' in needed:
+            aligned = (not start_date or _is_month_start(start_date)) and (not end_date or _is_month_end(end_date))
+            if not aligned or 'report_date' in group_by:
+                continue
+            dims.add('report_date')
+        if needed <= dims:
+            return source
+    raise ValueError(f"No source can group by {sorted(needed)}")
+
+
+def aggregate_query(
+    metrics: Sequence[str],
+    group_by: Sequence[str] = (),
+    start_date=None,
+    end_date=None,
+    platforms: Optional[List[str]] = None,
+    campaign_ids: Optional[List[str]] = None,
+    order_by: Optional[str] = None,
+    descending: bool = True,
+    limit: Optional[int] = None,
+    use_rollups: bool = True,
+) -> Tuple[str, list]:
+    """SQL and params for aggregate(); see there for the arguments."""
+    unknown = [m for m in metrics if m not in ROLLUP_METRICS]
+    if unknown:
+        raise ValueError(f"Non-additive or unknown metrics: {unknown}")
+
+    source = choose_source(group_by, start_date, end_date, platforms, campaign_ids, use_rollups=use_rollups)
+    dims = source['dims']
+    table = source['table']
+
+    joins = ''
+    if table == 'daily_performance':
+        joins += ' LEFT JOIN campaigns pc ON r.campaign_id = pc.campaign_id'
+    if 'campaign_name' in group_by:
+        joins += ' JOIN campaigns c ON r.campaign_id = c.campaign_id'
+
+    select, groups = [], []
+    for dim in group_by:
+        expr = 'c.campaign_name' if dim == 'campaign_name' else dims[dim]
+        select.append(f'{expr} AS {dim}')
+        groups.append(expr)
+    select += [f'SUM(r.{m}) AS {m}' for m in metrics]
+
+    where, params = [], []
+    if source['grain'] == 'month':
+        if start_date:
+            where.append('r.month >= ?'); params.append(str(start_date)[:7])
+        if end_date:
+            where.append('r.month <= ?'); params.append(str(end_date)[:7])
+    else:
+        if start_date:
+            where.append(f"{dims['report_date']} >= ?"); params.append(str(_to_date(start_date)))
+        if end_date:
+            where.append(f"{dims['report_date']} <= ?"); params.append(str(_to_date(end_date)))
+    if platforms:
+        where.append(f"{dims['platform']} IN ({','.join('?' * len(platforms))})"); params.extend(platforms)
+    elif 'platform' in group_by:
+        where.append(f"{dims['platform']} IS NOT NULL")
+    if campaign_ids:
+        where.append(f"{dims['campaign_id']} IN ({','.join('?' * len(campaign_ids))})"); params.extend(campaign_ids)
+
+    query = f"SELECT {', '.join(select)} FROM {table} r{joins}"
+    if where:
+        query += ' WHERE ' + ' AND '.join(where)
+    if groups:
+        query += ' GROUP BY ' + ', '.join(groups)
+    if order_by:
+        query += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+    if limit:
+        query += f' LIMIT {int(limit)}'
+
+    logger.debug(f"Rollup router: {table} for group_by={list(group_by)}")
+    return query, params
+
+
+def aggregate(
+    conn: sqlite3.Connection,
+    metrics: Sequence[str],
+    group_by: Sequence[str] = (),
+    start_date=None,
+    end_date=None,
+    platforms: Optional[List[str]] = None,
+    campaign_ids: Optional[List[str]] = None,
+    order_by: Optional[str] = None,
+    descending: bool = True,
+    limit: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Sum additive metrics grouped by the given dimensions.
+
+    Dimensions: report_date, month, platform, campaign_id, campaign_name,
+    ad_id. Rows are joined to campaigns the same way the raw queries do:
+    grouping or filtering by platform or campaign_name drops rows whose
+    campaign is unknown.
+
+    Args:
+        conn: Open connection to the database
+        metrics: Columns from ROLLUP_METRICS to sum
+        group_by: Dimensions to group by (empty for a grand total)
+        start_date: Inclusive start date (YYYY-MM-DD)
+        end_date: Inclusive end date (YYYY-MM-DD)
+        platforms: Platforms to include
+        campaign_ids: Campaigns to include
+        order_by: Output column to sort by
+        descending: Sort direction
+        limit: Maximum number of rows
+
+    Returns:
+        DataFrame with one column per dimension and metric
+    """
+    query, params = aggregate_query(metrics, group_by, start_date, end_date, platforms, campaign_ids,
+                                    order_by, descending, limit, use_rollups=rollups_available(conn))
+    return pd.read_sql_query(query, conn, params=params)
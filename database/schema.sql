@@ -78,6 +78,7 @@ CREATE TABLE IF NOT EXISTS customers (
 CREATE TABLE IF NOT EXISTS sales (
     sale_id INTEGER PRIMARY KEY AUTOINCREMENT, customer_id TEXT NOT NULL,
     sale_date DATE NOT NULL, sale_amount REAL NOT NULL,
+    source TEXT, -- Set by the ingestion feed ('feed'); NULL for manual/uploaded sales
     FOREIGN KEY (customer_id) REFERENCES customers (customer_id)
 );
 
@@ -8,6 +8,9 @@ import io
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from app.analysis_modules.metrics import kpi_totals
+
+
 class DataExporter:
     """Handles data export operations"""
     
@@ -80,7 +83,7 @@ class DataExporter:
             'total_spend': campaign_df['spend'].sum(),
             'total_revenue': campaign_df['revenue'].sum(),
             'total_conversions': campaign_df['conversions'].sum(),
-            'avg_roas': (campaign_df['revenue'].sum() / campaign_df['spend'].sum()) if campaign_df['spend'].sum() > 0 else 0,
+            'avg_roas': kpi_totals(campaign_df, ['roas'])['roas'],
             'date_range': {
                 'start': campaign_df['date'].min(),
                 'end': campaign_df['date'].max()
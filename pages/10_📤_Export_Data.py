@@ -5,94 +5,16 @@ Standalone page for data export functionality
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import sys
 import os
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.data_integration.datasets import get_dataset
 
 st.set_page_config(page_title="Export Data", page_icon="📤", layout="wide")
 
-# Load data (same as dashboard)
-@st.cache_data(ttl=3600)
-def load_campaign_data():
-    """Load campaign performance data"""
-    dates = pd.date_range(start=datetime.now() - timedelta(days=90), end=datetime.now(), freq='D')
-    campaigns = ['Spring Sale 2025', 'Summer Collection', 'Bedroom Special', 'Living Room Deals', 'Office Furniture']
-    platforms = ['Meta', 'Google', 'TikTok', 'Snapchat']
-    
-    data = []
-    for date in dates:
-        for campaign in campaigns:
-            for platform in platforms:
-                spend = np.random.uniform(500, 2000)
-                impressions = int(spend * np.random.uniform(800, 1200))
-                clicks = int(impressions * np.random.uniform(0.01, 0.03))
-                conversions = int(clicks * np.random.uniform(0.02, 0.08))
-                revenue = conversions * np.random.uniform(300, 800)
-                
-                data.append({
-                    'date': date,
-                    'campaign_name': campaign,
-                    'platform': platform,
-                    'spend': round(spend, 2),
-                    'impressions': impressions,
-                    'clicks': clicks,
-                    'conversions': conversions,
-                    'revenue': round(revenue, 2),
-                    'roas': round(revenue/spend, 2) if spend > 0 else 0,
-                    'cpa': round(spend/conversions, 2) if conversions > 0 else 0,
-                    'ctr': round(clicks/impressions*100, 3) if impressions > 0 else 0
-                })
-    
-    return pd.DataFrame(data)
-
-@st.cache_data(ttl=3600)
-def load_creative_data():
-    """Load creative performance data"""
-    creative_ids = [f"CR_{i:04d}" for i in range(1, 51)]
-    formats = ['Video', 'Image', 'Carousel']
-    
-    data = []
-    for creative_id in creative_ids:
-        impressions = int(np.random.uniform(10000, 100000))
-        clicks = int(impressions * np.random.uniform(0.01, 0.03))
-        data.append({
-            'creative_id': creative_id,
-            'format': np.random.choice(formats),
-            'impressions': impressions,
-            'clicks': clicks,
-            'conversions': int(clicks * np.random.uniform(0.02, 0.08)),
-            'spend': round(np.random.uniform(200, 1500), 2),
-            'revenue': round(np.random.uniform(500, 4000), 2),
-            'ctr': round(clicks/impressions*100, 2)
-        })
-    
-    return pd.DataFrame(data)
-
-@st.cache_data(ttl=3600)
-def load_persona_data():
-    """Load customer persona data"""
-    segments = ['High Value Shoppers', 'Budget Conscious', 'Design Enthusiasts', 'First Time Buyers', 'Repeat Customers']
-    
-    data = []
-    for i in range(1000):
-        segment = np.random.choice(segments)
-        ltv = np.random.uniform(500, 5000) if segment == 'High Value Shoppers' else np.random.uniform(300, 2000)
-        
-        data.append({
-            'customer_id': f"CUST_{i:05d}",
-            'segment': segment,
-            'lifetime_value': round(ltv, 2),
-            'avg_order_value': round(ltv/np.random.uniform(1, 5), 2),
-            'purchase_frequency': round(np.random.uniform(1, 8), 1),
-            'conversion_rate': round(np.random.uniform(1, 8), 2)
-        })
-    
-    return pd.DataFrame(data)
-
 # Try to import export module
 try:
     from export.export_page import render_export_page
@@ -100,10 +22,11 @@ try:
 except ImportError:
     EXPORT_AVAILABLE = False
 
-# Load data
-campaign_df = load_campaign_data()
-creative_df = load_creative_data()
-persona_df = load_persona_data()
+# Load data (shared with the ML Insights, Creative and Segmentation pages)
+campaign_df = get_dataset('campaign_daily').drop(columns=['cpc', 'cpm']).round(
+    {'spend': 2, 'revenue': 2, 'roas': 2, 'cpa': 2, 'ctr': 3})
+creative_df = get_dataset('creative')
+persona_df = get_dataset('persona')
 
 # Render page
 if EXPORT_AVAILABLE:
@@ -14,6 +14,8 @@ import sys
 import os
 
 # Add parent directory to path to import app_utils
+from app.analysis_modules.metrics import add_ratio_metrics
+from app.data_integration import file_uploader
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import app_utils
 
@@ -143,11 +145,10 @@ def process_uploaded_data(df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataF
     if 'revenue' not in df_processed.columns and 'conversions' in df_processed.columns:
         df_processed['revenue'] = df_processed['conversions'] * np.random.uniform(300, 800)
     
-    if 'roas' not in df_processed.columns and 'revenue' in df_processed.columns and 'spend' in df_processed.columns:
-        df_processed['roas'] = (df_processed['revenue'] / df_processed['spend']).round(2)
-    
-    if 'ctr' not in df_processed.columns and 'clicks' in df_processed.columns and 'impressions' in df_processed.columns:
-        df_processed['ctr'] = (df_processed['clicks'] / df_processed['impressions'] * 100).round(3)
+    # ROAS and CTR (%) where the file doesn't provide them (skipped if inputs are missing)
+    missing = [m for m in ('roas', 'ctr') if m not in df_processed.columns]
+    add_ratio_metrics(df_processed, missing)
+    df_processed = df_processed.round({m: d for m, d in (('roas', 2), ('ctr', 3)) if m in missing})
     
     return df_processed
 
@@ -231,6 +232,16 @@ def render_file_upload():
         st.info("**Supported Formats:**\n- CSV (.csv)\n- Excel (.xlsx, .xls)\n\n**Max Size:** 200MB")
     
     if uploaded_file is not None:
+        import_mode = st.radio(
+            "Import Mode",
+            ["Preview & Map", "Stream into Database"],
+            horizontal=True,
+            help="Stream large platform exports straight into the database without loading the whole file"
+        )
+        if import_mode == "Stream into Database":
+            render_stream_import(uploaded_file)
+            return
+
         try:
             # Read file
             if uploaded_file.name.endswith('.csv'):
@@ -337,6 +348,79 @@ def render_file_upload():
             st.error(f"❌ Error processing file: {str(e)}")
             st.info("💡 Make sure your file has the correct format and contains the required columns.")
 
+def render_stream_import(uploaded_file):
+    """Validate and write a large file to the database chunk by chunk"""
+    
+    st.markdown("### ⚡ Stream into Database")
+    st.caption("Each chunk is validated and bulk-written before the next is read, "
+               "so memory use depends on the chunk size, not the file size.")
+    
+    type_labels = {
+        'daily_performance': 'Daily Performance',
+        'segmented': 'Segmented Performance',
+        'country': 'Country Performance'
+    }
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        data_type = st.selectbox("Data Type", list(file_uploader.STREAM_TARGETS),
+                                 format_func=lambda t: type_labels.get(t, t))
+    with col2:
+        chunk_size = st.number_input("Rows per Chunk", min_value=1000, max_value=500000,
+                                     value=file_uploader.DEFAULT_CHUNK_ROWS, step=5000)
+    with col3:
+        overwrite = st.checkbox("Overwrite existing rows", value=False,
+                                help="Update rows that already exist instead of skipping them")
+    
+    # Preview only the first rows of CSVs; never parse the whole file here
+    if uploaded_file.name.lower().endswith('.csv'):
+        st.markdown("### 👀 Data Preview")
+        st.dataframe(pd.read_csv(uploaded_file, nrows=10), width="stretch")
+        uploaded_file.seek(0)
+    
+    if st.button("🚀 Start Import", type="primary", width="stretch"):
+        progress = st.progress(0, text="Starting import...")
+        
+        def on_progress(rows_done, fraction, result):
+            pct = int(fraction * 100) if fraction is not None else 0
+            progress.progress(pct, text=f"Processed {rows_done:,} rows "
+                                        f"({result['inserted']:,} inserted, {result['chunks']} chunks)")
+        
+        try:
+            uploaded_file.seek(0)
+            result = file_uploader.stream_upload(
+                uploaded_file, uploaded_file.name, data_type,
+                chunk_size=int(chunk_size),
+                on_conflict='update' if overwrite else 'nothing',
+                progress_callback=on_progress
+            )
+        except Exception as e:
+            progress.empty()
+            st.error(f"❌ Import failed: {str(e)}")
+            return
+        
+        progress.progress(100, text=f"Import finished in {result['seconds']:.1f}s")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Inserted", f"{result['inserted']:,}")
+        with col2:
+            st.metric("Updated", f"{result['updated']:,}")
+        with col3:
+            st.metric("Skipped", f"{result['skipped']:,}")
+        with col4:
+            st.metric("Rejected", f"{result['rejected_rows']:,}")
+        
+        if result['errors']:
+            st.markdown('<div class="validation-error">', unsafe_allow_html=True)
+            for error in result['errors'][:10]:
+                st.error(f"❌ {error}")
+            if len(result['errors']) > 10:
+                st.warning(f"... and {len(result['errors']) - 10} more rejected chunks")
+            st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            st.success(f"✅ Imported {result['rows']:,} rows in {result['chunks']} chunks")
+
 def render_api_integration():
     """Render API integration interface"""
     
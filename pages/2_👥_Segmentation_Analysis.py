@@ -3,33 +3,17 @@ Segmentation Analysis Page
 """
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 
-st.set_page_config(page_title="Segmentation Analysis", page_icon="👥", layout="wide")
+from app.data_integration.datasets import get_dataset
 
-@st.cache_data(ttl=3600)
-def load_persona_data():
-    segments = ['High Value Shoppers', 'Budget Conscious', 'Design Enthusiasts', 'First Time Buyers', 'Repeat Customers']
-    data = []
-    for i in range(1000):
-        segment = np.random.choice(segments)
-        ltv = np.random.uniform(500, 5000) if segment == 'High Value Shoppers' else np.random.uniform(300, 2000)
-        data.append({
-            'customer_id': f"CUST_{i:05d}",
-            'segment': segment,
-            'lifetime_value': round(ltv, 2),
-            'avg_order_value': round(ltv/np.random.uniform(1, 5), 2),
-            'purchase_frequency': round(np.random.uniform(1, 8), 1),
-            'conversion_rate': round(np.random.uniform(1, 8), 2)
-        })
-    return pd.DataFrame(data)
+st.set_page_config(page_title="Segmentation Analysis", page_icon="👥", layout="wide")
 
 st.title("👥 Segmentation Analysis")
 st.markdown("---")
 
-persona_df = load_persona_data()
-segment_stats = persona_df.groupby('segment').agg({
+persona_df = get_dataset('persona')
+segment_stats = persona_df.groupby('segment', observed=True).agg({
     'customer_id': 'count',
     'lifetime_value': 'mean',
     'avg_order_value': 'mean',
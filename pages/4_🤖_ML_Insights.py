@@ -11,52 +11,18 @@ from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import IsolationForest
 import sys
 import os
-from datetime import datetime, timedelta
 
 # Add parent directory to path to import app_utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import app_utils
+from app.data_integration.datasets import get_dataset
+from app.ui_components.chart_data import sample_points
 
 # Initialize Page
 st.set_page_config(page_title="ML & Insights", page_icon="🤖", layout="wide")
 app_utils.apply_custom_css()
 app_utils.check_authentication()
 
-# =============================
-# DATA LOADING
-# =============================
-
-@st.cache_data(ttl=3600)
-def load_campaign_data() -> pd.DataFrame:
-    now = datetime.now()
-    dates = pd.date_range(start=now - timedelta(days=90), end=now, freq="D")
-    campaigns = ["Spring Sale 2025", "Summer Collection", "Bedroom Special", "Living Room Deals", "Office Furniture"]
-    platforms = ["Meta", "Google", "TikTok", "Snapchat"]
-    rng = np.random.default_rng(42)
-
-    rows = []
-    for date in dates:
-        for campaign in campaigns:
-            for platform in platforms:
-                spend = rng.uniform(500, 2000)
-                impressions = int(spend * rng.uniform(800, 1200))
-                clicks = max(1, int(impressions * rng.uniform(0.008, 0.035)))
-                conversions = max(0, int(clicks * rng.uniform(0.02, 0.08)))
-                revenue = conversions * rng.uniform(300, 800)
-                rows.append({
-                    'date': date, 'campaign_name': campaign, 'platform': platform,
-                    'spend': spend, 'impressions': impressions, 'clicks': clicks,
-                    'conversions': conversions, 'revenue': revenue
-                })
-
-    df = pd.DataFrame(rows)
-    df['roas'] = (df['revenue'] / df['spend']).replace([np.inf, -np.inf], 0).fillna(0)
-    df['cpa'] = (df['spend'] / df['conversions']).replace([np.inf, -np.inf], 0).fillna(0)
-    df['ctr'] = (df['clicks'] / df['impressions'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
-    df['cpc'] = (df['spend'] / df['clicks']).replace([np.inf, -np.inf], 0).fillna(0)
-    df['cpm'] = (df['spend'] / df['impressions'] * 1000).replace([np.inf, -np.inf], 0).fillna(0)
-    return df
-
 # =============================
 # ML & ANALYTICS
 # =============================
@@ -91,7 +57,7 @@ def detect_anomalies(df: pd.DataFrame) -> pd.DataFrame:
 # MAIN RENDER
 # =============================
 
-df = load_campaign_data()
+df = get_dataset('campaign_daily')
 
 st.title("🤖 Machine Learning & Insights")
 
@@ -155,7 +121,7 @@ with c2:
 
     # Visualization of the model
     st.markdown('<div class="grafana-panel"><div class="panel-header">Model Insights (Spend vs Conversions)</div>', unsafe_allow_html=True)
-    fig_pred = px.scatter(df, x='spend', y='conversions', color='platform', opacity=0.6, template=app_utils.PLOTLY_TEMPLATE)
+    fig_pred = px.scatter(sample_points(df), x='spend', y='conversions', color='platform', opacity=0.6, template=app_utils.PLOTLY_TEMPLATE)
     # Add the prediction point
     fig_pred.add_traces(go.Scatter(x=[input_spend], y=[prediction], mode='markers', marker=dict(color='red', size=15, symbol='star'), name='Prediction'))
     fig_pred.update_layout(margin=dict(l=0, r=0, t=0, b=0), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
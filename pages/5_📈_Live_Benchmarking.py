@@ -16,6 +16,7 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import app_utils
+from app.ui_components.chart_data import downsample_series
 
 # ========================================
 # BENCHMARKING STYLES
@@ -284,6 +285,7 @@ def create_benchmark_chart(benchmarks_df: pd.DataFrame):
 def create_trend_chart(trend_df: pd.DataFrame):
     """Create trend comparison chart"""
     
+    trend_df = downsample_series(trend_df, 'date', ['your_ctr', 'industry_ctr'])
     fig = go.Figure()
     
     # Your CTR
@@ -6,10 +6,10 @@ Version: 1.0
 
 import streamlit as st
 import pandas as pd
-import sqlite3
-from datetime import datetime, timedelta
 import json
 
+from app.analysis_modules import assistant_queries
+
 # Page config
 st.set_page_config(
     page_title="Data Assistant - Midas Analytics",
@@ -21,154 +21,15 @@ st.set_page_config(
 # DATABASE HELPERS
 # =============================================================================
 
-def get_db_connection():
-    """Get database connection."""
-    return sqlite3.connect('furniture.db')
-
 @st.cache_data(ttl=3600)
 def get_data_summary():
     """Get summary of available data for context."""
-    conn = get_db_connection()
-
-    summary = {}
-
-    # Get campaigns
-    campaigns_df = pd.read_sql_query("""
-        SELECT campaign_name, platform, objective, funnel_stage
-        FROM campaigns
-    """, conn)
-    summary['campaigns'] = campaigns_df.to_dict('records')
-    summary['campaign_count'] = len(campaigns_df)
-    summary['platforms'] = campaigns_df['platform'].unique().tolist()
-
-    # Get date range
-    dates_df = pd.read_sql_query("""
-        SELECT MIN(report_date) as min_date, MAX(report_date) as max_date
-        FROM daily_performance
-    """, conn)
-    summary['date_range'] = {
-        'start': dates_df['min_date'].iloc[0],
-        'end': dates_df['max_date'].iloc[0]
-    }
-
-    # Get totals
-    totals_df = pd.read_sql_query("""
-        SELECT
-            SUM(impressions) as total_impressions,
-            SUM(clicks) as total_clicks,
-            SUM(conversions) as total_conversions
-        FROM daily_performance
-    """, conn)
-    summary['totals'] = totals_df.to_dict('records')[0]
-
-    conn.close()
-    return summary
+    return assistant_queries.get_data_summary()
 
 @st.cache_data(ttl=300)
 def execute_data_query(query_type: str, params: dict = None):
     """Execute predefined safe queries based on user intent."""
-    conn = get_db_connection()
-    params = params or {}
-
-    try:
-        if query_type == "campaign_performance":
-            df = pd.read_sql_query("""
-                SELECT
-                    c.campaign_name,
-                    c.platform,
-                    SUM(dp.impressions) as impressions,
-                    SUM(dp.clicks) as clicks,
-                    SUM(dp.conversions) as conversions,
-                    ROUND(SUM(dp.clicks) * 100.0 / NULLIF(SUM(dp.impressions), 0), 2) as ctr
-                FROM daily_performance dp
-                JOIN campaigns c ON dp.campaign_id = c.campaign_id
-                GROUP BY c.campaign_name, c.platform
-                ORDER BY impressions DESC
-            """, conn)
-            return df
-
-        elif query_type == "platform_comparison":
-            df = pd.read_sql_query("""
-                SELECT
-                    c.platform,
-                    SUM(dp.impressions) as impressions,
-                    SUM(dp.clicks) as clicks,
-                    SUM(dp.conversions) as conversions,
-                    ROUND(SUM(dp.clicks) * 100.0 / NULLIF(SUM(dp.impressions), 0), 2) as ctr,
-                    ROUND(SUM(dp.conversions) * 100.0 / NULLIF(SUM(dp.clicks), 0), 2) as conversion_rate
-                FROM daily_performance dp
-                JOIN campaigns c ON dp.campaign_id = c.campaign_id
-                GROUP BY c.platform
-                ORDER BY impressions DESC
-            """, conn)
-            return df
-
-        elif query_type == "daily_trend":
-            days = params.get('days', 30)
-            df = pd.read_sql_query(f"""
-                SELECT
-                    report_date,
-                    SUM(impressions) as impressions,
-                    SUM(clicks) as clicks,
-                    SUM(conversions) as conversions
-                FROM daily_performance
-                WHERE report_date >= date('now', '-{days} days')
-                GROUP BY report_date
-                ORDER BY report_date
-            """, conn)
-            return df
-
-        elif query_type == "top_campaigns":
-            limit = params.get('limit', 5)
-            metric = params.get('metric', 'conversions')
-            df = pd.read_sql_query(f"""
-                SELECT
-                    c.campaign_name,
-                    c.platform,
-                    SUM(dp.{metric}) as {metric}
-                FROM daily_performance dp
-                JOIN campaigns c ON dp.campaign_id = c.campaign_id
-                GROUP BY c.campaign_name, c.platform
-                ORDER BY {metric} DESC
-                LIMIT {limit}
-            """, conn)
-            return df
-
-        elif query_type == "campaign_details":
-            campaign_name = params.get('campaign_name', '')
-            df = pd.read_sql_query("""
-                SELECT
-                    dp.report_date,
-                    c.campaign_name,
-                    dp.impressions,
-                    dp.clicks,
-                    dp.conversions
-                FROM daily_performance dp
-                JOIN campaigns c ON dp.campaign_id = c.campaign_id
-                WHERE c.campaign_name LIKE ?
-                ORDER BY dp.report_date DESC
-                LIMIT 30
-            """, conn, params=(f'%{campaign_name}%',))
-            return df
-
-        elif query_type == "summary_stats":
-            df = pd.read_sql_query("""
-                SELECT
-                    COUNT(DISTINCT c.campaign_id) as total_campaigns,
-                    COUNT(DISTINCT c.platform) as platforms,
-                    SUM(dp.impressions) as total_impressions,
-                    SUM(dp.clicks) as total_clicks,
-                    SUM(dp.conversions) as total_conversions,
-                    ROUND(SUM(dp.clicks) * 100.0 / NULLIF(SUM(dp.impressions), 0), 2) as avg_ctr
-                FROM daily_performance dp
-                JOIN campaigns c ON dp.campaign_id = c.campaign_id
-            """, conn)
-            return df
-
-    except Exception as e:
-        return pd.DataFrame({'error': [str(e)]})
-    finally:
-        conn.close()
+    return assistant_queries.execute_data_query(query_type, params)
 
 def analyze_question(question: str):
     """Analyze question and determine query type."""
@@ -17,6 +17,7 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import app_utils
+from app.ui_components.chart_data import downsample_series
 
 # ========================================
 # BUDGET PACING STYLES
@@ -254,6 +255,7 @@ def get_budget_alerts(campaign_df: pd.DataFrame) -> list:
 def create_pacing_chart(daily_df: pd.DataFrame):
     """Create daily pacing chart"""
     
+    daily_df = downsample_series(daily_df, 'date', ['cumulative_spend', 'target_cumulative'])
     fig = go.Figure()
     
     # Actual spend
@@ -358,13 +360,15 @@ def create_forecast_chart(daily_df: pd.DataFrame, total_budget: float):
         
         forecast_df = pd.DataFrame(forecast_data)
         
+        actual_points = downsample_series(actual_data, 'date', 'cumulative_spend')
+        forecast_points = downsample_series(forecast_df, 'date', 'forecast_cumulative')
         fig = go.Figure()
         
         # Actual spend
         fig.add_trace(go.Scatter(
             name='Actual',
-            x=actual_data['date'],
-            y=actual_data['cumulative_spend'],
+            x=actual_points['date'],
+            y=actual_points['cumulative_spend'],
             mode='lines',
             line=dict(color='#667eea', width=3)
         ))
@@ -372,8 +376,8 @@ def create_forecast_chart(daily_df: pd.DataFrame, total_budget: float):
         # Forecast
         fig.add_trace(go.Scatter(
             name='Forecast',
-            x=forecast_df['date'],
-            y=forecast_df['forecast_cumulative'],
+            x=forecast_points['date'],
+            y=forecast_points['forecast_cumulative'],
             mode='lines',
             line=dict(color='#f59e0b', width=2, dash='dash')
         ))
@@ -17,6 +17,7 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import app_utils
+from app.ui_components.chart_data import downsample_series
 
 # ========================================
 # A/B TESTING STYLES
@@ -376,9 +377,8 @@ def create_time_series_chart(time_series_df: pd.DataFrame, metric: str):
     
     fig = go.Figure()
     
-    for variant in time_series_df['variant'].unique():
-        variant_data = time_series_df[time_series_df['variant'] == variant]
-        
+    time_series_df = downsample_series(time_series_df, 'date', metric.lower(), by='variant')
+    for variant, variant_data in time_series_df.groupby('variant', sort=False):
         fig.add_trace(go.Scatter(
             name=variant,
             x=variant_data['date'],
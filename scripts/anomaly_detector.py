@@ -1,13 +1,15 @@
 import pandas as pd
-import sqlite3
 from config import DB_PATH
+from database.connection import get_connection
 from datetime import date, timedelta
 
+# Params: first report_date of the lookback window
+ANOMALY_QUERY = "SELECT report_date, ad_id, spend, conversions FROM daily_performance WHERE report_date >= ?"
+
 def run_anomaly_detection():
     print("Running anomaly detection...")
-    conn = sqlite3.connect(DB_PATH)
-    query = f"SELECT report_date, ad_id, spend, conversions FROM daily_performance WHERE report_date >= '{(date.today() - timedelta(days=8)).strftime('%Y-%m-%d')}'"
-    df = pd.read_sql_query(query, conn)
+    conn = get_connection(DB_PATH)
+    df = pd.read_sql_query(ANOMALY_QUERY, conn, params=[(date.today() - timedelta(days=8)).strftime('%Y-%m-%d')])
     if df.empty: conn.close(); return
 
     df['cpa'] = df['spend'] / df['conversions'].replace(0, 1)
@@ -1,88 +1,334 @@
-import sqlite3
 import pandas as pd
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import json
 import os
 import sys
+import time
 
 # --- THIS BLOCK FIXES THE PATH FOR THIS SCRIPT ---
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # --- END OF FIX ---
 
-from config import DB_PATH
+from config import DB_PATH, INGEST_MAX_WORKERS
+from app.startup import ensure_ingestion_runs_table, ensure_sales_source_column
+from database.connection import get_connection
 from database.db_setup import create_database, populate_sample_data
+from database.columnar_store import sync_after_ingest
+from database.rollups import refresh_rollups
 from app.data_integration.api_connectors import (
-    fetch_meta_data, fetch_google_data, fetch_tiktok_data, fetch_snapchat_data,
+    fetch_meta_data, iter_meta_data, fetch_google_data, fetch_tiktok_data, fetch_snapchat_data,
     fetch_country_data, fetch_meta_segmented_data, fetch_google_segmented_data,
     fetch_tiktok_segmented_data, fetch_snapchat_segmented_data, fetch_customer_sales_data
 )
 
+# sales.source of rows written by the daily feed; a re-run replaces only
+# these, never manually uploaded sales for the same day
+SALES_FEED_SOURCE = 'feed'
+
 def get_db_connection():
     """Get a connection to the database."""
-    return sqlite3.connect(DB_PATH)
+    return get_connection(DB_PATH)
+
+# Platform fetchers run concurrently during ingestion; Meta is streamed
+# separately (see run_ingestion_for_date)
+PERFORMANCE_FETCHERS = {
+    'Google': fetch_google_data,
+    'TikTok': fetch_tiktok_data,
+    'Snapchat': fetch_snapchat_data,
+}
+
+SEGMENT_FETCHERS = {
+    'Meta': fetch_meta_segmented_data,
+    'Google': fetch_google_segmented_data,
+    'TikTok': fetch_tiktok_segmented_data,
+    'Snapchat': fetch_snapchat_segmented_data,
+}
+
+def write_frame(df: pd.DataFrame, table: str, conn) -> int:
+    """
+    Insert a DataFrame into a table, keeping only columns the table defines.
+
+    Source frames (e.g. live Meta insights) carry extra descriptive columns,
+    so they are projected onto the table schema before writing. Rows are
+    sent with executemany and are not committed, so the caller controls the
+    transaction (pandas' to_sql commits on every call).
+
+    Returns:
+        Number of rows written
+    """
+    if df.empty:
+        return 0
+    table_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    cols = [c for c in df.columns if c in table_columns]
+    rows = list(zip(*[df[c].tolist() for c in cols]))
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})", rows
+    )
+    return len(rows)
+
+def _timed(fn, *args):
+    """Run fn(*args) and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, round(time.perf_counter() - start, 4)
+
+def record_ingestion_run(conn, platform: str, start_date: str, end_date: str, status: str,
+                         rows_deleted: int = 0, rows_inserted: int = 0,
+                         stage_timings: dict = None, user: str = 'system', commit: bool = True):
+    """
+    Append one row to the ingestion_runs audit table.
+
+    With commit=False the row joins the caller's open transaction, so it can
+    act as a checkpoint that exists only if the data it describes does.
+    """
+    ensure_ingestion_runs_table(conn)
+    conn.execute(
+        "INSERT INTO ingestion_runs (platform, start_date, end_date, user, rows_deleted, "
+        "rows_inserted, status, created_at, stage_timings) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (platform, start_date, end_date, user, rows_deleted, rows_inserted, status,
+         datetime.now().isoformat(timespec='seconds'), json.dumps(stage_timings or {}))
+    )
+    if commit:
+        conn.commit()
+
+PLATFORMS = ['Meta', 'Google', 'TikTok', 'Snapchat']
+
+# Backfill shard (and ingestion_runs platform) for the day's sales and
+# customers, which run_ingestion_for_date ingests alongside the platforms
+SALES_SHARD = 'sales'
+
+def fetch_platform_day(platform: str, day: str) -> dict:
+    """
+    Fetch one platform's data (or SALES_SHARD's sales) for one day.
 
-def run_ingestion_for_date(run_date_str: str, conn):
+    Used by the backfill scheduler, which shards work by (platform, day).
+    Meta goes through MetaAdsClient's cached, per-account concurrent pull;
+    account errors are raised rather than skipped so a shard is never
+    checkpointed with some accounts missing.
+
+    Returns:
+        Dict of table name -> DataFrame for daily_performance,
+        performance_by_segment and performance_by_country, or {'sales': ...}
+        for SALES_SHARD
+    """
+    if platform == SALES_SHARD:
+        return {'sales': fetch_customer_sales_data(day)}
+    if platform == 'Meta':
+        performance = fetch_meta_data(day, day, raise_errors=True)
+    else:
+        performance = PERFORMANCE_FETCHERS[platform](day, day)
+
+    country = fetch_country_data(day, day)
+    if not country.empty:
+        country = country[country['platform'] == platform]
+
+    return {
+        'daily_performance': performance,
+        'performance_by_segment': SEGMENT_FETCHERS[platform](day, day),
+        'performance_by_country': country,
+    }
+
+def delete_partition(conn, table: str, platform: str, day: str, campaign_ids=None,
+                     by_platform: bool = True) -> int:
+    """
+    Delete one (platform, report_date) slice of a performance table.
+
+    performance_by_country has a platform column. The other tables resolve
+    the platform through campaigns, and also clear rows for campaign_ids
+    (the campaigns in the incoming data), so campaigns missing from the
+    campaigns table are still replaced. Does not commit.
+
+    Returns:
+        Number of rows deleted
+    """
+    if table == 'performance_by_country':
+        cursor = conn.execute(f"DELETE FROM {table} WHERE report_date = ? AND platform = ?", (day, platform))
+        return cursor.rowcount
+
+    conditions, params = [], [day]
+    if by_platform:
+        conditions.append("campaign_id IN (SELECT campaign_id FROM campaigns WHERE platform = ?)")
+        params.append(platform)
+    campaign_ids = sorted(campaign_ids or [])
+    if campaign_ids:
+        conditions.append(f"campaign_id IN ({', '.join('?' * len(campaign_ids))})")
+        params.extend(campaign_ids)
+    if not conditions:
+        return 0
+    cursor = conn.execute(f"DELETE FROM {table} WHERE report_date = ? AND ({' OR '.join(conditions)})", params)
+    return cursor.rowcount
+
+def _campaign_ids(df: pd.DataFrame) -> set:
+    if df.empty or 'campaign_id' not in df.columns:
+        return set()
+    return set(df['campaign_id'].astype(str).unique())
+
+def replace_partition(conn, table: str, platform: str, day: str, df: pd.DataFrame) -> tuple:
+    """
+    Replace one (platform, report_date) slice with df, without committing.
+
+    Returns:
+        (rows_deleted, rows_inserted)
+    """
+    deleted = delete_partition(conn, table, platform, day, _campaign_ids(df))
+    return deleted, write_frame(df, table, conn)
+
+def replace_sales_day(conn, day: str, sales_df: pd.DataFrame) -> tuple:
+    """
+    Replace the feed's sales for one day and add any new customers, without committing.
+
+    Only rows with source = SALES_FEED_SOURCE are replaced, never manually
+    uploaded sales for the same day.
+
+    Returns:
+        (rows_deleted, rows_inserted)
+    """
+    if sales_df.empty:
+        return 0, 0
+    # Customers first so every sale references an existing customer
+    conn.executemany(
+        "INSERT OR IGNORE INTO customers (customer_id, first_seen_date) VALUES (?, ?)",
+        [(customer_id, day) for customer_id in sales_df['customer_id'].unique()]
+    )
+    deleted = conn.execute("DELETE FROM sales WHERE sale_date = ? AND source = ?",
+                           (day, SALES_FEED_SOURCE)).rowcount
+    return deleted, write_frame(sales_df.assign(source=SALES_FEED_SOURCE), 'sales', conn)
+
+def write_platform_day(conn, platform: str, day: str, frames: dict) -> tuple:
+    """
+    Replace the platform's slice of each table with the frames from
+    fetch_platform_day, without committing.
+
+    Returns:
+        (rows_deleted, rows_inserted)
+    """
+    if platform == SALES_SHARD:
+        return replace_sales_day(conn, day, frames['sales'])
+    deleted = inserted = 0
+    for table, df in frames.items():
+        d, i = replace_partition(conn, table, platform, day, df)
+        deleted += d
+        inserted += i
+    refresh_rollups(conn, [day])
+    return deleted, inserted
+
+def run_ingestion_for_date(run_date_str: str, conn, max_workers: int = None, user: str = 'system'):
     """
     Fetches and saves data for a specific date using an existing connection.
     
+    Fetchers for every platform run concurrently on a bounded thread pool
+    while Meta insights stream into the database on the calling thread.
+    Each (platform, report_date) slice is replaced rather than appended, so
+    re-running a day is safe and picks up late-attributed conversions. All
+    writes for the date are committed in a single transaction, so a failure
+    leaves nothing behind. Each platform's rows_deleted / rows_inserted and
+    the run's per-stage timings are recorded in ingestion_runs.
+    
     Args:
         run_date_str: Date string in 'YYYY-MM-DD' format
         conn: SQLite database connection
+        max_workers: Concurrent fetchers (defaults to INGEST_MAX_WORKERS)
+        user: Recorded in ingestion_runs
+    
+    Returns:
+        Dict of platform -> {'deleted': int, 'inserted': int} (plus 'sales')
     """
+    timings = {}
+    counts = {name: {'deleted': 0, 'inserted': 0} for name in PLATFORMS + ['sales']}
+    run_start = time.perf_counter()
+
+    def add(name, deleted, inserted):
+        counts.setdefault(name, {'deleted': 0, 'inserted': 0})
+        counts[name]['deleted'] += deleted
+        counts[name]['inserted'] += inserted
+
+    tasks = {f'performance_{name}': (fn, (run_date_str, run_date_str)) for name, fn in PERFORMANCE_FETCHERS.items()}
+    tasks.update({f'segments_{name}': (fn, (run_date_str, run_date_str)) for name, fn in SEGMENT_FETCHERS.items()})
+    tasks['country'] = (fetch_country_data, (run_date_str, run_date_str))
+    tasks['sales'] = (fetch_customer_sales_data, (run_date_str,))
+
     try:
         print(f"📊 Fetching data for {run_date_str}...")
-        
-        all_platform_data = pd.concat([
-            fetch_meta_data(run_date_str, run_date_str), 
-            fetch_google_data(run_date_str, run_date_str), 
-            fetch_tiktok_data(run_date_str, run_date_str), 
-            fetch_snapchat_data(run_date_str, run_date_str)
-        ], ignore_index=True)
-        
-        all_segmented_data = pd.concat([
-            fetch_meta_segmented_data(run_date_str, run_date_str), 
-            fetch_google_segmented_data(run_date_str, run_date_str), 
-            fetch_tiktok_segmented_data(run_date_str, run_date_str), 
-            fetch_snapchat_segmented_data(run_date_str, run_date_str)
-        ], ignore_index=True)
-        
-        country_df = fetch_country_data(run_date_str, run_date_str)
-        sales_df = fetch_customer_sales_data(run_date_str)
+        ensure_ingestion_runs_table(conn)
+        ensure_sales_source_column(conn)
+
+        with ThreadPoolExecutor(max_workers=max_workers or INGEST_MAX_WORKERS,
+                                thread_name_prefix='ingest') as pool:
+            futures = {name: pool.submit(_timed, fn, *args) for name, (fn, args) in tasks.items()}
+
+            # Meta can return very large ad-level pulls, so its chunks are
+            # written into the open transaction as they stream in. The Meta
+            # slice is cleared up front; campaigns first seen in a later
+            # chunk are cleared just before that chunk is inserted.
+            meta_start = time.perf_counter()
+            add('Meta', delete_partition(conn, 'daily_performance', 'Meta', run_date_str), 0)
+            cleared = set()
+            for chunk in iter_meta_data(run_date_str, run_date_str):
+                new_ids = _campaign_ids(chunk) - cleared
+                deleted = delete_partition(conn, 'daily_performance', 'Meta', run_date_str,
+                                           new_ids, by_platform=False)
+                cleared |= new_ids
+                add('Meta', deleted, write_frame(chunk, 'daily_performance', conn))
+            timings['fetch_write_meta'] = round(time.perf_counter() - meta_start, 4)
+
+            results = {}
+            for name, future in futures.items():
+                results[name], timings[f'fetch_{name}'] = future.result()
+
+        write_start = time.perf_counter()
+        for name in PERFORMANCE_FETCHERS:
+            add(name, *replace_partition(conn, 'daily_performance', name, run_date_str,
+                                         results[f'performance_{name}']))
+        for name in SEGMENT_FETCHERS:
+            add(name, *replace_partition(conn, 'performance_by_segment', name, run_date_str,
+                                         results[f'segments_{name}']))
+
+        # Only platforms present in the feed are replaced, so manually
+        # uploaded country rows for other platforms are left alone
+        country_df = results['country']
+        if not country_df.empty:
+            for name, part in country_df.groupby('platform'):
+                add(name, *replace_partition(
+                    conn, 'performance_by_country', name, run_date_str, part))
+
+        add('sales', *replace_sales_day(conn, run_date_str, results['sales']))
+
+        refresh_rollups(conn, [run_date_str])
+        timings['write'] = round(time.perf_counter() - write_start, 4)
+
+        # Per-platform (and sales) audit rows commit with the data they
+        # describe; a backfill treats them as checkpoints
+        for name in PLATFORMS + [SALES_SHARD]:
+            record_ingestion_run(conn, name, run_date_str, run_date_str, 'success',
+                                 rows_deleted=counts[name]['deleted'], rows_inserted=counts[name]['inserted'],
+                                 user=user, commit=False)
+
+        commit_start = time.perf_counter()
+        conn.commit()
+        timings['commit'] = round(time.perf_counter() - commit_start, 4)
 
-        if not all_platform_data.empty: 
-            all_platform_data.to_sql('daily_performance', conn, if_exists='append', index=False)
-            print(f"✅ Saved {len(all_platform_data)} platform performance records")
-            
-        if not all_segmented_data.empty: 
-            all_segmented_data.to_sql('performance_by_segment', conn, if_exists='append', index=False)
-            print(f"✅ Saved {len(all_segmented_data)} segmented performance records")
-            
-        if not country_df.empty: 
-            country_df.to_sql('performance_by_country', conn, if_exists='append', index=False)
-            print(f"✅ Saved {len(country_df)} country performance records")
-            
-        if not sales_df.empty:
-            sales_df.to_sql('sales', conn, if_exists='append', index=False)
-            print(f"✅ Saved {len(sales_df)} sales records")
-            
-            unique_customers = pd.DataFrame({
-                'customer_id': sales_df['customer_id'].unique(), 
-                'first_seen_date': run_date_str
-            })
-            unique_customers.to_sql('new_cust', conn, if_exists='replace', index=False)
-            
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO customers (customer_id, first_seen_date) "
-                "SELECT customer_id, first_seen_date FROM new_cust "
-                "WHERE customer_id NOT IN (SELECT customer_id FROM customers)"
-            )
-            conn.commit()
-            print(f"✅ Updated customers table")
-            
     except Exception as e:
+        conn.rollback()
+        timings['total'] = round(time.perf_counter() - run_start, 4)
         print(f"❌ An error occurred during data ingestion for {run_date_str}: {e}")
+        record_ingestion_run(conn, 'all', run_date_str, run_date_str, 'failed',
+                             stage_timings=timings, user=user)
         raise
 
+    for name in PLATFORMS:
+        print(f"✅ {name}: replaced {counts[name]['deleted']} rows with {counts[name]['inserted']}")
+    if counts['sales']['inserted']:
+        print(f"✅ Saved {counts['sales']['inserted']} sales records and updated customers")
+
+    sync_after_ingest([run_date_str], conn)
+    timings['total'] = round(time.perf_counter() - run_start, 4)
+    record_ingestion_run(conn, 'all', run_date_str, run_date_str, 'success',
+                         rows_deleted=sum(c['deleted'] for c in counts.values()),
+                         rows_inserted=sum(c['inserted'] for c in counts.values()),
+                         stage_timings=timings, user=user)
+    return counts
+
 def run_full_setup(progress_bar):
     """
     Executes the entire database creation and data population process.
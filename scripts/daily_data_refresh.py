@@ -0,0 +1,318 @@
+"""
+Daily refresh and backfill of platform performance data.
+
+USAGE:
+    # Ingest yesterday for every platform
+    python scripts/daily_data_refresh.py
+
+    # Backfill a date range, sharded by (platform, day) plus one sales
+    # shard per day (sales and customers); safe to re-run
+    python scripts/daily_data_refresh.py backfill --start 2025-01-01 --end 2025-12-31
+    python scripts/daily_data_refresh.py backfill --start 2025-01-01 --end 2025-01-31 \
+        --platforms Meta Google --workers 8 --rpm 120
+
+A backfill checkpoints every finished shard in ingestion_runs (in the same
+transaction as its data), so a killed run picks up where it stopped.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+# --- THIS BLOCK FIXES THE PATH FOR THIS SCRIPT ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# --- END OF FIX ---
+
+import config
+from app.startup import ensure_ingestion_runs_table, ensure_sales_source_column
+from database.columnar_store import sync_after_ingest
+from scripts.app_setup import (
+    PLATFORMS, SALES_SHARD, fetch_platform_day, get_db_connection, record_ingestion_run,
+    run_ingestion_for_date, write_platform_day,
+)
+
+BACKFILL_USER = 'backfill'
+
+# Everything run_ingestion_for_date writes for a day, one shard each
+BACKFILL_SHARDS = PLATFORMS + [SALES_SHARD]
+
+# Errors that mean "slow down" rather than "broken": Meta Graph API error
+# codes (FacebookRequestError.api_error_code()) and HTTP 429 elsewhere
+META_RATE_LIMIT_CODES = frozenset({4, 17, 32, 613, *range(80000, 80015)})
+RATE_LIMIT_HTTP_STATUS = 429
+
+
+# ============================================================================
+# THROTTLING
+# ============================================================================
+
+class RateLimiter:
+    """
+    Thread-safe limiter allowing `per_minute` acquisitions per rolling minute.
+
+    After a rate-limit error, pause() holds every caller back for the given
+    number of seconds so the whole pool slows down, not just one worker.
+    """
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute and per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+def _http_status(error: Exception) -> Optional[int]:
+    """HTTP status carried by an SDK or requests error, if any."""
+    status = getattr(error, 'http_status', None)
+    if callable(status):  # FacebookRequestError.http_status()
+        status = status()
+    if status is None:
+        status = getattr(error, 'status_code', None)
+    if status is None:  # requests.HTTPError
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Rate limiting, judged by the SDK error code or HTTP status only.
+
+    The message text is never searched: it can contain ad/account IDs or
+    amounts (e.g. "429") that would turn a real failure into endless retries.
+    """
+    api_error_code = getattr(error, 'api_error_code', None)
+    if callable(api_error_code) and api_error_code() in META_RATE_LIMIT_CODES:
+        return True
+    return _http_status(error) == RATE_LIMIT_HTTP_STATUS
+
+
+# ============================================================================
+# BACKFILL
+# ============================================================================
+
+def date_range(start_date: str, end_date: str) -> List[str]:
+    start = datetime.strptime(start_date, '%Y-%m-%d').date()
+    end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+def completed_shards(conn: sqlite3.Connection, start_date: str, end_date: str) -> Set[Tuple[str, str]]:
+    """
+    (shard, day) pairs already ingested successfully.
+
+    A successful single-day run for platform 'all' (run_ingestion_for_date)
+    covers every shard for that day, sales included.
+    """
+    rows = conn.execute(
+        "SELECT platform, start_date FROM ingestion_runs "
+        "WHERE status = 'success' AND start_date = end_date AND start_date BETWEEN ? AND ?",
+        (start_date, end_date)
+    ).fetchall()
+    done = set()
+    for platform, day in rows:
+        for p in (BACKFILL_SHARDS if platform == 'all' else [platform]):
+            done.add((p, day))
+    return done
+
+
+def _fetch_with_retry(platform: str, day: str, limiter: RateLimiter, max_retries: int, backoff: float):
+    """Fetch one shard, backing off (pool-wide) on rate-limit errors."""
+    for attempt in range(max_retries + 1):
+        limiter.acquire()
+        start = time.perf_counter()
+        try:
+            frames = fetch_platform_day(platform, day)
+            return frames, round(time.perf_counter() - start, 4), attempt
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == max_retries:
+                raise
+            delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+            print(f"⏳ Rate limited on {platform} {day}; backing off {delay:.1f}s")
+            limiter.pause(delay)
+
+
+def run_backfill(
+    start_date: str,
+    end_date: str,
+    platforms: Optional[List[str]] = None,
+    max_workers: int = None,
+    requests_per_minute: float = None,
+    max_retries: int = 5,
+    backoff: float = 5.0,
+    force: bool = False,
+) -> Dict[str, int]:
+    """
+    Ingest every (platform, day) shard in [start_date, end_date], plus a
+    (SALES_SHARD, day) shard for the day's sales and customers.
+
+    Shards are fetched on a thread pool, throttled per platform; results are
+    written on this thread, each in its own transaction together with its
+    ingestion_runs checkpoint. Each shard replaces its (platform, day)
+    slice, so forcing a re-run never duplicates rows. Shards with a
+    checkpoint are skipped unless force is set.
+
+    Args:
+        start_date: First day (YYYY-MM-DD)
+        end_date: Last day (YYYY-MM-DD)
+        platforms: Shards to backfill, from BACKFILL_SHARDS (all if None)
+        max_workers: Concurrent fetches (defaults to BACKFILL_MAX_WORKERS)
+        requests_per_minute: Per-platform fetch rate (defaults to BACKFILL_REQUESTS_PER_MINUTE)
+        max_retries: Retries per shard after a rate-limit error
+        backoff: Base back-off in seconds (doubles per retry)
+        force: Re-ingest shards that already have a checkpoint
+
+    Returns:
+        Dict with total, skipped, succeeded, failed and rows counts
+    """
+    platforms = platforms or BACKFILL_SHARDS
+    unknown = [p for p in platforms if p not in BACKFILL_SHARDS]
+    if unknown:
+        raise ValueError(f"Unknown platforms: {unknown}")
+    max_workers = max_workers or config.BACKFILL_MAX_WORKERS
+    requests_per_minute = requests_per_minute or config.BACKFILL_REQUESTS_PER_MINUTE
+
+    conn = get_db_connection()
+    ensure_ingestion_runs_table(conn)
+    ensure_sales_source_column(conn)
+
+    # Walk days in order, interleaving platforms so no single API is hammered
+    days = date_range(start_date, end_date)
+    shards = [(p, d) for d in days for p in platforms]
+    done = set() if force else completed_shards(conn, start_date, end_date)
+    pending = [s for s in shards if s not in done]
+
+    summary = {'total': len(shards), 'skipped': len(shards) - len(pending), 'succeeded': 0, 'failed': 0, 'rows': 0}
+    print(f"🗂️  Backfill {start_date} → {end_date}: {len(shards)} shards, "
+          f"{summary['skipped']} already done, {len(pending)} to run")
+    if not pending:
+        conn.close()
+        return summary
+
+    limiters = {p: RateLimiter(requests_per_minute) for p in platforms}
+    touched_days = set()
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='backfill')
+    queue = iter(pending)
+    in_flight = {}
+
+    def submit_next() -> bool:
+        shard = next(queue, None)
+        if shard is None:
+            return False
+        platform, day = shard
+        in_flight[pool.submit(_fetch_with_retry, platform, day, limiters[platform], max_retries, backoff)] = shard
+        return True
+
+    try:
+        # Keep only a bounded window of shards in flight so memory stays flat
+        for _ in range(max_workers * 2):
+            if not submit_next():
+                break
+
+        while in_flight:
+            finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in finished:
+                platform, day = in_flight.pop(future)
+                try:
+                    frames, fetch_seconds, retries = future.result()
+                    write_start = time.perf_counter()
+                    deleted, rows = write_platform_day(conn, platform, day, frames)
+                    timings = {
+                        'fetch': fetch_seconds,
+                        'write': round(time.perf_counter() - write_start, 4),
+                        'retries': retries,
+                    }
+                    record_ingestion_run(conn, platform, day, day, 'success', rows_deleted=deleted,
+                                         rows_inserted=rows, stage_timings=timings,
+                                         user=BACKFILL_USER, commit=False)
+                    conn.commit()
+                    summary['succeeded'] += 1
+                    summary['rows'] += rows
+                    if platform != SALES_SHARD:
+                        touched_days.add(day)
+                except Exception as e:
+                    conn.rollback()
+                    record_ingestion_run(conn, platform, day, day, 'failed',
+                                         stage_timings={'error': str(e)[:500]}, user=BACKFILL_USER)
+                    summary['failed'] += 1
+                    print(f"❌ {platform} {day}: {e}")
+                submit_next()
+
+            done_count = summary['succeeded'] + summary['failed']
+            if done_count and done_count % 50 == 0:
+                print(f"   … {done_count}/{len(pending)} shards processed")
+
+    except KeyboardInterrupt:
+        print("\n⏹️  Backfill interrupted; finished shards are checkpointed. Re-run to resume.")
+        pool.shutdown(wait=False, cancel_futures=True)
+        conn.close()
+        raise
+    pool.shutdown(wait=True)
+
+    if touched_days:
+        sync_after_ingest(sorted(touched_days), conn)
+    conn.close()
+
+    print(f"✅ Backfill finished: {summary['succeeded']} succeeded, {summary['failed']} failed, "
+          f"{summary['skipped']} skipped, {summary['rows']} rows")
+    return summary
+
+
+def run_daily_refresh() -> None:
+    """Ingest yesterday for every platform."""
+    yesterday = (date.today() - timedelta(days=1)).strftime('%Y-%m-%d')
+    conn = get_db_connection()
+    try:
+        run_ingestion_for_date(yesterday, conn, user='daily_refresh')
+    finally:
+        conn.close()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('daily', help='Ingest yesterday (default)')
+
+    backfill = sub.add_parser('backfill', help='Ingest a date range, resumable')
+    backfill.add_argument('--start', required=True, help='First day (YYYY-MM-DD)')
+    backfill.add_argument('--end', required=True, help='Last day (YYYY-MM-DD)')
+    backfill.add_argument('--platforms', nargs='+', choices=BACKFILL_SHARDS,
+                          help=f"Shards to run (default: all; '{SALES_SHARD}' = sales and customers)")
+    backfill.add_argument('--workers', type=int, default=None)
+    backfill.add_argument('--rpm', type=float, default=None, help='Max fetches per minute per platform')
+    backfill.add_argument('--retries', type=int, default=5)
+    backfill.add_argument('--force', action='store_true', help='Ignore checkpoints and re-ingest')
+
+    args = parser.parse_args(argv)
+    if args.command == 'backfill':
+        run_backfill(args.start, args.end, args.platforms, args.workers, args.rpm,
+                     max_retries=args.retries, force=args.force)
+    else:
+        run_daily_refresh()
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -36,6 +36,7 @@ sys.path.append(os.path.dirname(__file__))
 
 try:
     from database.db_setup import create_database, populate_sample_data
+    from database.connection import remove_database
     from config import DB_PATH
 except ImportError as e:
     print(f"❌ Import Error: {e}")
@@ -99,7 +100,7 @@ def main():
         
         if response == 'yes':
             try:
-                os.remove(DB_PATH)
+                remove_database(DB_PATH)
                 print(f"🗑️  Deleted existing database: {DB_PATH}")
                 print()
             except Exception as e: